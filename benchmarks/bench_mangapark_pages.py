@@ -0,0 +1,81 @@
+"""
+Microbenchmark for Mangapark chapter page extraction against saved chapter HTML.
+Compares the current single-pass extractor with the previous soup + recursive walk.
+
+Run from the repository root:
+    python -m benchmarks.bench_mangapark_pages [--fixture mangapark_chapter.html] [--repeat 20]
+"""
+import argparse
+import json
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.make_fixtures import load_fixture
+from providers.manga.mangapark import Mangapark
+
+
+def legacy_parse_chapter_pages(html):
+    """The extractor Mangapark.fetch_chapter_pages used before the single-pass rewrite"""
+    soup = BeautifulSoup(html, "html.parser")
+    scripts = soup.find_all('script')
+    pages = []
+    for script in scripts:
+        if not script.string:
+            continue
+        if script.get('type') == 'qwik/json' or script.string.strip().startswith('{'):
+            try:
+                data = json.loads(script.string)
+
+                def extract_images(obj):
+                    if isinstance(obj, str) and obj.startswith('https://') and ('/media/' in obj or '/i0.wp.com/' in obj):
+                        pages.append({"page": len(pages) + 1, "img": obj})
+                    elif isinstance(obj, dict):
+                        for value in obj.values():
+                            extract_images(value)
+                    elif isinstance(obj, list):
+                        for item in obj:
+                            extract_images(item)
+
+                extract_images(data)
+            except json.JSONDecodeError:
+                continue
+        if isinstance(script.string, str):
+            urls = re.findall(r'https://[^"\'\s]+?(?:/media/|/i0\.wp\.com/).+?\.(?:jpg|jpeg|png|gif|webp)', script.string)
+            for url in urls:
+                if url not in [p["img"] for p in pages]:
+                    pages.append({"page": len(pages) + 1, "img": url})
+    return sorted(pages, key=lambda x: x["page"])
+
+
+def run(label, parse, html, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages = parse(html)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<8} {best * 1000:9.2f} ms  ({len(pages)} pages)")
+    return best, pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", default="mangapark_chapter.html", help="saved chapter HTML in benchmarks/fixtures")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per extractor, best is reported")
+    args = parser.parse_args()
+    
+    html = load_fixture(args.fixture)
+    print(f"fixture: {args.fixture} ({len(html) // 1024} KB)")
+    
+    legacy_time, legacy_pages = run("legacy", legacy_parse_chapter_pages, html, args.repeat)
+    current_time, current_pages = run("current", Mangapark().parse_chapter_pages, html, args.repeat)
+    
+    if [p["img"] for p in legacy_pages] != [p["img"] for p in current_pages]:
+        print("warning: extractors returned different pages")
+    print(f"speedup: {legacy_time / current_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
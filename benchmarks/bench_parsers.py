@@ -0,0 +1,116 @@
+"""
+Microbenchmark for every provider's page parsing against the saved fixtures, no network.
+Reports the best and mean time per call and the peak memory allocated while parsing,
+for each HTML backend, so parser changes can be compared run to run.
+
+Run from the repository root:
+    python -m benchmarks.bench_parsers [--backend all] [--repeat 10] [--case mangapark]
+    python -m benchmarks.bench_parsers --save before.json
+    python -m benchmarks.bench_parsers --compare before.json
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import core.parsing
+from benchmarks.make_fixtures import load_fixture
+from providers.manga.mangahere import MangaHere
+from providers.manga.mangapark import Mangapark
+from providers.manga.mangapill import MangaPill
+
+BACKENDS = ("html.parser", "lxml")
+
+
+def build_cases():
+    """(name, fixture, parse) for each parsing step; parse takes the page HTML"""
+    pill = MangaPill()
+    park = Mangapark()
+    here = MangaHere()
+    return [
+        ("mangapill.search", "mangapill_search.html", pill.parse_search),
+        ("mangapill.fetch_manga_info", "mangapill_manga.html", lambda html: pill.parse_manga_info(html, "2085/fixture-series")),
+        ("mangapill.fetch_chapter_pages", "mangapill_chapter.html", pill.parse_chapter_pages),
+        ("mangapark.search", "mangapark_search.html", park.parse_search),
+        ("mangapark.fetch_manga_info", "mangapark_title.html", lambda html: park.parse_manga_info(html, "10000-en-fixture")),
+        ("mangapark.fetch_chapter_pages", "mangapark_chapter.html", park.parse_chapter_pages),
+        ("mangapark.get_latest_releases", "mangapark_home.html", park.get_latest_releases),
+        ("mangapark.get_genres", "mangapark_home.html", park.get_genres),
+        ("mangahere.search", "mangahere_search.html", here.parse_search),
+        ("mangahere.fetch_manga_info", "mangahere_manga.html", lambda html: here.parse_manga_info(html, "fixture_here")),
+        ("mangahere.fetch_chapter_pages", "mangahere_chapter.html", here.parse_chapter_page),
+    ]
+
+
+def backend_available(backend):
+    if backend == "html.parser":
+        return True
+    try:
+        __import__(backend)
+        return True
+    except ImportError:
+        return False
+
+
+def measure(parse, html, repeat):
+    """Best and mean milliseconds per call, then the peak KB allocated by one call"""
+    parse(html)  # warm-up: selector caches, imports
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(html)
+        times.append(time.perf_counter() - start)
+
+    # Traced separately, tracemalloc slows allocation-heavy code down a lot
+    tracemalloc.start()
+    try:
+        parse(html)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times) * 1000, sum(times) / len(times) * 1000, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=BACKENDS + ("all",), default="all", help="HTML parser backend to run with")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per case, best and mean are reported")
+    parser.add_argument("--case", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON for a later --compare")
+    parser.add_argument("--compare", metavar="FILE", help="show the change against results saved with --save")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    cases = [case for case in build_cases() if args.case in case[0]]
+    backends = BACKENDS if args.backend == "all" else (args.backend,)
+    results = {}
+
+    print(f"{'case':<34} {'backend':<12} {'best ms':>9} {'mean ms':>9} {'peak KB':>9}")
+    for backend in backends:
+        if not backend_available(backend):
+            print(f"{backend:<12} skipped (not installed)")
+            continue
+        core.parsing.HTML_PARSER = backend
+        for name, fixture, parse in cases:
+            best, mean, peak = measure(parse, load_fixture(fixture), args.repeat)
+            key = f"{name} [{backend}]"
+            results[key] = {"best_ms": best, "mean_ms": mean, "peak_kb": peak}
+
+            line = f"{name:<34} {backend:<12} {best:9.2f} {mean:9.2f} {peak:9.0f}"
+            previous = baseline.get(key)
+            if previous:
+                line += f"   time {best / previous['best_ms'] - 1:+.0%}, memory {peak / previous['peak_kb'] - 1:+.0%}"
+            print(line)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"saved {len(results)} results to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
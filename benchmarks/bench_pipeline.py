@@ -0,0 +1,140 @@
+"""
+End-to-end throughput benchmark of the download engine against the offline stand-in sites.
+Each chapter runs through download_chapter_images -> convert_to_format exactly as in the
+app, and the page rate and image bandwidth are reported per provider.
+
+Run from the repository root:
+    python -m benchmarks.bench_pipeline [--provider all] [--chapters 3] [--pages 20] [--format .cbz]
+    python -m benchmarks.bench_pipeline --latency 80 --jitter 40 --bandwidth 2048 --error-rate 0.05
+
+The stand-in server runs in this process by default. For numbers free of its CPU use,
+start it separately (python -m benchmarks.standin_server ...) and pass --url; the server
+options then have to be given to the server, and --pages must match its page count.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import core.engine as engine
+from benchmarks.standin_server import CHAPTER_IDS, PREFIXES, add_server_arguments, create_server
+from core.adaptive import MAX_CONCURRENCY
+from core.cache import set_response_cache
+from core.http_client import configure_host
+
+
+class Result:
+    """Totals of one provider's run"""
+
+    def __init__(self, name):
+        self.name = name
+        self.chapters = 0
+        self.failed = 0
+        self.pages = 0
+        self.image_bytes = 0
+        self.download_time = 0.0
+        self.convert_time = 0.0
+        self.retries = 0
+
+    def report(self):
+        total = self.download_time + self.convert_time
+        pages_per_sec = self.pages / total if total else 0
+        mb_per_sec = self.image_bytes / (1024 * 1024) / self.download_time if self.download_time else 0
+        print(
+            f"{self.name:<10} {self.chapters:>3} ch {self.pages:>5} pages  "
+            f"download {self.download_time:7.2f}s  convert {self.convert_time:6.2f}s  "
+            f"{pages_per_sec:7.1f} pages/s  {mb_per_sec:7.2f} MB/s  "
+            f"{self.retries} retries  {self.failed} failed"
+        )
+
+
+def image_bytes_of(temp_dir):
+    if not temp_dir or not os.path.isdir(temp_dir):
+        return 0
+    return sum(entry.stat().st_size for entry in os.scandir(temp_dir) if entry.is_file())
+
+
+def run_provider(name, base_url, args, output_path):
+    provider = engine.PROVIDER_CLASSES[name]()
+    provider.base_url = base_url
+    result = Result(name)
+    retries_before = engine.page_retry_policy.retries
+
+    for n in range(1, args.chapters + 1):
+        chapter_id = CHAPTER_IDS[name].format(n=n)
+        chapter_title = f"Chapter {n}"
+
+        start = time.perf_counter()
+        temp_dir, total_pages = engine.download_chapter_images(
+            provider, chapter_id, manga_title=f"Bench {name}", chapter_title=chapter_title,
+            chapter_num=n, max_workers=args.workers
+        )
+        result.download_time += time.perf_counter() - start
+        # Saved pages, so pages that failed for good aren't counted
+        saved_bytes = image_bytes_of(temp_dir)
+        saved_pages = len(os.listdir(temp_dir)) if temp_dir and os.path.isdir(temp_dir) else 0
+
+        start = time.perf_counter()
+        success = False
+        if temp_dir and saved_pages:
+            success, _ = engine.convert_to_format(
+                temp_dir, output_path, args.format, f"Bench {name}", chapter_id,
+                chapter_title=chapter_title, chapter_num=n
+            )
+        result.convert_time += time.perf_counter() - start
+
+        result.chapters += 1
+        result.pages += saved_pages
+        result.image_bytes += saved_bytes
+        if not success or saved_pages < total_pages:
+            result.failed += 1
+
+    result.retries = engine.page_retry_policy.retries - retries_before
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=list(PREFIXES) + ["all"], default="all", help="stand-in site to download from")
+    parser.add_argument("--chapters", type=int, default=3, help="chapters downloaded per provider")
+    parser.add_argument("--format", choices=engine.FORMATS, default=".cbz", help="output format")
+    parser.add_argument("--workers", type=int, help="pages fetched in parallel (default: adaptive)")
+    parser.add_argument("--rate", type=float, default=0, help="requests per second to the stand-in host (0 for no limit)")
+    parser.add_argument("--url", help="use a stand-in server that is already running at this address")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        root = args.url.rstrip("/")
+    else:
+        server = create_server(args)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        root = server.root
+
+    # Every request should reach the server, and outside the rate limit unless asked for
+    set_response_cache(None)
+    configure_host(root, MAX_CONCURRENCY, rate=args.rate)
+
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    engine.TEMP_DIR = os.path.join(workdir, "temp")
+    output_path = os.path.join(workdir, "out")
+    names = list(PREFIXES) if args.provider == "all" else [args.provider]
+    print(f"stand-in: {root}, {args.chapters} chapters x {args.pages} pages per provider, format {args.format}")
+
+    try:
+        for name in names:
+            run_provider(name, f"{root}/{PREFIXES[name]}", args, output_path).report()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        if server is not None:
+            stats = server.stats()
+            print(f"server: {stats['requests']} requests, {stats['image_bytes'] / (1024 * 1024):.1f} MB of images, {stats['errors']} injected errors")
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
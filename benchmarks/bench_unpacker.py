@@ -0,0 +1,79 @@
+"""
+Compares the pure-Python p,a,c,k,e,d unpacker with the execjs path MangaHere used to take.
+
+Run from the repository root:
+    python -m benchmarks.bench_unpacker [--pages 40] [--repeat 5]
+"""
+import argparse
+import time
+
+from benchmarks.packer import pack
+from core.unpacker import unpack
+
+try:
+    import execjs
+except ImportError:
+    execjs = None
+
+
+def make_chapterfun_script(page, images_per_response=2):
+    """Build a packed script shaped like a chapterfun.ashx response"""
+    paths = ",".join(
+        f'"/store/manga/12345/01.0/compressed/p{page + i:03d}.jpg?token=abcdef&ttl=1700000000"'
+        for i in range(images_per_response)
+    )
+    source = (
+        "function dm5imagefun(){var cid=1234567;var key='0a1b2c3d4e5f';"
+        'var pix="//zjcdn.mangahere.org";'
+        f"var pvalue=[{paths}];"
+        "for(var i=0;i<pvalue.length;i++){if(pvalue[i]!=''){pvalue[i]=pix+pvalue[i]}}"
+        "return pvalue}var d;d=dm5imagefun();"
+    )
+    return pack(source)
+
+
+def decode_with_execjs(script):
+    ctx = execjs.compile(f"function getResult() {{ return {script.replace('eval', '')} }}")
+    return ctx.call("getResult")
+
+
+def run(label, decode, scripts, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for script in scripts:
+            decode(script)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    per_call = best / len(scripts) * 1000
+    print(f"{label:<10} {best * 1000:10.2f} ms total {per_call:10.3f} ms/page")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=40, help="packed responses per chapter")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per decoder, best is reported")
+    args = parser.parse_args()
+    
+    scripts = [make_chapterfun_script(page) for page in range(1, args.pages + 1)]
+    python_time = run("python", unpack, scripts, args.repeat)
+    
+    if execjs is None:
+        print("execjs     skipped (PyExecJS not installed)")
+        return
+    try:
+        runtime = execjs.get()
+    except Exception as e:
+        print(f"execjs     skipped ({str(e)})")
+        return
+    
+    # Both decoders must agree before their timings mean anything
+    if decode_with_execjs(scripts[0]) != unpack(scripts[0]):
+        print("warning: execjs and python output differ")
+    execjs_time = run("execjs", decode_with_execjs, scripts, args.repeat)
+    print(f"runtime: {runtime.name}, python unpacker is {execjs_time / python_time:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Regenerates the HTML fixtures the benchmarks run against.
+The pages mimic the markup each provider serves, sized like long real-world titles and chapters.
+
+Run from the repository root:
+    python -m benchmarks.make_fixtures
+"""
+import json
+import os
+import random
+
+from benchmarks.packer import pack
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def page_shell(body, head_scripts=3, seed=0, tail=""):
+    """Wrap a page body in the head scripts, styles, navbar and footer every site carries"""
+    rng = random.Random(seed)
+    scripts = "".join(
+        f"<script>window.__chunk{i}=function(a,b){{return a<b?'{rng.getrandbits(64):x}':\"</div>\"}};</script>"
+        for i in range(head_scripts)
+    )
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\"/><title>Fixture</title>"
+        "<link rel=\"stylesheet\" href=\"/static/app.css\"/>"
+        f"{scripts}<style>.a{{color:red}} div > p {{margin:0}}</style></head><body>"
+        "<nav class=\"navbar\"><div class=\"container\"><a href=\"/\">Home</a><a href=\"/search\">Search</a></div></nav>"
+        f"{body}"
+        "<footer class=\"footer\"><p>Fixture footer</p></footer>"
+        f"{tail}</body></html>"
+    )
+
+
+def qwik_payload(rng, entries):
+    """Filler qwik/json state of the kind Mangapark appends to every page"""
+    return json.dumps({
+        "refs": {str(i): f"{i} {i + 1}" for i in range(entries)},
+        "objs": [f"{rng.getrandbits(64):x}" for _ in range(entries * 8)],
+        "subs": [[f"2 #{i}"] for i in range(entries)],
+    })
+
+
+def mangapark_chapter(pages=200, seed=1):
+    """Chapter reader page with the image list buried in a qwik/json payload"""
+    rng = random.Random(seed)
+    objs = []
+    for i in range(1, pages + 1):
+        objs.append(f"https://s{rng.randint(1, 9):02d}.mpqsc.org/media/mpup/2a/{rng.getrandbits(64):016x}/{i:04d}.jpg")
+        objs.append({"w": rng.randint(700, 900), "h": rng.randint(1000, 14000), "k": f"\u0002_#s_{i}"})
+        objs.extend(f"{rng.getrandbits(32):08x}" for _ in range(6))
+    
+    payload = {
+        "refs": {str(i): f"{i} {i + 1}" for i in range(pages)},
+        "ctx": {},
+        "objs": objs,
+        "subs": [[f"2 #{i} 1 #{i + 1}"] for i in range(pages)],
+    }
+    
+    nav = "\n".join(
+        f'<a class="btn btn-xs" href="/title/10000-en-fixture/{9000000 + i}-chapter-{i}">Chapter {i}</a>'
+        for i in range(1, 301)
+    )
+    images = "\n".join(
+        f'<div class="relative w-full" q:key="{i}"><img class="w-full h-full" src="" data-page="{i}"/></div>'
+        for i in range(1, pages + 1)
+    )
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"/><title>Fixture Chapter 1</title>"
+        "<script>window.__cfg={\"theme\":\"dark\",\"lang\":\"en\"};</script></head><body>"
+        f"<main><div class=\"flex flex-col\">{nav}</div><div class=\"flex flex-col\">{images}</div></main>"
+        "<script type=\"module\">import('/build/q-chunk.js')</script>"
+        f"<script type=\"qwik/json\">{json.dumps(payload)}</script>"
+        "</body></html>"
+    )
+
+
+def mangapill_search(results=40, seed=2):
+    """Search results page"""
+    rng = random.Random(seed)
+    items = "".join(
+        f'<div><a href="/manga/{1000 + i}/fixture-title-{i}" class="relative block">'
+        f'<figure class="relative"><img data-src="https://cdn.fixture.test/mangapill/i/{1000 + i}.jpeg" alt="" class="lazy"/></figure></a>'
+        f'<div class="mt-3"><a href="/manga/{1000 + i}/fixture-title-{i}"><div class="mt-3 font-black">Fixture Title {i}</div></a>'
+        f'<div class="text-xs text-secondary">Alt title {rng.getrandbits(24):x}</div>'
+        f'<div class="flex flex-wrap gap-1 mt-1"><div class="text-xs">manga</div><div class="text-xs">{2000 + i % 20}</div></div></div></div>'
+        for i in range(results)
+    )
+    body = (
+        '<div class="container py-3"><h1 class="font-bold">Search</h1>'
+        f'<div class="my-3 grid justify-end gap-3 grid-cols-2">{items}</div></div>'
+    )
+    return page_shell(body, seed=seed)
+
+
+def mangapill_manga(chapters=1200, seed=3):
+    """Title page with the info block and a long chapter list"""
+    genres = "".join(f'<a href="/search?genre={g}" class="text-sm mr-1 text-brand">{g}</a>\n' for g in ["Action", "Drama", "Fantasy", "School Life", "Shounen", "Supernatural"])
+    chapter_links = "".join(
+        f'<a class="border border-border p-1" href="/chapters/{2085}-{10000000 + n * 1000}/fixture-chapter-{n}" title="Fixture Chapter {n}">Chapter {n}</a>'
+        for n in range(chapters, 0, -1)
+    )
+    body = (
+        '<div class="container">'
+        '<div class="my-3 flex flex-col">'
+        '<div class="flex-row flex"><div class="w-60"><img data-src="https://cdn.fixture.test/mangapill/i/2085.jpeg" alt=""/></div>'
+        '<div class="flex flex-col">'
+        '<div class="mb-3"><h1 class="font-bold text-lg">Fixture Series</h1><div class="text-sm">Alternative names</div></div>'
+        '<div class="mb-3"><p class="text-sm text--secondary">A fixture description\nspread over\nseveral lines.</p></div>'
+        '<div class="grid grid-cols-1 gap-3 mb-3">'
+        '<div><label class="text-secondary">Type</label><div>manga</div></div>'
+        '<div><label class="text-secondary">Status</label><div>publishing</div></div>'
+        '<div><label class="text-secondary">Year</label><div>2018</div></div></div>'
+        f'<div class="mb-3"><label class="text-secondary">Genres</label>\n{genres}</div>'
+        '</div></div></div>'
+        '<div class="border-border border-t"><div id="chapters"><div class="grid grid-cols-1 gap-1">'
+        f'{chapter_links}</div></div></div></div>'
+    )
+    return page_shell(body, head_scripts=10, seed=seed)
+
+
+def mangapill_chapter(pages=60, seed=4):
+    """Chapter reader page with one <chapter-page> per image"""
+    rng = random.Random(seed)
+    items = "".join(
+        f'<chapter-page id="{i}"><div class="relative"><div data-summary="{i}"><div>page {i}/{pages}</div></div>'
+        f'<picture><img class="js-page" data-src="https://cdn.fixture.test/file/mangapill/{rng.getrandbits(48):x}/{i}.jpeg" width="800" height="1200"/></picture></div></chapter-page>'
+        for i in range(1, pages + 1)
+    )
+    body = f'<div class="container"><h1>Fixture Chapter</h1></div><div class="mx-auto">{items}</div>'
+    return page_shell(body, head_scripts=6, seed=seed)
+
+
+def mangapark_card(i, rng, with_chapter=False):
+    """One title card as used in search results and the home page lists"""
+    chapter = (
+        f'<div class="flex flex-nowrap justify-between"><a href="/title/{30000 + i}-en-fixture-{i}/{9000000 + i}-chapter-{i + 10}">Chapter {i + 10}</a>'
+        f'<time data-time="{1700000000000 + i}"><span>{i % 59 + 1} mins ago</span></time></div>'
+        if with_chapter else ""
+    )
+    genres = "".join(f'<span class="whitespace-nowrap">{g}</span>' for g in rng.sample(["Action", "Comedy", "Drama", "Romance", "Manhwa", "Fantasy", "Isekai"], 3))
+    return (
+        f'<div class="flex border-b border-b-base-200 pb-5"><div class="w-24"><img src="https://s1.fixture.test/thumb/{30000 + i}.webp" class="rounded"/></div>'
+        f'<div class="pl-3 space-y-1"><h3 class="font-bold text-base"><a href="/title/{30000 + i}-en-fixture-{i}">Fixture Park {i}</a></h3>'
+        f'<span class="flex flex-nowrap items-center text-yellow-500"><span class="font-bold">{rng.uniform(5, 10):.2f}</span></span>'
+        f'<div class="flex flex-wrap text-xs">{genres}</div>{chapter}</div></div>'
+    )
+
+
+def mangapark_search(results=36, seed=5):
+    """Search results page"""
+    rng = random.Random(seed)
+    items = "".join(mangapark_card(i, rng) for i in range(results))
+    body = (
+        f'<main><div class="space-y-5">{items}</div>'
+        '<div class="flex justify-center"><a href="/search?word=fixture&page=1">1</a><a href="/search?word=fixture&page=2">2</a></div></main>'
+    )
+    return page_shell(body, seed=seed, tail=f'<script type="qwik/json">{qwik_payload(rng, 1000)}</script>')
+
+
+def mangapark_title(chapters=900, seed=6):
+    """Title page with ratings, stats and a long chapter list"""
+    rng = random.Random(seed)
+    chapter_rows = "".join(
+        f'<div class="px-2 py-2 flex flex-wrap"><div class="space-x-1"><a href="/title/10000-en-fixture/{9000000 + n}-chapter-{n}">Chapter {n}</a>'
+        f'<span>{": Fixture part " + str(n) if n % 3 == 0 else ""}</span></div>'
+        f'<div class="flex"><div class="text-xs">uploader</div><div class="ml-auto"><time data-time="{1600000000000 + n * 86400000}"><span>{n} days ago</span></time></div></div></div>'
+        for n in range(chapters, 0, -1)
+    )
+    rating_bars = "".join(
+        f'<div class="flex items-center text-xs md:text-sm space-x-2"><div class="flex items-center font-mono font-bold opacity-80"><span>{s}</span></div>'
+        f'<div class="w-full"></div><span class="font-mono opacity-80">{rng.randint(1, 60)}%</span></div>'
+        for s in range(5, 0, -1)
+    )
+    genres = "".join(f'<span><span>{g}</span><span>,</span></span>' for g in ["Action", "Adventure", "Fantasy", "Manhwa", "Full Color"])
+    body = (
+        '<main><div class="flex flex-col md:flex-row">'
+        '<div class="w-40"><img class="w-full not-prose shadow-md" src="https://s1.fixture.test/cover/10000.webp"/></div>'
+        '<div class="space-y-2"><h3 class="text-lg font-bold"><a href="/title/10000-en-fixture">Fixture Park Series</a></h3>'
+        '<div class="mt-2 text-sm md:text-base opacity-80"><a href="/search?author=a">Author One</a><a href="/search?author=b">Artist Two</a></div>'
+        f'<div class="flex items-center flex-wrap">{genres}</div>'
+        '<div><span>Original Publication:</span><span class="font-bold uppercase text-success">Ongoing</span></div>'
+        '<div class="whitespace-nowrap overflow-hidden">Tr From Korean</div>'
+        '<div class="limit-html"><div class="limit-html-p">A fixture description for the title page.</div></div>'
+        '</div></div>'
+        f'<div class="space-y-3"><span class="font-bold opacity-80 whitespace-nowrap">8.91</span><div class="text-sm opacity-80 whitespace-nowrap">1,234 votes</div>{rating_bars}'
+        '<div class="relative"><div class="absolute top-0 bottom-0 left-0 overflow-hidden" style="width:89.1%"></div></div></div>'
+        '<div class="mt-5 space-y-3"><b class="text-lg font-bold">Views</b><div><span class="whitespace-nowrap">Total: 1.2M</span><span class="whitespace-nowrap">360 days: 207.6K</span><span class="whitespace-nowrap">30 days: 12.5K</span></div></div>'
+        '<div class="mt-5 space-y-3"><b class="text-lg font-bold">Readers</b><div><span class="whitespace-nowrap">1.1K Reading</span><span class="whitespace-nowrap">300 Completed</span></div></div>'
+        f'<div class="flex flex-col">{chapter_rows}</div></main>'
+    )
+    return page_shell(body, head_scripts=20, seed=seed, tail=f'<script type="qwik/json">{qwik_payload(rng, 3000)}</script>')
+
+
+def mangapark_home(releases=60, seed=7):
+    """Home page with the Latest Releases list and the genre links"""
+    rng = random.Random(seed)
+    cards = "".join(mangapark_card(i, rng, with_chapter=True) for i in range(releases))
+    genre_links = "".join(f'<a class="link-hover" href="/search?genres={g.lower()}">{g}</a>' for g in ["Action", "Adventure", "Comedy", "Drama", "Fantasy", "Horror", "Isekai", "Romance", "Sci-Fi", "Slice of Life"])
+    body = (
+        '<main><div class="space-y-5"><b class="text-base-content">Popular Updates</b><div>popular</div></div>'
+        f'<div class="space-y-5"><b class="text-base-content">Latest Releases</b>{cards}</div>'
+        f'<div class="w-full border border-base-200"><b>Genres</b><div>{genre_links}</div></div></main>'
+    )
+    return page_shell(body, head_scripts=15, seed=seed, tail=f'<script type="qwik/json">{qwik_payload(rng, 2000)}</script>')
+
+
+def mangahere_search(results=30, seed=8):
+    """Search results page"""
+    rng = random.Random(seed)
+    items = "".join(
+        f'<li><a href="/manga/fixture_here_{i}/" title="Fixture Here {i}"><img src="https://fmcdn.fixture.test/store/manga/{i}/cover.jpg" class="manga-list-4-cover"/></a>'
+        f'<p class="manga-list-4-item-title"><a href="/manga/fixture_here_{i}/" title="Fixture Here {i}">Fixture Here {i}</a></p>'
+        f'<p class="manga-list-4-show-tag-list-2"><a href="/directory/">{rng.choice(["Ongoing", "Completed"])}</a></p>'
+        f'<p class="manga-list-4-item-tip">Latest: Ch.{rng.randint(1, 300)}</p>'
+        f'<p class="manga-list-4-item-tip">Fixture description {i} goes here.</p></li>'
+        for i in range(results)
+    )
+    body = (
+        f'<div class="container"><div class="manga-list-4"><div class="line-list"><ul class="manga-list-4-list line">{items}</ul></div></div></div>'
+        '<div class="pager-list"><div class="pager-list-left"><a class="active" href="#">1</a><a href="/search?title=fixture&page=2">2</a><a href="/search?title=fixture&page=2">&gt;</a></div></div>'
+    )
+    return page_shell(body, head_scripts=8, seed=seed)
+
+
+def mangahere_manga(chapters=700, seed=9):
+    """Title page with the info block and a long chapter list"""
+    items = "".join(
+        f'<li><a href="/manga/fixture_here/c{n:03d}/1.html" title="Fixture Here Ch.{n:03d}"><div class="detail-main-list-main">'
+        f'<p class="title3">Ch.{n:03d} - Fixture part {n}</p><p class="title2">Jan {n % 28 + 1},2021</p></div></a></li>'
+        for n in range(chapters, 0, -1)
+    )
+    body = (
+        '<div class="detail-info"><div class="detail-info-cover"><img src="https://fmcdn.fixture.test/store/manga/1/cover.jpg" class="detail-info-cover-img"/></div>'
+        '<div class="detail-info-right"><p><span class="detail-info-right-title-font">Fixture Here</span>'
+        '<span class="detail-info-right-title-tip">Ongoing</span>'
+        '<span class="detail-info-right-title-star"><span class="item"></span><span class="item-score">4.71</span></span></p>'
+        '<p class="detail-info-right-say">Author: <a href="/search/author/a/" title="Author Here">Author Here</a></p>'
+        '<p class="detail-info-right-tag-list"><a href="/directory/action/" title="Action">Action</a><a href="/directory/drama/" title="Drama">Drama</a></p>'
+        '<p class="fullcontent">A fixture description for MangaHere.</p></div></div>'
+        f'<div class="detail-main"><ul class="detail-main-list">{items}</ul></div>'
+    )
+    return page_shell(body, head_scripts=25, seed=seed)
+
+
+def mangahere_chapter(pages=40, seed=10):
+    """First reader page of a chapter: the pager, the chapter ID and the packed key script"""
+    rng = random.Random(seed)
+    key = "".join(f"{rng.getrandbits(4):x}" for _ in range(16))
+    key_script = pack("var guidkey=" + "+".join(f"'{c}'" for c in key) + ";$('#dm5_key').val(guidkey);")
+    options = "".join(f'<a href="/manga/fixture_here/c001/{i}.html" data-page="{i}">{i}</a>' for i in range(1, pages + 1))
+    body = (
+        '<div class="reader-header"><div class="pager-list"><div class="pager-list-left">'
+        f'<span>1</span>{options}<a class="next" href="#">&gt;</a></div></div></div>'
+        '<div class="reader-main"><img class="reader-main-img" src=""/></div>'
+        f'<script>var chapterid =123456;var imagecount={pages};</script><script>{key_script}</script>'
+    )
+    return page_shell(body, head_scripts=12, seed=seed)
+
+
+FIXTURES = {
+    "mangapark_chapter.html": mangapark_chapter,
+    "mangapark_search.html": mangapark_search,
+    "mangapark_title.html": mangapark_title,
+    "mangapark_home.html": mangapark_home,
+    "mangapill_search.html": mangapill_search,
+    "mangapill_manga.html": mangapill_manga,
+    "mangapill_chapter.html": mangapill_chapter,
+    "mangahere_search.html": mangahere_search,
+    "mangahere_manga.html": mangahere_manga,
+    "mangahere_chapter.html": mangahere_chapter,
+}
+
+
+def load_fixture(filename):
+    """Read a saved fixture page"""
+    with open(os.path.join(FIXTURES_DIR, filename), encoding="utf-8") as f:
+        return f.read()
+
+
+def main():
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for filename, build in FIXTURES.items():
+        path = os.path.join(FIXTURES_DIR, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(build())
+        print(f"wrote {path} ({os.path.getsize(path) // 1024} KB)")
+
+
+if __name__ == "__main__":
+    main()
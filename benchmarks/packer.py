@@ -0,0 +1,35 @@
+"""
+Minimal Dean Edwards p,a,c,k,e,d packer used to build MangaHere-style fixtures.
+Only meant for benchmarks and the offline stand-in server, not for production use.
+"""
+import re
+from collections import Counter
+
+from core.unpacker import encode_base
+
+WORD_RE = re.compile(r"\b\w+\b", re.ASCII)
+
+DECODER = (
+    "eval(function(p,a,c,k,e,d){e=function(c){return(c<a?'':e(parseInt(c/a)))+((c=c%a)>35?"
+    "String.fromCharCode(c+29):c.toString(36))};if(!''.replace(/^/,String)){while(c--)d[e(c)]=k[c]||e(c);"
+    "k=[function(e){return d[e]}];e=function(){return'\\\\w+'};c=1};while(c--)if(k[c])p=p.replace("
+    "new RegExp('\\\\b'+e(c)+'\\\\b','g'),k[c]);return p}"
+)
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("'", "\\'")
+
+
+def pack(source, radix=62):
+    """Pack a JavaScript source string the way MangaHere's pages and chapterfun.ashx do"""
+    # Most frequent words get the shortest tokens
+    words = [word for word, _ in Counter(WORD_RE.findall(source)).most_common()]
+    tokens = {word: encode_base(index, radix) for index, word in enumerate(words)}
+    symbols = [word if word != tokens[word] else "" for word in words]
+    
+    payload = WORD_RE.sub(lambda match: tokens[match.group(0)], source)
+    return (
+        f"{DECODER}('{_escape(payload)}',{radix},{len(words)},"
+        f"'{_escape('|'.join(symbols))}'.split('|'),0,{{}}))"
+    )
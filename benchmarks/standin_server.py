@@ -0,0 +1,296 @@
+"""
+Local stand-in for the MangaPill, Mangapark and MangaHere sites, for benchmarking the
+download engine without internet access. Each site lives under its own path prefix and
+keeps the real URL layout below it (search, title pages, chapter pages, chapterfun.ashx),
+and every chapter's images are served from /cdn.
+
+Pages come from the saved fixtures; chapter pages and images are generated so their
+image URLs point back at this server. Latency, bandwidth and errors can be injected.
+
+Run from the repository root:
+    python -m benchmarks.standin_server [--port 8765] [--latency 50] [--bandwidth 1024] [--error-rate 0.05]
+
+then point a provider at it, e.g. MangaPill().base_url = "http://127.0.0.1:8765/mangapill"
+(benchmarks.bench_pipeline does this for you).
+"""
+import argparse
+import io
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from PIL import Image
+
+from benchmarks.make_fixtures import load_fixture
+from benchmarks.packer import pack
+
+# Path prefix of each stand-in site, base_url is http://host:port/<prefix>
+PREFIXES = {
+    "MangaPill": "mangapill",
+    "MangaPark": "mangapark",
+    "MangaHere": "mangahere",
+}
+
+# Chapter IDs in the shape each provider uses, for clients that need one
+CHAPTER_IDS = {
+    "MangaPill": "2085-{n}/fixture-chapter-{n}",
+    "MangaPark": "10000-en-fixture/{n}-chapter-{n}",
+    "MangaHere": "fixture_here/c{n:03d}",
+}
+
+# Images listed per chapterfun.ashx response, like the real endpoint
+IMAGES_PER_RESPONSE = 2
+
+# Distinct page images generated at startup and served round-robin
+IMAGE_VARIANTS = 4
+
+# Bytes written between bandwidth pauses
+CHUNK_SIZE = 16 * 1024
+
+# Fixture page served for each (prefix, path pattern)
+FIXTURE_ROUTES = [
+    ("mangapill", re.compile(r"^/search$"), "mangapill_search.html"),
+    ("mangapill", re.compile(r"^/manga/.+"), "mangapill_manga.html"),
+    ("mangapark", re.compile(r"^/search$"), "mangapark_search.html"),
+    ("mangapark", re.compile(r"^/$"), "mangapark_home.html"),
+    ("mangapark", re.compile(r"^/title/[^/]+$"), "mangapark_title.html"),
+    ("mangahere", re.compile(r"^/search$"), "mangahere_search.html"),
+    ("mangahere", re.compile(r"^/manga/[^/]+/?$"), "mangahere_manga.html"),
+]
+
+
+def make_image(width, height, seed):
+    """A noisy JPEG page, noise keeps it from compressing far below a real scan"""
+    rng = random.Random(seed)
+    noise = Image.effect_noise((width, height), 40 + rng.randint(0, 20)).convert("RGB")
+    buffer = io.BytesIO()
+    noise.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def mangapill_chapter_page(root, chapter_id, pages):
+    items = "".join(
+        f'<chapter-page id="{i}"><div class="relative"><div data-summary="{i}"><div>page {i}/{pages}</div></div>'
+        f'<picture><img class="js-page" data-src="{root}/cdn/mangapill/{chapter_id}/{i}.jpg"/></picture></div></chapter-page>'
+        for i in range(1, pages + 1)
+    )
+    return f'<html><body><div class="container"><h1>Stand-in chapter</h1></div><div>{items}</div></body></html>'
+
+
+def mangapark_chapter_page(root, chapter_id, pages):
+    # Plain http URLs never match the qwik/json scan (https only), so the parser takes
+    # its <img> fallback, which is enough to drive the download engine
+    images = "".join(
+        f'<div class="relative w-full"><img class="w-full h-full" src="{root}/cdn/mangapark/{chapter_id}/media/{i}.jpg"/></div>'
+        for i in range(1, pages + 1)
+    )
+    return f'<html><body><main><div class="flex flex-col">{images}</div></main></body></html>'
+
+
+def mangahere_chapter_page(chapter_id, pages):
+    links = "".join(f'<a href="/manga/{chapter_id}/{i}.html" data-page="{i}">{i}</a>' for i in range(1, pages + 1))
+    cid = zlib.crc32(chapter_id.encode("utf-8")) % 10 ** 7
+    key_script = pack("var guidkey=" + "+".join(f"'{c}'" for c in "0123456789abcdef") + ";$('#dm5_key').val(guidkey);")
+    return (
+        '<html><body><div class="pager-list"><div class="pager-list-left">'
+        f'<span>1</span>{links}<a class="next" href="#">&gt;</a></div></div>'
+        f'<script>var chapterid ={cid};var imagecount={pages};</script><script>{key_script}</script>'
+        '</body></html>'
+    )
+
+
+def mangahere_chapterfun(root, cid, page, pages):
+    paths = ",".join(
+        f'"/{n}.jpg"' for n in range(page, min(page + IMAGES_PER_RESPONSE, pages + 1))
+    )
+    source = (
+        f'function dm5imagefun(){{var cid={cid};var pix="{root}/cdn/mangahere/{cid}";'
+        f"var pvalue=[{paths}];"
+        "for(var i=0;i<pvalue.length;i++){if(pvalue[i]!=''){pvalue[i]=pix+pvalue[i]}}"
+        "return pvalue}var d;d=dm5imagefun();"
+    )
+    return pack(source)
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server holding the stand-in settings and request counters.
+    latency and jitter are in seconds, bandwidth in bytes per second per response (0 for
+    unlimited), and error_rate is the share of image requests answered with error_status.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, pages=20, image_size=(800, 1200), latency=0.0, jitter=0.0,
+                 bandwidth=0, error_rate=0.0, error_status=503, retry_after=None):
+        super().__init__(address, StandinHandler)
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.images = [make_image(*image_size, seed) for seed in range(IMAGE_VARIANTS)]
+        self.fixtures = {}
+
+        self.requests = 0
+        self.image_bytes = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    @property
+    def root(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_url(self, provider_name):
+        """The base_url a provider should use to talk to this server"""
+        return f"{self.root}/{PREFIXES[provider_name]}"
+
+    def fixture(self, filename):
+        if filename not in self.fixtures:
+            self.fixtures[filename] = load_fixture(filename).encode("utf-8")
+        return self.fixtures[filename]
+
+    def count(self, image_bytes=0, error=False):
+        with self._lock:
+            self.requests += 1
+            self.image_bytes += image_bytes
+            self.errors += error
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self.requests, "image_bytes": self.image_bytes, "errors": self.errors}
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so the client's connection pools behave like against the real sites
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if server.latency or server.jitter:
+            time.sleep(server.latency + random.uniform(0, server.jitter))
+
+        url = urlsplit(self.path)
+        prefix, _, path = url.path.lstrip("/").partition("/")
+        path = "/" + path
+
+        if prefix == "cdn":
+            self.send_image(path)
+            return
+
+        server.count()
+        for route_prefix, pattern, filename in FIXTURE_ROUTES:
+            if prefix == route_prefix and pattern.match(path):
+                self.send_body(server.fixture(filename), "text/html; charset=utf-8")
+                return
+
+        if prefix == "mangapill" and path.startswith("/chapters/"):
+            body = mangapill_chapter_page(server.root, path[len("/chapters/"):], server.pages)
+        elif prefix == "mangapark" and path.startswith("/title/"):
+            body = mangapark_chapter_page(server.root, path[len("/title/"):], server.pages)
+        elif prefix == "mangahere" and path.startswith("/manga/") and path.endswith(".html"):
+            body = mangahere_chapter_page(path[len("/manga/"):].rsplit("/", 1)[0], server.pages)
+        elif prefix == "mangahere" and path == "/chapterfun.ashx":
+            query = parse_qs(url.query)
+            page = int(query.get("page", ["1"])[0])
+            body = mangahere_chapterfun(server.root, query.get("cid", ["0"])[0], page, server.pages)
+        else:
+            self.send_error(404)
+            return
+        self.send_body(body.encode("utf-8"), "text/html; charset=utf-8")
+
+    def send_image(self, path):
+        server = self.server
+        if server.error_rate and random.random() < server.error_rate:
+            server.count(error=True)
+            self.send_response(server.error_status)
+            if server.retry_after is not None:
+                self.send_header("Retry-After", str(server.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        match = re.search(r"(\d+)\.jpg$", path)
+        if not match:
+            server.count()
+            self.send_error(404)
+            return
+        body = server.images[int(match.group(1)) % len(server.images)]
+        server.count(image_bytes=len(body))
+        self.send_body(body, "image/jpeg")
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        bandwidth = self.server.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        for start in range(0, len(body), CHUNK_SIZE):
+            chunk = body[start:start + CHUNK_SIZE]
+            self.wfile.write(chunk)
+            time.sleep(len(chunk) / bandwidth)
+
+
+def add_server_arguments(parser):
+    """Command line options shared by the server and the benchmarks that start one"""
+    parser.add_argument("--pages", type=int, default=20, help="pages per chapter")
+    parser.add_argument("--image-size", default="800x1200", help="page image size, WIDTHxHEIGHT")
+    parser.add_argument("--latency", type=float, default=0, help="added latency per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="random extra latency up to this (ms)")
+    parser.add_argument("--bandwidth", type=float, default=0, help="per-response bandwidth cap (KB/s, 0 for none)")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of image requests that fail (0-1)")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of injected failures")
+    parser.add_argument("--retry-after", type=int, help="Retry-After (seconds) sent with injected failures")
+
+
+def create_server(args, host="127.0.0.1", port=0):
+    """Build a server from add_server_arguments() options (port 0 picks a free port)"""
+    width, height = (int(v) for v in args.image_size.lower().split("x"))
+    return StandinServer(
+        (host, port),
+        pages=args.pages,
+        image_size=(width, height),
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        bandwidth=args.bandwidth * 1024,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = create_server(args, args.host, args.port)
+    for name in PREFIXES:
+        print(f"{name:<10} {server.base_url(name)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(server.stats())
+
+
+if __name__ == "__main__":
+    main()
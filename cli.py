@@ -0,0 +1,166 @@
+"""
+Headless command-line entry point for the download engine. No Tk window is created,
+so it runs on servers without a display and can be started in parallel processes.
+
+Examples:
+    python cli.py --provider MangaPill --manga-id 2085/jujutsu-kaisen --list
+    python cli.py --provider MangaPill --manga-id 2085/jujutsu-kaisen --chapters 1-10,12 --format .cbz --output downloads --concurrency 8
+    python cli.py --provider MangaPill --manga-id 2085/jujutsu-kaisen --chapters 1-3 --metrics --metrics-file metrics.jsonl
+    python cli.py --provider MangaPill --manga-id 2085/jujutsu-kaisen --chapters 1-3 --trace session.json --trace-sample-ms 5
+    python cli.py --provider MangaPill --manga-id 2085/jujutsu-kaisen --chapters 1-10 --transcode webp --quality 75
+"""
+import argparse
+import sys
+import time
+
+from core.cache import set_response_cache
+from core.engine import DEFAULT_CHAPTER_WORKERS, FORMATS, PROVIDER_CLASSES, ProgressReporter, configure_logging, download_chapters, get_chapter_number, page_retry_policy, select_chapters
+from core.metrics import format_summary, metrics
+from core.tracing import trace_session
+from core.transcode import DEFAULT_QUALITY, TRANSCODE_OUTPUT_FORMATS, TRANSCODE_PROFILES, Transcoder
+
+
+class ConsoleReporter(ProgressReporter):
+    """Prints engine status messages, prefixed with the chapter being downloaded"""
+
+    def __init__(self, prefix="", quiet=False):
+        self.prefix = prefix
+        self.quiet = quiet
+
+    def status(self, text):
+        if not self.quiet:
+            print(f"{self.prefix}{text}", flush=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Download manga chapters without the GUI.",
+        epilog="Chapter ranges: 'all' (default), '5', '1-10', '20-' or comma-separated combinations."
+    )
+    parser.add_argument("--provider", required=True, choices=sorted(PROVIDER_CLASSES), help="source to download from")
+    parser.add_argument("--manga-id", required=True, help="manga ID as used by the provider")
+    parser.add_argument("--chapters", default="all", help="chapter range to download")
+    parser.add_argument("--format", default=".cbz", help=f"output format, one of {', '.join(FORMATS)}")
+    parser.add_argument("--output", default=".", help="output directory")
+    parser.add_argument("--concurrency", type=int, default=None, help="most pages fetched in parallel per host (default: adaptive, starting at the provider setting)")
+    parser.add_argument("--chapter-concurrency", type=int, default=DEFAULT_CHAPTER_WORKERS, help=f"chapters downloaded at the same time (default: {DEFAULT_CHAPTER_WORKERS})")
+    parser.add_argument("--list", action="store_true", help="list the chapters and exit")
+    parser.add_argument("--quiet", action="store_true", help="only print one line per chapter")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="log what the providers do; twice for debug details")
+    parser.add_argument("--allow-missing", action="store_true", help="save chapters even if some pages failed (default: keep them for resuming)")
+    parser.add_argument("--transcode", choices=sorted(TRANSCODE_PROFILES), help=f"re-encode pages to this format ({', '.join(TRANSCODE_OUTPUT_FORMATS)} output only)")
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY, help=f"--transcode encoder quality, 1-100 (default: {DEFAULT_QUALITY})")
+    parser.add_argument("--transcode-workers", type=int, default=None, help="processes encoding pages (default: one per CPU core)")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch pages instead of using the response cache")
+    parser.add_argument("--metrics", action="store_true", help="print per-stage timings (p50/p95, bytes, retries) per chapter and for the batch")
+    parser.add_argument("--metrics-file", help="append every timing span and the summaries to this JSON lines file")
+    parser.add_argument("--trace", help="record the download as a Chrome trace (chrome://tracing, Perfetto) in this file")
+    parser.add_argument("--trace-sample-ms", type=float, default=0, help="with --trace, also sample Python stacks this often into <trace>.folded")
+    args = parser.parse_args(argv)
+    
+    if not args.format.startswith("."):
+        args.format = f".{args.format}"
+    if args.format not in FORMATS:
+        parser.error(f"unsupported format {args.format}, expected one of {', '.join(FORMATS)}")
+    if args.concurrency is not None and args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.chapter_concurrency < 1:
+        parser.error("--chapter-concurrency must be at least 1")
+    if not 1 <= args.quality <= 100:
+        parser.error("--quality must be between 1 and 100")
+    if args.transcode_workers is not None and args.transcode_workers < 1:
+        parser.error("--transcode-workers must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging(args.verbose)
+    if args.no_cache:
+        set_response_cache(None)
+    provider = PROVIDER_CLASSES[args.provider]()
+    
+    manga_info = provider.fetch_manga_info(args.manga_id)
+    manga_title = manga_info.get("title") or "Unknown Manga"
+    
+    try:
+        chapters = select_chapters(manga_info.get("chapters", []), args.chapters)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    
+    if args.list:
+        for chapter in chapters:
+            number = get_chapter_number(chapter)
+            label = "?" if number is None else f"{number:g}"
+            print(f"{label:>8}  {chapter.get('id', '')}  {chapter.get('title', '')}")
+        return 0
+    
+    if not chapters:
+        print(f"No chapters of {manga_title} match '{args.chapters}'", file=sys.stderr)
+        return 1
+    
+    transcoder = None
+    if args.transcode and args.format in TRANSCODE_OUTPUT_FORMATS:
+        try:
+            transcoder = Transcoder(args.transcode, args.quality, workers=args.transcode_workers)
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            return 2
+    elif args.transcode:
+        print(f"--transcode only applies to {', '.join(TRANSCODE_OUTPUT_FORMATS)}, keeping the original pages", file=sys.stderr)
+    
+    print(f"Downloading {len(chapters)} chapter(s) of {manga_title} from {args.provider}")
+    
+    def chapter_prefix(i, chapter):
+        return f"[{i + 1}/{len(chapters)}] {chapter.get('title', chapter.get('id', ''))}: "
+    
+    batch_start = time.time()
+    summaries = {}
+    
+    def on_chapter_done(i, chapter, success, output_file):
+        if success:
+            print(f"{chapter_prefix(i, chapter)}saved to {output_file}", flush=True)
+        else:
+            print(f"{chapter_prefix(i, chapter)}failed", file=sys.stderr, flush=True)
+        if args.metrics or args.metrics_file:
+            summary = metrics.summarize(since=batch_start, provider=provider.name, chapter=chapter.get("id", ""))
+            summaries[f"chapter:{chapter.get('id', '')}"] = summary
+            if args.metrics:
+                for line in format_summary(summary):
+                    print(f"{chapter_prefix(i, chapter)}  {line}", flush=True)
+    
+    sample_interval = args.trace_sample_ms / 1000 if args.trace_sample_ms > 0 else None
+    try:
+        with trace_session(args.trace, sample_interval, name=f"{args.provider} batch"):
+            results = download_chapters(
+                provider, chapters, args.output, args.format, manga_title,
+                reporter_factory=lambda i, chapter: ConsoleReporter(chapter_prefix(i, chapter), quiet=args.quiet),
+                on_chapter_done=on_chapter_done,
+                chapter_workers=args.chapter_concurrency,
+                max_workers=args.concurrency,
+                allow_missing=args.allow_missing,
+                transcoder=transcoder
+            )
+    finally:
+        if transcoder is not None:
+            transcoder.close()
+    failed = sum(1 for success, _ in results if not success)
+    
+    print(f"Done. Completed: {len(chapters) - failed}, Failed: {failed}, Page retries: {page_retry_policy.retries}")
+    if transcoder is not None and transcoder.input_bytes:
+        print(f"Transcoded to {args.transcode.upper()}: {transcoder.input_bytes / (1024 * 1024):.1f}MB -> {transcoder.output_bytes / (1024 * 1024):.1f}MB ({transcoder.input_bytes / max(transcoder.output_bytes, 1):.1f}x smaller)")
+    if args.metrics or args.metrics_file:
+        summaries["batch"] = metrics.summarize(since=batch_start, provider=provider.name)
+        if args.metrics:
+            print("Batch timings:")
+            for line in format_summary(summaries["batch"]):
+                print(f"  {line}")
+        if args.metrics_file:
+            metrics.export_jsonl(args.metrics_file, since=batch_start, summaries=summaries, provider=provider.name)
+            print(f"Timings written to {args.metrics_file}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Bounds for the number of requests in flight to one host
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 16
+INITIAL_CONCURRENCY = 4
+
+# Multiplicative decrease applied when a host pushes back
+DECREASE_FACTOR = 0.5
+
+# Responses that mean the host wants us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+# A response this many times slower than the host's usual latency counts as a spike...
+LATENCY_SPIKE_FACTOR = 3.0
+# ...as long as it is also at least this slow (seconds), so jitter on fast hosts is ignored
+LATENCY_SPIKE_FLOOR = 0.5
+
+# Longest Retry-After pause we honour (seconds)
+MAX_RETRY_AFTER = 120
+
+# Throughput is measured over windows of at least this long (seconds)...
+MIN_WINDOW = 0.5
+# ...or this many of the host's usual round trips, whichever is longer
+WINDOW_ROUND_TRIPS = 2
+
+# Completions per second must rise by this share from one window to the next for the limit to grow
+THROUGHPUT_GAIN = 0.05
+
+# Requests spending this share of their time waiting on the rate limiter mean the rate
+# limiter, not the number of requests in flight, is what bounds throughput
+RATE_BOUND_SHARE = 0.25
+
+
+def parse_retry_after(value):
+    """Turn a Retry-After header (seconds or an HTTP date) into seconds to wait, or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit for one host. Completions are counted over short windows, and
+    the limit grows by 1 after a window in which every slot was in use and throughput
+    rose on the window before, so it stops where more requests in flight stop helping.
+    When requests mostly wait on the host's rate limiter, the limit shrinks to what that
+    rate needs (rate x latency) instead. A 429/503, a Retry-After, a connection error or
+    a latency spike halves it, at most once per round trip.
+    """
+
+    def __init__(self, initial=INITIAL_CONCURRENCY, minimum=MIN_CONCURRENCY, maximum=MAX_CONCURRENCY):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self.latency = None
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._last_rate = None
+        self._start_window(time.monotonic())
+        self._cond = threading.Condition()
+
+    @property
+    def current(self):
+        return int(self.limit)
+
+    def acquire(self):
+        """Wait for a free slot (and for any Retry-After pause to end)"""
+        with self._cond:
+            while True:
+                pause = self.paused_until - time.monotonic()
+                if pause > 0:
+                    self._cond.wait(pause)
+                elif self.in_flight < int(self.limit):
+                    break
+                else:
+                    # Requests are queueing for a slot, so a higher limit could help
+                    self._window_saturated = True
+                    self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency=None, status=None, retry_after=None, failed=False, rate_wait=0.0):
+        """
+        Give the slot back and adjust the limit from how the request went. rate_wait is how
+        long the request waited on the host's rate limiter while holding its slot.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + min(retry_after, MAX_RETRY_AFTER))
+
+            if failed or retry_after or status in THROTTLE_STATUSES:
+                self._decrease(now)
+            elif latency is not None:
+                if self._is_spike(latency):
+                    self._decrease(now)
+                else:
+                    self._window_done += 1
+                    self._window_latency += latency
+                    self._window_rate_wait += rate_wait
+                # Track the usual latency slowly, so it follows hosts that just got slower
+                self.latency = latency if self.latency is None else 0.9 * self.latency + 0.1 * latency
+            self._end_window(now)
+            self._cond.notify_all()
+
+    def _start_window(self, now):
+        self._window_start = now
+        self._window_done = 0
+        self._window_latency = 0.0
+        self._window_rate_wait = 0.0
+        self._window_saturated = False
+
+    def _end_window(self, now):
+        elapsed = now - self._window_start
+        if elapsed < max(MIN_WINDOW, WINDOW_ROUND_TRIPS * (self.latency or 0.0)) or not self._window_done:
+            return
+        rate = self._window_done / elapsed
+        busy = self._window_latency + self._window_rate_wait
+        if busy and self._window_rate_wait / busy >= RATE_BOUND_SHARE:
+            # Little's law: the rate limiter's pace times the latency is all the concurrency it needs
+            needed = math.ceil(rate * self._window_latency / self._window_done) + 1
+            self.limit = min(self.limit, float(max(self.minimum, needed)))
+        elif self._window_saturated and (self._last_rate is None or rate > self._last_rate * (1 + THROUGHPUT_GAIN)):
+            self.limit = min(float(self.maximum), self.limit + 1)
+        self._last_rate = rate
+        self._start_window(now)
+
+    def _is_spike(self, latency):
+        return (
+            self.latency is not None
+            and latency >= LATENCY_SPIKE_FLOOR
+            and latency > self.latency * LATENCY_SPIKE_FACTOR
+        )
+
+    def _decrease(self, now):
+        # Requests already in flight when the host pushed back will report the same
+        # overload, so only back off once per round trip
+        if now - self._last_decrease < (self.latency or 1.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.minimum), self.limit * DECREASE_FACTOR)
+
+
+class HostConcurrency:
+    """Keeps one AdaptiveLimit per host, created on first use"""
+
+    def __init__(self, initial=INITIAL_CONCURRENCY, maximum=MAX_CONCURRENCY):
+        self.initial = initial
+        self.maximum = maximum
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host, initial):
+        """Set the starting limit for a host; limits already learned are kept"""
+        with self._lock:
+            if host not in self._limits:
+                self._limits[host] = AdaptiveLimit(initial, maximum=self.maximum)
+
+    def get(self, host):
+        with self._lock:
+            if host not in self._limits:
+                self._limits[host] = AdaptiveLimit(self.initial, maximum=self.maximum)
+            return self._limits[host]
+
+    def snapshot(self):
+        """Current limit for every host seen so far"""
+        with self._lock:
+            return {host: limit.current for host, limit in self._limits.items()}
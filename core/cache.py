@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+# Default location and size cap of the on-disk response cache
+DEFAULT_CACHE_DIR = os.path.join("cache", "http")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+# How long cached responses stay fresh, per endpoint type (seconds)
+CACHE_TTLS = {
+    "search": 60 * 60,
+    "home": 15 * 60,
+    # Chapter lists change whenever a new chapter is released
+    "manga_info": 15 * 60,
+    # Page lists of a released chapter rarely change
+    "chapter_pages": 30 * 24 * 60 * 60,
+}
+
+
+class ResponseCache:
+    """
+    Disk-backed cache of response bodies keyed by provider and URL.
+    Entries are zlib-compressed, expire after the TTL of their endpoint type, and the
+    least recently used entries are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def _path(self, provider, url):
+        digest = hashlib.sha256(f"{provider}\n{url}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.z")
+
+    def get(self, provider, url, ttl):
+        """Return the cached body if it is younger than ttl seconds, otherwise None"""
+        path = self._path(provider, url)
+        try:
+            with open(path, "rb") as f:
+                entry = json.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, zlib.error):
+            return None
+        
+        if entry.get("url") != url or time.time() - entry.get("stored_at", 0) > ttl:
+            return None
+        
+        # Reads refresh the modification time, which is what eviction orders by
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("body")
+
+    def set(self, provider, url, body):
+        """Store a response body, evicting old entries if the cache is over its size cap"""
+        path = self._path(provider, url)
+        data = zlib.compress(json.dumps({"url": url, "stored_at": time.time(), "body": body}).encode("utf-8"))
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial_path = f"{path}.{threading.get_ident()}.part"
+        with open(partial_path, "wb") as f:
+            f.write(data)
+        
+        with self._lock:
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(partial_path, path)
+            if self._total_bytes is None:
+                self._total_bytes = self._scan()[1]
+            else:
+                self._total_bytes += len(data) - previous_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def delete(self, provider, url):
+        """Drop a cached response, if there is one"""
+        path = self._path(provider, url)
+        with self._lock:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                return
+            if self._total_bytes is not None:
+                self._total_bytes -= size
+
+    def _scan(self):
+        entries = []
+        total = 0
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if not filename.endswith(".z"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def _evict(self):
+        # Drop least recently used entries until we're comfortably under the cap
+        entries, total = self._scan()
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        self._total_bytes = total
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            for _, _, path in self._scan()[0]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes = 0
+
+
+_response_cache = ResponseCache()
+
+
+def get_response_cache():
+    """Return the cache used by the providers, or None when caching is disabled"""
+    return _response_cache
+
+
+def set_response_cache(cache):
+    """Replace the providers' response cache; pass None to disable caching"""
+    global _response_cache
+    _response_cache = cache
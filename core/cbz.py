@@ -0,0 +1,111 @@
+import hashlib
+import os
+import zipfile
+import zlib
+
+# Page formats that are already compressed, deflating them again only costs CPU
+STORED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif')
+
+
+def page_sort_key(filename):
+    """Order archive entries by page number ("2.jpg" before "10.jpg"), other names last"""
+    stem = os.path.splitext(filename)[0]
+    try:
+        return (0, float(stem), filename)
+    except ValueError:
+        return (1, 0.0, filename)
+
+
+class CbzWriter:
+    """
+    Streams chapter pages straight into a .cbz archive as they are downloaded.
+    The archive is written to a .part file and atomically renamed into place on close().
+    With resume=True an existing .part archive is reopened and appended to; a page name
+    is never written twice, and the pages are put back in page order on close().
+    """
+
+    def __init__(self, output_file, resume=False):
+        self.output_file = output_file
+        self.partial_file = f"{output_file}.part"
+        mode = "a" if resume and zipfile.is_zipfile(self.partial_file) else "w"
+        self._archive = zipfile.ZipFile(self.partial_file, mode, zipfile.ZIP_DEFLATED)
+        self.resumed = mode == "a"
+        self.page_count = len(self._archive.namelist())
+
+    def has_page(self, filename, size, sha256=None):
+        """Check a page is already in the archive with the expected size (and SHA-256 digest, if given)"""
+        try:
+            if self._archive.getinfo(filename).file_size != size:
+                return False
+            if sha256 is None:
+                return True
+            # Reading the entry also checks its CRC
+            return hashlib.sha256(self._archive.read(filename)).hexdigest() == sha256
+        except (KeyError, zipfile.BadZipFile, zlib.error, OSError):
+            return False
+
+    def retain(self, filenames):
+        """Drop every page not in `filenames` from a resumed archive, before new pages are added"""
+        keep = set(filenames)
+        if any(name not in keep for name in self._archive.namelist()):
+            self._rebuild(lambda infos: [info for info in infos if info.filename in keep])
+
+    def add_page(self, filename, data):
+        """Add one page to the archive, storing already-compressed images without deflate"""
+        if filename in self._archive.NameToInfo:
+            # Replacing a page: zip entries can't be overwritten, so rewrite the archive without it
+            self._rebuild(lambda infos: [info for info in infos if info.filename != filename])
+        extension = os.path.splitext(filename)[1].lower()
+        compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+        self._archive.writestr(filename, data, compress_type=compress_type)
+        self.page_count += 1
+
+    def add_file(self, path, filename=None):
+        """Add a page that already exists on disk"""
+        with open(path, "rb") as f:
+            self.add_page(filename or os.path.basename(path), f.read())
+
+    def _rebuild(self, select):
+        """Rewrite the .part archive with the entries select(infos) returns, in that order"""
+        self._archive.close()
+        rebuilt_file = f"{self.partial_file}.rebuild"
+        with zipfile.ZipFile(self.partial_file) as source, zipfile.ZipFile(rebuilt_file, "w", zipfile.ZIP_DEFLATED) as target:
+            # Only the last entry of a name counts, as in archives written before names were unique
+            latest = {info.filename: info for info in source.infolist()}
+            for info in select(list(latest.values())):
+                target.writestr(info, source.read(info))
+        os.replace(rebuilt_file, self.partial_file)
+        self._archive = zipfile.ZipFile(self.partial_file, "a", zipfile.ZIP_DEFLATED)
+        self.page_count = len(self._archive.namelist())
+
+    def close(self):
+        """Finish the archive (in page order) and move it to its final name"""
+        names = self._archive.namelist()
+        if names != sorted(set(names), key=page_sort_key):
+            self._rebuild(lambda infos: sorted(infos, key=lambda info: page_sort_key(info.filename)))
+        self._archive.close()
+        os.replace(self.partial_file, self.output_file)
+        return self.output_file
+
+    def suspend(self):
+        """Finish the archive but keep it as a .part file so a later run can resume it"""
+        self._archive.close()
+        return self.partial_file
+
+    def abort(self):
+        """Discard the partially written archive"""
+        try:
+            self._archive.close()
+        finally:
+            if os.path.exists(self.partial_file):
+                os.remove(self.partial_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
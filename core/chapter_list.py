@@ -0,0 +1,121 @@
+from core.engine import get_chapter_number
+
+# Sort options offered by the chapter list
+SORT_NEWEST_FIRST = "Newest First"
+SORT_OLDEST_FIRST = "Oldest First"
+
+
+# Function to build the text shown for a chapter in the chapter list
+def format_chapter_label(chapter):
+    chapter_title = chapter.get("title", "")
+    chapter_num = chapter.get("chapter", "")
+    if chapter_num:
+        return f"Chapter {chapter_num} - {chapter_title}"
+    return chapter_title
+
+
+# Function to build the lowercase text a chapter is searched by: its title, its chapter
+# field and its parsed number, separated so a query can't match across two fields
+def build_search_key(chapter, number=None):
+    parts = [chapter.get("title", ""), str(chapter.get("chapter", ""))]
+    if number is not None:
+        parts.append(f"{number:g}")
+    return "\0".join(parts).lower()
+
+
+# Function to work out the listbox edits that turn old_rows into new_rows when both keep the
+# same relative order (as filtering does). Returns (start, delete_count, inserted_rows) edits
+# from the bottom up, so applying them in turn keeps the earlier positions valid, or None if
+# the order changed and the list has to be redrawn
+def diff_rows(old_rows, new_rows):
+    old_set = set(old_rows)
+    new_set = set(new_rows)
+    edits = []
+    i = j = 0
+    while True:
+        start = i
+        while i < len(old_rows) and old_rows[i] not in new_set:
+            i += 1
+        inserted = []
+        while j < len(new_rows) and new_rows[j] not in old_set:
+            inserted.append(new_rows[j])
+            j += 1
+        if i > start or inserted:
+            edits.append((start, i - start, inserted))
+        if i == len(old_rows) and j == len(new_rows):
+            break
+        if i == len(old_rows) or j == len(new_rows) or old_rows[i] != new_rows[j]:
+            return None
+        i += 1
+        j += 1
+    edits.reverse()
+    return edits
+
+
+class ChapterList:
+    """
+    View model behind the chapter list. Keeps every chapter of the open manga and the rows
+    currently shown as indices into that list, so a row maps straight back to its chapter.
+    Filtering and sorting only rearrange the row indices; the chapters are never touched.
+    """
+
+    def __init__(self, chapters=None):
+        self.chapters = list(chapters or [])
+        self.labels = [format_chapter_label(chapter) for chapter in self.chapters]
+        numbers = [get_chapter_number(chapter) for chapter in self.chapters]
+        self.numbers = [number or 0 for number in numbers]
+        self.search_keys = [build_search_key(chapter, number) for chapter, number in zip(self.chapters, numbers)]
+        self.rows = list(range(len(self.chapters)))
+        self.sort_option = None
+        
+        # Last search and the chapters matching it, in chapter order
+        self.query = ""
+        self.matches = list(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def chapter_at(self, row):
+        """Return the chapter shown in a row"""
+        return self.chapters[self.rows[row]]
+
+    def chapters_at(self, rows):
+        """Return the chapters shown in the given rows, skipping rows that don't exist"""
+        return [self.chapters[self.rows[row]] for row in rows if 0 <= row < len(self.rows)]
+
+    def row_labels(self):
+        """Return the text of every row, in display order"""
+        return [self.labels[i] for i in self.rows]
+
+    def filter(self, search_text):
+        """
+        Show only chapters whose title or number contains search_text (all chapters if empty).
+        Returns False if the search didn't change.
+        """
+        search_text = search_text.lower()
+        if search_text == self.query:
+            return False
+        
+        # A query containing the previous one can only match fewer chapters,
+        # so typing more only re-checks what is already shown
+        if self.query in search_text:
+            candidates = self.matches
+        else:
+            candidates = range(len(self.chapters))
+        self.matches = [i for i in candidates if search_text in self.search_keys[i]]
+        self.query = search_text
+        
+        self.rows = list(self.matches)
+        self._apply_sort()
+        return True
+
+    def sort(self, sort_option):
+        """Order the shown rows by chapter number; the order is kept by later filters"""
+        self.sort_option = sort_option
+        self._apply_sort()
+
+    def _apply_sort(self):
+        if self.sort_option == SORT_NEWEST_FIRST:
+            self.rows.sort(key=self.numbers.__getitem__, reverse=True)
+        elif self.sort_option == SORT_OLDEST_FIRST:
+            self.rows.sort(key=self.numbers.__getitem__)
@@ -0,0 +1,634 @@
+import logging
+import os
+import re
+import time
+import heapq
+import shutil
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from io import BytesIO
+from PIL import Image
+from core.adaptive import MAX_CONCURRENCY
+from core.cbz import CbzWriter
+from core.manifest import MANIFEST_SUFFIX, ChapterManifest
+from core.metrics import metrics
+from core.pdf import PdfWriter
+from core.retry import RetryPolicy
+from core.transcode import TRANSCODE_OUTPUT_FORMATS
+from core.http_client import HttpClient, configure_host, get_host
+from providers.manga.mangapill import MangaPill
+from providers.manga.mangapark import Mangapark
+from providers.manga.mangahere import MangaHere
+
+# Provider classes by the name shown in the UI and accepted by the CLI
+PROVIDER_CLASSES = {
+    "MangaPill": MangaPill,
+    "MangaPark": Mangapark,
+    "MangaHere": MangaHere
+}
+
+# Shared HTTP client for cover art and providers that don't bring their own client
+image_client = HttpClient(headers={
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8"
+})
+
+# Number of chapters downloaded at the same time by download_chapters()
+DEFAULT_CHAPTER_WORKERS = 3
+
+# Number of pages fetched in parallel at first when a provider doesn't set page_workers
+DEFAULT_PAGE_WORKERS = 4
+
+# Retries failed page downloads with backoff; its retry count covers every download in this process
+page_retry_policy = RetryPolicy()
+
+# Keep pages in the format the server sent them instead of re-encoding to PNG
+PASSTHROUGH_IMAGES = True
+
+# Image statuses that mean the page list's signed image URLs have expired; the provider's
+# cached page list is dropped so the next run resolves fresh URLs
+EXPIRED_IMAGE_STATUSES = (403,)
+
+# Magic byte signatures used to detect the real type of a downloaded page
+IMAGE_SIGNATURES = [
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+]
+
+# Page extensions picked up by the exporters
+IMAGE_EXTENSIONS = ('.jpg', '.png', '.gif', '.webp', '.avif')
+
+# Available formats for download (will add more)
+FORMATS = ['.cbz', '.pdf', '.png']
+
+# Folder the page images are downloaded to before conversion
+TEMP_DIR = "temp"
+
+# Log levels by verbosity: warnings only by default, then provider progress, then debug details
+LOG_LEVELS = [logging.WARNING, logging.INFO, logging.DEBUG]
+LOG_FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+
+# Function to set up logging once for the entry points (cli.py and main.py)
+def configure_logging(verbosity=0):
+    logging.basicConfig(level=LOG_LEVELS[min(verbosity, len(LOG_LEVELS) - 1)], format=LOG_FORMAT)
+
+
+class ProgressReporter:
+    """
+    Receives status text and progress updates from the download engine.
+    The base class ignores them; the GUI and CLI subclass it to display them.
+    """
+
+    def status(self, text):
+        pass
+
+    def progress(self, percent):
+        pass
+
+
+def create_providers():
+    """Instantiate every provider, keyed by name"""
+    return {name: provider_class() for name, provider_class in PROVIDER_CLASSES.items()}
+
+
+# Function to filter out illegal characters from file names
+def filter_path(path):
+    illegal_chars = ["\\", "/", ":", "*", "?", "\"", "<", ">", "|"]
+    for char in illegal_chars:
+        path = path.replace(char, "")
+    return path
+
+# Function to clean chapter IDs to extract just the chapter number
+def clean_chapter_id(chapter_id):
+    """
+    Extract a clean chapter number/identifier from complex chapter IDs.
+    Common patterns: "552-10558000bleach-chapter-558", "11784-en-berserk", etc.
+    """
+    # Convert to string if not already
+    chapter_id_str = str(chapter_id)
+    
+    # Pattern 1: Extract chapter number from "chapter-XXX" pattern
+    chapter_match = re.search(r'chapter[_-](\d+(?:\.\d+)?)', chapter_id_str, re.IGNORECASE)
+    if chapter_match:
+        return chapter_match.group(1)
+    
+    # Pattern 2: Handle volume pattern
+    volume_match = re.search(r'volume[_-](\d+(?:\.\d+)?)', chapter_id_str, re.IGNORECASE)
+    if volume_match:
+        return f"v{volume_match.group(1)}"
+    
+    # Pattern 3: Extract numeric ID from the beginning (before any text)
+    numeric_match = re.search(r'^(\d+(?:-\d+)?)', chapter_id_str)
+    if numeric_match:
+        return numeric_match.group(1)
+    
+    # Pattern 4: Look for numbers after the last dash
+    dash_match = re.search(r'-(\d+)(?:[^0-9-]|$)', chapter_id_str)
+    if dash_match:
+        return dash_match.group(1)
+    
+    # If no pattern matches, return the original ID after filtering illegal chars
+    return filter_path(chapter_id_str)
+
+# Function to work out a chapter's number, used to select chapter ranges
+def get_chapter_number(chapter):
+    """Return the chapter number as a float, or None if it can't be determined"""
+    try:
+        return float(chapter.get("chapter"))
+    except (TypeError, ValueError):
+        pass
+    
+    # Fall back to "Chapter 12.5" style titles, then "...-chapter-12" style IDs
+    title_match = re.search(r'(?:chapter|ch\.?)\s*(\d+(?:\.\d+)?)', str(chapter.get("title", "")), re.IGNORECASE)
+    if title_match:
+        return float(title_match.group(1))
+    id_match = re.search(r'chapter[_-](\d+(?:\.\d+)?)', str(chapter.get("id", "")), re.IGNORECASE)
+    if id_match:
+        return float(id_match.group(1))
+    return None
+
+# Function to parse a chapter range such as "1-10,12,20-" into (start, end) pairs
+def parse_chapter_range(spec):
+    """Return a list of inclusive (start, end) ranges, or None to select every chapter"""
+    if not spec or spec.strip().lower() == "all":
+        return None
+    
+    ranges = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        match = re.fullmatch(r'(\d+(?:\.\d+)?)?\s*(-)?\s*(\d+(?:\.\d+)?)?', part)
+        if not match or not (match.group(1) or match.group(3)):
+            raise ValueError(f"Invalid chapter range: {part}")
+        start, dash, end = match.groups()
+        if not dash:
+            ranges.append((float(start), float(start)))
+        else:
+            ranges.append((float(start) if start else float("-inf"), float(end) if end else float("inf")))
+    return ranges
+
+# Function to pick the chapters matching a range spec, oldest first
+def select_chapters(chapters, spec):
+    ranges = parse_chapter_range(spec)
+    numbered = [(get_chapter_number(chapter), chapter) for chapter in chapters]
+    if ranges is not None:
+        numbered = [
+            (number, chapter) for number, chapter in numbered
+            if number is not None and any(start <= number <= end for start, end in ranges)
+        ]
+    numbered.sort(key=lambda item: float("inf") if item[0] is None else item[0])
+    return [chapter for _, chapter in numbered]
+
+# Function to detect an image type from its magic bytes
+def detect_image_extension(image_data):
+    """Return the file extension matching the image's magic bytes, or None if unknown"""
+    for signature, extension in IMAGE_SIGNATURES:
+        if image_data.startswith(signature):
+            return extension
+    
+    # WebP is a RIFF container, AVIF an ISO media file with an avif brand
+    if image_data[:4] == b"RIFF" and image_data[8:12] == b"WEBP":
+        return ".webp"
+    if image_data[4:8] == b"ftyp" and image_data[8:12] in (b"avif", b"avis"):
+        return ".avif"
+    
+    return None
+
+# Function to prepare a downloaded page for storage, keeping the original bytes when possible
+def prepare_page_image(image_data):
+    """Return (extension, data) for a downloaded page"""
+    extension = detect_image_extension(image_data) if PASSTHROUGH_IMAGES else None
+    if extension:
+        # Keep the original bytes as-is, no decode/re-encode needed
+        return extension, image_data
+    
+    # Unknown type (or passthrough disabled): decode and store as PNG
+    img = Image.open(BytesIO(image_data))
+    buffer = BytesIO()
+    img.save(buffer, "PNG")
+    return ".png", buffer.getvalue()
+
+# Function to build the safe chapter name used for temp folders and output files
+def get_safe_chapter_name(chapter_id, chapter_title=None, chapter_num=None):
+    # Use chapter title if provided, otherwise use chapter ID
+    if chapter_title and chapter_title.strip():
+        safe_chapter_name = filter_path(chapter_title)
+        # If chapter number is provided, include it at the beginning
+        if chapter_num:
+            safe_chapter_name = f"Ch{chapter_num}_{safe_chapter_name}"
+    else:
+        # Fallback to the cleaned chapter ID
+        safe_chapter_name = f"Chapter_{clean_chapter_id(chapter_id)}"
+    return safe_chapter_name
+
+# Function to pick a unique output file path for a chapter
+def get_output_file(output_path, format_type, manga_title, chapter_id, chapter_title=None, chapter_num=None):
+    safe_manga_title = filter_path(manga_title)
+    safe_chapter_name = get_safe_chapter_name(chapter_id, chapter_title, chapter_num)
+    
+    base_output_file = os.path.join(output_path, f"{safe_manga_title}_{safe_chapter_name}")
+    
+    # Make sure the path isn't too long
+    if len(base_output_file) > 240:  # Windows has 260 char path limit
+        short_title = safe_manga_title[:20] if len(safe_manga_title) > 20 else safe_manga_title
+        short_chapter = safe_chapter_name[:20] if len(safe_chapter_name) > 20 else safe_chapter_name
+        base_output_file = os.path.join(output_path, f"{short_title}_{short_chapter}")
+    
+    # If the file already exists (from a previous batch download in the same session),
+    # add a timestamp to make it unique
+    if os.path.exists(f"{base_output_file}{format_type}"):
+        timestamp = int(time.time())
+        base_output_file = f"{base_output_file}_{timestamp}"
+    
+    return f"{base_output_file}{format_type}"
+
+# Function to build the temp folder a chapter's pages are downloaded into
+def get_temp_dir(manga_title, chapter_id, chapter_title=None, chapter_num=None):
+    safe_chapter_name = get_safe_chapter_name(chapter_id, chapter_title, chapter_num)
+    return os.path.join(TEMP_DIR, f"{filter_path(manga_title)}_{safe_chapter_name}")
+
+# Function to build the path of a chapter's download manifest for one format (kept beside its temp folder)
+def get_manifest_path(manga_title, chapter_id, format_type, chapter_title=None, chapter_num=None):
+    return get_temp_dir(manga_title, chapter_id, chapter_title, chapter_num) + format_type + MANIFEST_SUFFIX
+
+# Function to fetch the raw bytes of a single chapter page
+# The request is timed as an image_get span carrying `tags` (provider, chapter, page, attempt)
+# With a transcoder the page is re-encoded right away, on this worker, as a transcode span
+def fetch_page_image(page, client, tags=None, transcoder=None):
+    img_url = page.get("img")
+    headers = page.get("headerForImage", {})
+    
+    with metrics.span("image_get", **(tags or {})) as span:
+        response = client.get(img_url, headers=headers)
+        span["status"] = response.status_code
+        response.raise_for_status()
+        span["bytes"] = len(response.content)
+        image_data = response.content
+    
+    if transcoder is not None:
+        with metrics.span("transcode", **(tags or {})) as span:
+            image_data = transcoder.transcode(image_data)
+            span["bytes"] = len(image_data)
+    return image_data
+
+# Function to download manga chapter images
+# Pages are written to a temp folder, or handed to page_writer (e.g. a CbzWriter) when given
+# Pages run on `executor` when one is given, so a batch can share one page pool across chapters
+# Pages are re-encoded by `transcoder` (see core.transcode) when one is given
+# A page refused with 403 makes the provider forget its cached page list, if it keeps one
+def download_chapter_images(provider, chapter_id, reporter=None, manga_title="", chapter_title=None, chapter_num=None, page_writer=None, max_workers=None, manifest=None, executor=None, transcoder=None):
+    reporter = reporter or ProgressReporter()
+    try:
+        temp_dir = None
+        if page_writer is None:
+            # Create temp directory if it doesn't exist
+            temp_dir = get_temp_dir(manga_title, chapter_id, chapter_title, chapter_num)
+            if not os.path.exists(temp_dir):
+                os.makedirs(temp_dir)
+        
+        # Get chapter pages
+        tags = {"provider": getattr(provider, "name", ""), "chapter": chapter_id}
+        with metrics.span("chapter_pages", **tags) as span:
+            pages = provider.fetch_chapter_pages(chapter_id)
+            span["pages"] = len(pages)
+        total_pages = len(pages)
+        
+        # Skip pages a previous run already saved intact
+        skipped = set()
+        if manifest is not None:
+            manifest.set_urls(pages)
+            for i, page in enumerate(pages):
+                page_num = page.get("page", i+1)
+                entry = manifest.get_page(page_num)
+                if page_writer is not None:
+                    if entry and page_writer.has_page(entry["filename"], entry["bytes"], entry.get("sha256")):
+                        skipped.add(i)
+                elif manifest.has_file(page_num, temp_dir):
+                    skipped.add(i)
+        
+        # Pages left behind that won't be kept (the chapter changed, or a page is damaged)
+        # are removed first, so a page is never stored twice under different names or bytes,
+        # and forgotten, so only pages saved or verified in this run count as saved
+        if manifest is not None:
+            kept = {manifest.get_page(pages[i].get("page", i+1))["filename"] for i in skipped}
+            for i, page in enumerate(pages):
+                if i not in skipped:
+                    manifest.forget_page(page.get("page", i+1))
+            if page_writer is not None:
+                page_writer.retain(kept)
+            else:
+                for filename in os.listdir(temp_dir):
+                    if filename.lower().endswith(IMAGE_EXTENSIONS) and filename not in kept:
+                        os.remove(os.path.join(temp_dir, filename))
+        
+        if skipped:
+            reporter.status(f"Resuming: {len(skipped)} of {total_pages} pages already saved")
+        else:
+            reporter.status(f"Downloading {total_pages} pages...")
+        
+        # Fetch pages on a worker pool big enough for the adaptive per-host limits to grow into.
+        # Each image host starts at the provider's page_workers (or the override) and the
+        # limit then follows what the host sustains
+        initial_workers = max_workers or getattr(provider, "page_workers", DEFAULT_PAGE_WORKERS)
+        max_workers = max_workers or MAX_CONCURRENCY
+        client = getattr(provider, "client", image_client)
+        
+        # Keep enough pooled connections open to each image host for every worker
+        for image_host in {get_host(page["img"]) for i, page in enumerate(pages) if page.get("img") and i not in skipped}:
+            configure_host(image_host, max_workers, concurrency=initial_workers)
+        
+        downloaded = len(skipped)
+        next_index = 0
+        finished = {i: None for i in skipped}
+        
+        # Pages in flight, attempts made per page, and failed pages waiting to be retried (due time, index)
+        pending = {}
+        attempts = {}
+        retry_queue = []
+        retries = 0
+        expired = False
+        
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        
+        def submit(i):
+            attempts[i] = attempts.get(i, 0) + 1
+            page_tags = {**tags, "page": pages[i].get("page", i+1), "attempt": attempts[i]}
+            pending[executor.submit(fetch_page_image, pages[i], client, page_tags, transcoder)] = i
+        
+        try:
+            for i in range(total_pages):
+                if i not in skipped:
+                    submit(i)
+            
+            while pending or retry_queue:
+                # Failed pages go back to the end of the pool queue once their backoff is over
+                now = time.monotonic()
+                while retry_queue and retry_queue[0][0] <= now:
+                    submit(heapq.heappop(retry_queue)[1])
+                timeout = retry_queue[0][0] - now if retry_queue else None
+                if not pending:
+                    time.sleep(timeout)
+                    continue
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    i = pending.pop(future)
+                    try:
+                        finished[i] = future.result()
+                    except Exception as e:
+                        if page_retry_policy.should_retry(e, attempts[i]):
+                            delay = page_retry_policy.get_delay(attempts[i], e)
+                            page_retry_policy.record_retry()
+                            retries += 1
+                            print(f"Retrying page {i+1} in {delay:.1f}s (attempt {attempts[i]} failed: {str(e)})")
+                            heapq.heappush(retry_queue, (time.monotonic() + delay, i))
+                            continue
+                        print(f"Error downloading page {i+1}: {str(e)}")
+                        finished[i] = None
+                        if getattr(getattr(e, "response", None), "status_code", None) in EXPIRED_IMAGE_STATUSES:
+                            expired = True
+                    
+                    # Write every page that is now contiguous, keeping page order
+                    while next_index in finished:
+                        image_data = finished.pop(next_index)
+                        page_num = pages[next_index].get("page", next_index+1)
+                        next_index += 1
+                        if image_data is None:
+                            continue
+                        try:
+                            with metrics.span("image_prepare", page=page_num, **tags) as span:
+                                extension, image_data = prepare_page_image(image_data)
+                                span["bytes"] = len(image_data)
+                            filename = f"{page_num}{extension}"
+                            with metrics.span("page_write", page=page_num, bytes=len(image_data), **tags):
+                                if page_writer is not None:
+                                    page_writer.add_page(filename, image_data)
+                                else:
+                                    with open(os.path.join(temp_dir, filename), "wb") as f:
+                                        f.write(image_data)
+                            if manifest is not None:
+                                manifest.record_page(page_num, filename, image_data)
+                        except Exception as e:
+                            print(f"Error saving page {page_num}: {str(e)}")
+                    
+                    # Update progress
+                    downloaded += 1
+                    reporter.progress(int(downloaded / total_pages * 100))
+                    reporter.status(f"Downloaded page {downloaded}/{total_pages}")
+        finally:
+            # Drop pages still queued if this chapter failed part way
+            for future in pending:
+                future.cancel()
+            if own_executor:
+                executor.shutdown()
+        
+        if retries:
+            reporter.status(f"Downloaded page {downloaded}/{total_pages} ({retries} retries)")
+        
+        forget_chapter_pages = getattr(provider, "forget_chapter_pages", None)
+        if expired and forget_chapter_pages is not None:
+            forget_chapter_pages(chapter_id)
+        
+        if manifest is not None:
+            manifest.save()
+        
+        return temp_dir, total_pages
+    
+    except Exception as e:
+        if manifest is not None:
+            manifest.save()
+        reporter.status(f"Error: {str(e)}")
+        return None, 0
+
+# Function to download a chapter and save it in the selected format
+# CBZ pages are streamed straight into the archive, other formats go through a temp folder
+# Progress is kept in a manifest so an interrupted download only fetches the missing pages
+# and chapters that were already saved are skipped
+# The whole chapter is timed as a "chapter" span, see core.metrics
+# CBZ and folder pages are re-encoded by `transcoder` when one is given, PDFs ignore it
+def download_chapter(provider, chapter, output_path, format_type, manga_title, reporter=None, max_workers=None, allow_missing=False, executor=None, transcoder=None):
+    with metrics.span("chapter", provider=getattr(provider, "name", ""), chapter=chapter.get("id", ""), format=format_type) as span:
+        success, output_file = _download_chapter(provider, chapter, output_path, format_type, manga_title, reporter, max_workers, allow_missing, executor, transcoder)
+        span["ok"] = success
+    return success, output_file
+
+# Function doing the work of download_chapter()
+def _download_chapter(provider, chapter, output_path, format_type, manga_title, reporter, max_workers, allow_missing, executor, transcoder):
+    reporter = reporter or ProgressReporter()
+    if format_type not in TRANSCODE_OUTPUT_FORMATS:
+        transcoder = None
+    chapter_id = chapter.get("id", "")
+    chapter_title = chapter.get("title")
+    chapter_num = chapter.get("chapter")
+    
+    manifest = ChapterManifest.load(get_manifest_path(manga_title, chapter_id, format_type, chapter_title, chapter_num))
+    if manifest.is_finished(chapter_id, format_type):
+        reporter.progress(100)
+        reporter.status(f"Already downloaded: {manifest.output_file}")
+        return True, manifest.output_file
+    if not manifest.matches(chapter_id, format_type) or manifest.complete:
+        manifest.reset(chapter_id, format_type)
+    
+    if format_type != ".cbz":
+        temp_dir, total_pages = download_chapter_images(provider, chapter_id, reporter, manga_title, chapter_title, chapter_num, max_workers=max_workers, manifest=manifest, executor=executor, transcoder=transcoder)
+        if not temp_dir or total_pages == 0:
+            reporter.status("Download failed")
+            return False, None
+        if manifest.saved_pages < total_pages and not allow_missing:
+            # Keep the temp folder so the next run only fetches the missing pages
+            reporter.status(f"Incomplete: {manifest.saved_pages} of {total_pages} pages saved, run again to resume")
+            return False, None
+        with metrics.span("assemble", provider=getattr(provider, "name", ""), chapter=chapter_id, format=format_type):
+            success, output_file = convert_to_format(temp_dir, output_path, format_type, manga_title, chapter_id, reporter, chapter_title, chapter_num)
+        if success:
+            manifest.mark_complete(output_file)
+        return success, output_file
+    
+    try:
+        # Ensure the output directory exists
+        if not os.path.exists(output_path):
+            os.makedirs(output_path)
+        
+        # Carry on with the archive an interrupted run left behind
+        output_file = manifest.output_file
+        if not output_file or not os.path.exists(f"{output_file}.part"):
+            output_file = get_output_file(output_path, format_type, manga_title, chapter_id, chapter_title, chapter_num)
+            manifest.reset(chapter_id, format_type, output_file)
+        writer = CbzWriter(output_file, resume=True)
+    except Exception as e:
+        reporter.status(f"CBZ creation error: {str(e)}")
+        return False, None
+    
+    try:
+        _, total_pages = download_chapter_images(provider, chapter_id, reporter, manga_title, chapter_title, chapter_num, page_writer=writer, max_workers=max_workers, manifest=manifest, executor=executor, transcoder=transcoder)
+        if total_pages == 0 or writer.page_count == 0:
+            writer.abort()
+            reporter.status("Download failed")
+            return False, None
+        if manifest.saved_pages < total_pages and not allow_missing:
+            # Keep the partial archive so the next run only fetches the missing pages
+            writer.suspend()
+            reporter.status(f"Incomplete: {manifest.saved_pages} of {total_pages} pages saved, run again to resume")
+            return False, None
+        with metrics.span("assemble", provider=getattr(provider, "name", ""), chapter=chapter_id, format=format_type):
+            writer.close()
+    except Exception as e:
+        writer.suspend()
+        reporter.status(f"CBZ creation error: {str(e)}")
+        return False, None
+    
+    manifest.mark_complete(output_file)
+    reporter.status(f"Successfully saved to {output_file}")
+    return True, output_file
+
+# Function to download several chapters at once
+# Up to `chapter_workers` chapters are in flight and all of their pages share one pool of
+# `max_workers` threads; how fast requests go out is bounded by the per-host rate limits
+# and adaptive concurrency limits.
+# reporter_factory(index, chapter) gives each chapter its own reporter and
+# on_chapter_done(index, chapter, success, output_file) is called as each chapter finishes.
+# One `transcoder` (and its worker processes) is shared by every chapter.
+# Returns a list of (success, output_file) in the order of `chapters`
+def download_chapters(provider, chapters, output_path, format_type, manga_title, reporter_factory=None, on_chapter_done=None, chapter_workers=DEFAULT_CHAPTER_WORKERS, max_workers=None, allow_missing=False, transcoder=None):
+    results = [(False, None)] * len(chapters)
+    
+    with ThreadPoolExecutor(max_workers=max_workers or MAX_CONCURRENCY) as page_pool, ThreadPoolExecutor(max_workers=chapter_workers) as chapter_pool:
+        futures = {}
+        for i, chapter in enumerate(chapters):
+            reporter = reporter_factory(i, chapter) if reporter_factory else None
+            future = chapter_pool.submit(
+                download_chapter, provider, chapter, output_path, format_type, manga_title, reporter,
+                max_workers=max_workers, allow_missing=allow_missing, executor=page_pool, transcoder=transcoder
+            )
+            futures[future] = i
+        
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                print(f"Error downloading chapter {chapters[i].get('id', '')}: {str(e)}")
+            if on_chapter_done:
+                on_chapter_done(i, chapters[i], *results[i])
+    
+    return results
+
+# Function to convert downloaded images to selected format
+def convert_to_format(temp_dir, output_path, format_type, manga_title, chapter_id, reporter=None, chapter_title=None, chapter_num=None):
+    reporter = reporter or ProgressReporter()
+    try:
+        # Ensure the output directory exists
+        if not os.path.exists(output_path):
+            os.makedirs(output_path)
+            
+        # Get all images in the temp directory
+        image_files = os.listdir(temp_dir)
+        image_files = [f for f in image_files if f.lower().endswith(IMAGE_EXTENSIONS)]
+        
+        # Check if there are any images
+        if not image_files:
+            reporter.status("No images found to convert")
+            return False, None
+            
+        image_files.sort(key=lambda x: int(os.path.splitext(x)[0]))  # Sort numerically
+        
+        reporter.status(f"Converting to {format_type}...")
+        
+        if format_type == ".pdf":
+            try:
+                # Convert to PDF one page at a time, JPEG pages are embedded without recompressing
+                output_file = get_output_file(output_path, format_type, manga_title, chapter_id, chapter_title, chapter_num)
+                with PdfWriter(output_file, resolution=100.0) as writer:
+                    for img_file in image_files:
+                        writer.add_file(os.path.join(temp_dir, img_file))
+            except Exception as pdf_error:
+                reporter.status(f"PDF conversion error: {str(pdf_error)}")
+                return False, None
+        
+        elif format_type == ".cbz":
+            # Write the pages into the archive, renamed into place once complete
+            try:
+                output_file = get_output_file(output_path, format_type, manga_title, chapter_id, chapter_title, chapter_num)
+                with CbzWriter(output_file) as writer:
+                    for img_file in image_files:
+                        writer.add_file(os.path.join(temp_dir, img_file))
+            except Exception as zip_error:
+                reporter.status(f"CBZ creation error: {str(zip_error)}")
+                return False, None
+        
+        elif format_type == ".png":
+            # Create a subfolder for the page images (adds a timestamp if it already exists)
+            png_folder = get_output_file(output_path, "", manga_title, chapter_id, chapter_title, chapter_num)
+                
+            if not os.path.exists(png_folder):
+                os.makedirs(png_folder)
+                
+            # Just copy all page images (in their original format) to the destination folder
+            try:
+                for img_file in image_files:
+                    src = os.path.join(temp_dir, img_file)
+                    dst = os.path.join(png_folder, img_file)
+                    shutil.copy(src, dst)
+                output_file = png_folder  # For opening folder later
+            except Exception as png_error:
+                reporter.status(f"PNG copy error: {str(png_error)}")
+                return False, None
+        
+        # Clean up temp directory
+        try:
+            shutil.rmtree(temp_dir)
+        except Exception as cleanup_error:
+            print(f"Warning: Could not clean up temp directory: {str(cleanup_error)}")
+        
+        reporter.status(f"Successfully saved to {output_file}")
+        return True, output_file
+    
+    except Exception as e:
+        reporter.status(f"Error converting: {str(e)}")
+        print(f"Conversion error: {str(e)}")
+        return False, None
@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from core.cache import CACHE_TTLS, get_response_cache
+from core.adaptive import THROTTLE_STATUSES, HostConcurrency, parse_retry_after
+from core.ratelimit import HostRateLimiter
+from core.tracing import tracer
+
+# Single place to configure request timeouts (seconds)
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 30
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# Default connection pool sizing: number of hosts kept alive and connections per host
+DEFAULT_POOL_CONNECTIONS = 20
+DEFAULT_POOL_MAXSIZE = 10
+
+# Requests per second (and burst size) allowed to any host without its own limit.
+# None leaves those hosts (image CDNs) unlimited; their adaptive concurrency limit
+# finds what they sustain instead
+DEFAULT_HOST_RATE = None
+DEFAULT_HOST_BURST = None
+
+_session = None
+_session_lock = threading.Lock()
+_host_pool_sizes = {}
+rate_limiter = HostRateLimiter(DEFAULT_HOST_RATE, DEFAULT_HOST_BURST)
+host_concurrency = HostConcurrency()
+
+
+def get_session():
+    """Return the process-wide keep-alive session shared by all providers and downloads"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def get_host(url):
+    """Return the scheme://host[:port] prefix of a URL"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def configure_host(url, pool_maxsize, rate=None, burst=None, concurrency=None):
+    """
+    Give the host of `url` its own connection pool holding up to `pool_maxsize` connections.
+    Pools only ever grow, so providers sharing a CDN don't shrink each other's pool.
+    If `rate` is given, requests to the host are limited to `rate` per second.
+    `concurrency` is where the host's adaptive limit starts (defaults to `pool_maxsize`).
+    """
+    host = get_host(url)
+    if rate is not None:
+        rate_limiter.set_rate(host, rate, burst)
+    host_concurrency.configure(host, concurrency or pool_maxsize)
+    session = get_session()
+    with _session_lock:
+        if _host_pool_sizes.get(host, 0) >= pool_maxsize:
+            return
+        _host_pool_sizes[host] = pool_maxsize
+        mount_adapter(session, f"{host}/", HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize))
+
+
+def mount_adapter(session, prefix, adapter):
+    """
+    Session.mount() for a session that is already in use by other threads. mount() reorders
+    session.adapters in place while requests iterate it, so the new mapping is built on a
+    copy (same order as mount() gives, longest prefixes first) and swapped in at once.
+    Callers hold _session_lock so concurrent mounts don't lose each other's adapters.
+    """
+    adapters = OrderedDict(session.adapters)
+    adapters[prefix] = adapter
+    for key in [key for key in adapters if len(key) < len(prefix)]:
+        adapters[key] = adapters.pop(key)
+    session.adapters = adapters
+
+
+class HttpClient:
+    """
+    Thin per-provider view over the shared session.
+    Adds the provider's default headers and the default timeout to every request.
+    Each request waits for a slot under the host's adaptive concurrency limit and for
+    the host's rate limiter, and its latency and status feed back into the limit.
+    """
+
+    def __init__(self, headers=None, timeout=DEFAULT_TIMEOUT, name=""):
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.name = name
+
+    def request(self, method, url, headers=None, **kwargs):
+        merged_headers = dict(self.headers)
+        if headers:
+            merged_headers.update(headers)
+        kwargs.setdefault("timeout", self.timeout)
+        
+        host = get_host(url)
+        wait_started = time.perf_counter()
+        limit = host_concurrency.get(host)
+        limit.acquire()
+        latency = status = retry_after = None
+        failed = False
+        rate_wait = 0.0
+        try:
+            rate_started = time.perf_counter()
+            rate_limiter.acquire(host)
+            rate_wait = time.perf_counter() - rate_started
+            tracer.add_complete("http_wait", "http", wait_started, time.perf_counter() - wait_started, {"host": host})
+            start = time.monotonic()
+            with tracer.span(f"http {method}", "http", url=url) as span:
+                response = get_session().request(method, url, headers=merged_headers, **kwargs)
+                span["status"] = response.status_code
+            latency = time.monotonic() - start
+            status = response.status_code
+            if status in THROTTLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            return response
+        except (requests.ConnectionError, requests.Timeout):
+            failed = True
+            raise
+        finally:
+            limit.release(latency, status, retry_after, failed, rate_wait)
+
+    def get(self, url, headers=None, **kwargs):
+        return self.request("GET", url, headers=headers, **kwargs)
+
+    def get_text(self, url, cache_kind=None, params=None, headers=None, parse=None, **kwargs):
+        """
+        GET a page and return its text, or parse(text) when `parse` is given. When cache_kind
+        names an endpoint type in CACHE_TTLS, a fresh copy from the response cache is used
+        without any request.
+        With `parse`, a response is only cached once it parses to a non-empty result, so an
+        interstitial or broken page is never pinned in the cache; a cached copy that no
+        longer parses is dropped and fetched again.
+        """
+        cache = get_response_cache() if cache_kind else None
+        cache_url = f"{url}?{urlencode(params)}" if params else url
+        if cache is not None:
+            cached = cache.get(self.name, cache_url, CACHE_TTLS[cache_kind])
+            if cached is not None:
+                if parse is None:
+                    return cached
+                try:
+                    result = parse(cached)
+                    if result:
+                        return result
+                except Exception:
+                    pass
+                cache.delete(self.name, cache_url)
+        
+        response = self.get(url, params=params, headers=headers, **kwargs)
+        response.raise_for_status()
+        text = response.text
+        result = parse(text) if parse is not None else text
+        if cache is not None and text and result:
+            cache.set(self.name, cache_url, text)
+        return result
+
+    def forget_text(self, url, params=None):
+        """Drop the cached copy get_text() keeps of a page, so the next call fetches it again"""
+        cache = get_response_cache()
+        if cache is not None:
+            cache.delete(self.name, f"{url}?{urlencode(params)}" if params else url)
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Manifests sit next to the chapter's temp folder: temp/<title>_<chapter><format>.manifest.json
+MANIFEST_SUFFIX = ".manifest.json"
+
+# Minimum time between manifest writes while pages are coming in (seconds)
+SAVE_INTERVAL = 1.0
+
+
+def checksum(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def strip_query(url):
+    return (url or "").split("?", 1)[0]
+
+
+class ChapterManifest:
+    """
+    Records the progress of one chapter download: the resolved page URLs, the size and
+    checksum of every page saved so far, and whether the chapter was finished.
+    Lets an interrupted batch skip finished chapters and only fetch missing pages.
+    """
+
+    def __init__(self, path, data=None):
+        self.path = path
+        self.data = data or {}
+        self.data.setdefault("pages", {})
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+
+    @classmethod
+    def load(cls, path):
+        """Read a manifest, starting an empty one if it is missing or unreadable"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(path, json.load(f))
+        except (OSError, ValueError):
+            return cls(path)
+
+    def matches(self, chapter_id, format_type):
+        """Check the manifest belongs to this chapter and output format"""
+        return self.data.get("chapter_id") == chapter_id and self.data.get("format") == format_type
+
+    def reset(self, chapter_id, format_type, output_file=None):
+        """Start over for a chapter, forgetting any previously recorded pages"""
+        with self._lock:
+            self.data = {
+                "chapter_id": chapter_id,
+                "format": format_type,
+                "output_file": output_file,
+                "complete": False,
+                "urls": [],
+                "pages": {},
+            }
+
+    @property
+    def output_file(self):
+        return self.data.get("output_file")
+
+    @property
+    def complete(self):
+        return bool(self.data.get("complete"))
+
+    def is_finished(self, chapter_id, format_type):
+        """True if this chapter was already saved in this format and the output still exists"""
+        return (
+            self.matches(chapter_id, format_type)
+            and self.complete
+            and self.output_file is not None
+            and os.path.exists(self.output_file)
+        )
+
+    def set_urls(self, pages):
+        """Record the chapter's page URLs, dropping saved pages if the chapter has changed"""
+        urls = [page.get("img") for page in pages]
+        with self._lock:
+            # Image hosts often sign URLs with expiring query strings, so only compare the paths
+            old_paths = [strip_query(url) for url in self.data.get("urls", [])]
+            if old_paths and old_paths != [strip_query(url) for url in urls]:
+                self.data["pages"] = {}
+            self.data["urls"] = urls
+
+    @property
+    def total_pages(self):
+        return len(self.data.get("urls", []))
+
+    @property
+    def saved_pages(self):
+        return len(self.data["pages"])
+
+    def get_page(self, page_num):
+        return self.data["pages"].get(str(page_num))
+
+    def record_page(self, page_num, filename, data):
+        """Remember a saved page; the manifest is written out at most once per SAVE_INTERVAL"""
+        with self._lock:
+            self.data["pages"][str(page_num)] = {
+                "filename": filename,
+                "bytes": len(data),
+                "sha256": checksum(data),
+            }
+        if time.monotonic() - self._last_save >= SAVE_INTERVAL:
+            self.save()
+
+    def forget_page(self, page_num):
+        with self._lock:
+            self.data["pages"].pop(str(page_num), None)
+
+    def has_file(self, page_num, directory):
+        """Check a recorded page is on disk in `directory` with the recorded size and checksum"""
+        entry = self.get_page(page_num)
+        if not entry:
+            return False
+        path = os.path.join(directory, entry["filename"])
+        try:
+            if os.path.getsize(path) != entry["bytes"]:
+                return False
+            with open(path, "rb") as f:
+                return checksum(f.read()) == entry["sha256"]
+        except OSError:
+            return False
+
+    def mark_complete(self, output_file):
+        with self._lock:
+            self.data["output_file"] = output_file
+            self.data["complete"] = True
+        self.save()
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            partial_path = f"{self.path}.part"
+            with open(partial_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f)
+            os.replace(partial_path, self.path)
+            self._last_save = time.monotonic()
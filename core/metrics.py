@@ -0,0 +1,135 @@
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from core.tracing import tracer
+
+# Most recent spans kept in memory, older ones are dropped first
+MAX_SPANS = 100000
+
+# Pipeline stages timed by the download engine, in the order a chapter goes through them
+STAGES = (
+    "chapter_pages",  # provider.fetch_chapter_pages: the chapter's page list
+    "image_get",  # one page image GET, including the wait for a rate/concurrency slot
+    "transcode",  # re-encoding a page to WebP/AVIF when a profile is set, including the wait for an encoder process
+    "image_prepare",  # sniffing the image type, or the PIL decode and PNG re-encode
+    "page_write",  # writing a page to the temp folder or into the CBZ archive
+    "assemble",  # building the CBZ/PDF/folder from the pages (convert_to_format or closing the CBZ)
+    "chapter",  # the whole chapter, from manifest check to saved file
+)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers (None if empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class MetricsRecorder:
+    """
+    Collects timing spans from the download pipeline. A span is a dict with its stage,
+    its tags (provider, chapter, page, ...), start time, duration and thread, plus any
+    fields set while it ran (bytes, status, error). Safe to use from worker threads.
+    Spans also go to the tracer while a trace is being recorded.
+    """
+
+    def __init__(self, max_spans=MAX_SPANS):
+        self.spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage, **tags):
+        """
+        Time the block as one span of `stage`. Fields set on the yielded dict are kept;
+        an exception escaping the block is recorded as the span's error.
+        """
+        record = {"stage": stage, **tags}
+        record["start"] = time.time()
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record.setdefault("error", str(e) or type(e).__name__)
+            raise
+        finally:
+            record["duration"] = time.perf_counter() - started
+            record["thread"] = threading.current_thread().name
+            with self._lock:
+                self.spans.append(record)
+            if tracer.enabled:
+                args = {key: value for key, value in record.items() if key not in ("stage", "start", "duration", "thread")}
+                tracer.add_complete(stage, "pipeline", started, record["duration"], args)
+
+    def select(self, since=None, **tags):
+        """Spans started at or after `since` (a time.time() value) whose tags all match"""
+        with self._lock:
+            spans = list(self.spans)
+        return [
+            span for span in spans
+            if (since is None or span["start"] >= since)
+            and all(span.get(key) == value for key, value in tags.items())
+        ]
+
+    def summarize(self, since=None, **tags):
+        """
+        Per-stage totals of the selected spans: count, errors, p50/p95/total milliseconds
+        and bytes. "retries" counts image GETs that were a retry of an earlier attempt.
+        """
+        spans = self.select(since, **tags)
+        stages = {}
+        for span in spans:
+            stages.setdefault(span["stage"], []).append(span)
+
+        summary = {"spans": len(spans), "retries": 0, "stages": {}}
+        for stage in sorted(stages, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES)):
+            group = stages[stage]
+            durations = [span["duration"] * 1000 for span in group]
+            summary["stages"][stage] = {
+                "count": len(group),
+                "errors": sum(1 for span in group if "error" in span),
+                "p50_ms": round(percentile(durations, 0.50), 2),
+                "p95_ms": round(percentile(durations, 0.95), 2),
+                "total_ms": round(sum(durations), 2),
+                "bytes": sum(span.get("bytes", 0) for span in group),
+            }
+            if stage == "image_get":
+                summary["retries"] = sum(1 for span in group if span.get("attempt", 1) > 1)
+        return summary
+
+    def export_jsonl(self, path, since=None, summaries=None, **tags):
+        """
+        Append the selected spans to a JSON lines file, one {"type": "span", ...} object per
+        line, followed by any `summaries` given as {"type": "summary", "scope": name, ...}
+        """
+        with open(path, "a", encoding="utf-8") as f:
+            for span in self.select(since, **tags):
+                f.write(json.dumps({"type": "span", **span}, default=str) + "\n")
+            for scope, summary in (summaries or {}).items():
+                f.write(json.dumps({"type": "summary", "scope": scope, **summary}, default=str) + "\n")
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+
+# Function to turn a summary into short text lines for logs and the console
+def format_summary(summary):
+    lines = []
+    for stage, stats in summary["stages"].items():
+        line = f"{stage:<14} n={stats['count']:<5} p50={stats['p50_ms']:.1f}ms p95={stats['p95_ms']:.1f}ms total={stats['total_ms'] / 1000:.2f}s"
+        if stats["bytes"]:
+            line += f" {stats['bytes'] / (1024 * 1024):.1f}MB"
+        if stats["errors"]:
+            line += f" errors={stats['errors']}"
+        lines.append(line)
+    if summary["retries"]:
+        lines.append(f"retries        {summary['retries']}")
+    return lines
+
+
+# Spans of every download in this process
+metrics = MetricsRecorder()
@@ -0,0 +1,47 @@
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml builds trees noticeably faster than the pure-Python parser; it's optional
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+def compile_selector(selector):
+    """Compile a CSS selector once so every call reuses it (use .select()/.select_one()/.match())"""
+    return soupsieve.compile(selector)
+
+
+def only(name=None, class_=None, **attrs):
+    """
+    Describe the parts of a page worth building: tags with this name and/or class
+    (either may be a list) are kept with everything inside them, the rest is skipped
+    """
+    if class_ is not None:
+        attrs["class"] = has_class(class_)
+    return SoupStrainer(name, attrs)
+
+
+def has_class(names):
+    """
+    Match a class attribute containing any of these names. While parsing, the attribute
+    reaches a strainer as the raw "a b c" string, so each class is checked on its own
+    """
+    names = {names} if isinstance(names, str) else set(names)
+
+    def match(value):
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return not names.isdisjoint(classes)
+    return match
+
+
+def parse_html(html, parse_only=None):
+    """
+    Parse a page with the fastest available backend. `parse_only` (see only()) limits the
+    tree to the subtrees a caller needs, which saves most of the time on big pages
+    """
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
@@ -0,0 +1,129 @@
+import os
+import zlib
+from io import BytesIO
+from PIL import Image
+
+# JPEG colour modes that can be embedded as-is (DCTDecode) without recompressing
+JPEG_COLOR_SPACES = {
+    "RGB": b"/DeviceRGB",
+    "L": b"/DeviceGray",
+}
+
+
+class PdfWriter:
+    """
+    Writes a PDF one page at a time so memory stays flat no matter how long the chapter is.
+    JPEG pages are embedded directly as DCT streams, other formats are decoded once and
+    stored losslessly with Flate. The file is written to a .part file and renamed on close().
+    """
+
+    def __init__(self, output_file, resolution=100.0):
+        self.output_file = output_file
+        self.partial_file = f"{output_file}.part"
+        self.resolution = resolution
+        self.page_count = 0
+        self._offsets = {}
+        self._page_ids = []
+        # Objects 1 and 2 are the catalog and page tree, written last
+        self._next_id = 3
+        self._file = open(self.partial_file, "wb")
+        self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write_object(self, body, stream=None, obj_id=None):
+        if obj_id is None:
+            obj_id = self._next_id
+            self._next_id += 1
+        self._offsets[obj_id] = self._file.tell()
+        self._file.write(f"{obj_id} 0 obj\n".encode())
+        if stream is None:
+            self._file.write(body)
+        else:
+            self._file.write(body[:-2] + f"/Length {len(stream)}>>".encode())
+            self._file.write(b"\nstream\n")
+            self._file.write(stream)
+            self._file.write(b"\nendstream")
+        self._file.write(b"\nendobj\n")
+        return obj_id
+
+    def _image_stream(self, data):
+        """Return (width, height, dictionary entries, stream) for a page image"""
+        img = Image.open(BytesIO(data))
+        width, height = img.size
+        
+        # JPEG data goes in untouched, the PDF viewer decodes it
+        if img.format == "JPEG" and img.mode in JPEG_COLOR_SPACES:
+            color_space = JPEG_COLOR_SPACES[img.mode]
+            return width, height, b"/ColorSpace " + color_space + b"/BitsPerComponent 8/Filter/DCTDecode", data
+        
+        # Everything else is decoded once and stored losslessly
+        if img.mode == "1" or img.mode == "LA":
+            img = img.convert("L")
+        elif img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        color_space = JPEG_COLOR_SPACES[img.mode]
+        stream = zlib.compress(img.tobytes())
+        return width, height, b"/ColorSpace " + color_space + b"/BitsPerComponent 8/Filter/FlateDecode", stream
+
+    def add_page(self, filename, data):
+        """Add one page image (raw file bytes) as a new PDF page"""
+        width, height, image_entries, image_data = self._image_stream(data)
+        
+        image_id = self._write_object(
+            f"<</Type/XObject/Subtype/Image/Width {width}/Height {height}".encode() + image_entries + b">>",
+            stream=image_data
+        )
+        
+        # Page size in points, matching the resolution PIL used to save PDFs with
+        page_width = width * 72.0 / self.resolution
+        page_height = height * 72.0 / self.resolution
+        content = f"q {page_width:.2f} 0 0 {page_height:.2f} 0 0 cm /Im0 Do Q".encode()
+        content_id = self._write_object(b"<<>>", stream=content)
+        
+        page_id = self._write_object(
+            (
+                f"<</Type/Page/Parent 2 0 R/MediaBox[0 0 {page_width:.2f} {page_height:.2f}]"
+                f"/Resources<</XObject<</Im0 {image_id} 0 R>>>>/Contents {content_id} 0 R>>"
+            ).encode()
+        )
+        self._page_ids.append(page_id)
+        self.page_count += 1
+
+    def add_file(self, path, filename=None):
+        """Add a page that already exists on disk"""
+        with open(path, "rb") as f:
+            self.add_page(filename or os.path.basename(path), f.read())
+
+    def close(self):
+        """Write the page tree, catalog and xref table, then move the PDF to its final name"""
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._write_object(f"<</Type/Pages/Kids[{kids}]/Count {len(self._page_ids)}>>".encode(), obj_id=2)
+        self._write_object(b"<</Type/Catalog/Pages 2 0 R>>", obj_id=1)
+        
+        xref_offset = self._file.tell()
+        self._file.write(f"xref\n0 {self._next_id}\n".encode())
+        self._file.write(b"0000000000 65535 f \n")
+        for obj_id in range(1, self._next_id):
+            self._file.write(f"{self._offsets[obj_id]:010d} 00000 n \n".encode())
+        self._file.write(f"trailer\n<</Size {self._next_id}/Root 1 0 R>>\nstartxref\n{xref_offset}\n%%EOF\n".encode())
+        self._file.close()
+        
+        os.replace(self.partial_file, self.output_file)
+        return self.output_file
+
+    def abort(self):
+        """Discard the partially written PDF"""
+        try:
+            self._file.close()
+        finally:
+            if os.path.exists(self.partial_file):
+                os.remove(self.partial_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
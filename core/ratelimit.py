@@ -0,0 +1,65 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `burst` tokens and refills at `rate` tokens per second.
+    Each request takes one token, waiting for the next one if the bucket is empty.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, rate))
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take one token, blocking until it is available. Returns the time spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                delay = (1.0 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class HostRateLimiter:
+    """
+    Keeps one token bucket per host. Hosts without an explicit rate use the default,
+    and a rate of None (or 0) means requests to that host are not limited.
+    """
+
+    def __init__(self, default_rate=None, default_burst=None):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def set_rate(self, host, rate, burst=None):
+        with self._lock:
+            self._buckets[host] = TokenBucket(rate, burst) if rate else None
+
+    def _get_bucket(self, host):
+        with self._lock:
+            if host not in self._buckets:
+                rate = self.default_rate
+                self._buckets[host] = TokenBucket(rate, self.default_burst) if rate else None
+            return self._buckets[host]
+
+    def acquire(self, host):
+        """Wait for permission to send one request to `host`"""
+        bucket = self._get_bucket(host)
+        if bucket is None:
+            return 0.0
+        return bucket.acquire()
@@ -0,0 +1,53 @@
+import random
+import threading
+import requests
+from core.adaptive import parse_retry_after
+
+# Attempts per request before giving up (the first try included)
+MAX_ATTEMPTS = 4
+
+# Backoff before retry n is a random delay up to BASE_DELAY * 2**(n-1), capped at MAX_DELAY (seconds)
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+
+# HTTP statuses worth trying again; anything else (404, 403, ...) won't fix itself
+RETRYABLE_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is tried again and how long to wait first:
+    exponential backoff with full jitter, or the server's Retry-After when it sends one.
+    Counts the retries it hands out.
+    """
+
+    def __init__(self, max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def is_retryable(self, error):
+        """Transient network errors and throttling/server errors are retryable, the rest are fatal"""
+        if isinstance(error, requests.HTTPError):
+            response = error.response
+            return response is not None and response.status_code in RETRYABLE_STATUSES
+        return isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+    def should_retry(self, error, attempts):
+        """True if a request that has failed `attempts` times with `error` should be tried again"""
+        return attempts < self.max_attempts and self.is_retryable(error)
+
+    def get_delay(self, attempts, error=None):
+        """Seconds to wait before the next attempt"""
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempts - 1)))
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
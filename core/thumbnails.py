@@ -0,0 +1,110 @@
+import hashlib
+import os
+import threading
+from io import BytesIO
+from PIL import Image
+
+# Where downscaled covers are kept between runs, their size, and the cache's size cap
+THUMBNAIL_CACHE_DIR = os.path.join("cache", "covers")
+THUMBNAIL_SIZE = (100, 150)
+THUMBNAIL_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+
+def make_thumbnail(image_data, size=THUMBNAIL_SIZE):
+    """
+    Decode an image and shrink it to fit `size`.
+    JPEGs are decoded in draft mode, so large covers are scaled down by the decoder itself.
+    """
+    img = Image.open(BytesIO(image_data))
+    if img.format == "JPEG":
+        img.draft("RGB", size)
+    img.thumbnail(size)
+    if img.mode not in ("RGB", "RGBA", "L", "LA"):
+        img = img.convert("RGBA")
+    return img
+
+
+class ThumbnailCache:
+    """
+    Disk cache of already-downscaled cover thumbnails, keyed by image URL.
+    The least recently used thumbnails are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, directory=THUMBNAIL_CACHE_DIR, max_bytes=THUMBNAIL_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def _path(self, url):
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.png")
+
+    def get(self, url):
+        """Return the cached thumbnail, or None if there isn't one"""
+        path = self._path(url)
+        if not os.path.exists(path):
+            return None
+        try:
+            img = Image.open(path)
+            img.load()
+        except Exception:
+            return None
+        
+        # Reads refresh the modification time, which is what eviction orders by
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return img
+
+    def put(self, url, img):
+        """Store a thumbnail, replacing any previous one for the URL, and evict old ones if over the cap"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(url)
+        partial_path = f"{path}.{threading.get_ident()}.part"
+        img.save(partial_path, "PNG")
+        size = os.path.getsize(partial_path)
+        
+        with self._lock:
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(partial_path, path)
+            if self._total_bytes is None:
+                self._total_bytes = self._scan()[1]
+            else:
+                self._total_bytes += size - previous_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        entries = []
+        total = 0
+        try:
+            filenames = os.listdir(self.directory)
+        except OSError:
+            return entries, total
+        for filename in filenames:
+            if not filename.endswith(".png"):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        return entries, total
+
+    def _evict(self):
+        # Drop least recently used thumbnails until we're comfortably under the cap
+        entries, total = self._scan()
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        self._total_bytes = total
@@ -0,0 +1,170 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Environment variables that turn on tracing for downloads started from the GUI
+TRACE_ENV_VAR = "MANGA_TRACE"
+TRACE_SAMPLE_ENV_VAR = "MANGA_TRACE_SAMPLE_MS"
+
+# Suffix of the collapsed-stack profile written next to a trace
+PROFILE_SUFFIX = ".folded"
+
+
+class StackSampler:
+    """
+    Samples the Python stack of every thread at a fixed interval and counts identical
+    stacks, which is enough to find hot spots without tracing every call.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="StackSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def save(self, path):
+        """Write the samples in collapsed-stack format (flamegraph.pl, speedscope)"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Tracer:
+    """
+    Records a download session as Chrome trace events (chrome://tracing, Perfetto), one
+    row per thread. Off by default; while off, span() costs next to nothing.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.sampler = None
+        self._origin = time.perf_counter()
+        self._thread_names = {}
+        self._lock = threading.Lock()
+
+    def start(self, sample_interval=None):
+        """Start a new trace, with a stack sampler every `sample_interval` seconds if given"""
+        with self._lock:
+            self.events = []
+            self._thread_names = {}
+            self._origin = time.perf_counter()
+        self.sampler = StackSampler(sample_interval) if sample_interval else None
+        if self.sampler:
+            self.sampler.start()
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+        if self.sampler:
+            self.sampler.stop()
+
+    @contextmanager
+    def span(self, name, category="", **args):
+        """Record the block as a complete event; fields set on the yielded dict become its args"""
+        if not self.enabled:
+            yield args
+            return
+        started = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.add_complete(name, category, started, time.perf_counter() - started, args)
+
+    def add_complete(self, name, category, started, duration, args=None):
+        """Add an event for work on the calling thread that began at perf_counter() `started`"""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (started - self._origin) * 1e6,
+            "dur": duration * 1e6,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": {key: value for key, value in (args or {}).items() if value is not None},
+        }
+        with self._lock:
+            self._thread_names.setdefault(thread.ident, thread.name)
+            self.events.append(event)
+
+    def save(self, path):
+        """Write the trace as JSON, and the sampled stacks next to it if sampling was on"""
+        with self._lock:
+            events = list(self.events)
+            names = dict(self._thread_names)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for tid, name in names.items()
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f, default=str)
+        if self.sampler:
+            self.sampler.save(path + PROFILE_SUFFIX)
+
+
+# Trace of the current session, shared by the engine, HTTP client and providers
+tracer = Tracer()
+
+
+@contextmanager
+def trace_session(path, sample_interval=None, name="session"):
+    """
+    Trace everything inside the block into `path` (a Chrome trace JSON file). Does
+    nothing if path is empty or a session is already being traced.
+    """
+    if not path or tracer.enabled:
+        yield
+        return
+    tracer.start(sample_interval)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add_complete(name, "session", started, time.perf_counter() - started)
+        tracer.stop()
+        try:
+            tracer.save(path)
+            print(f"Trace written to {path}")
+        except OSError as e:
+            print(f"Could not write trace: {str(e)}")
+
+
+# Function to read the GUI's tracing settings from the environment: (path, sample interval in seconds)
+def get_env_trace_settings():
+    path = os.environ.get(TRACE_ENV_VAR, "")
+    try:
+        sample_ms = float(os.environ.get(TRACE_SAMPLE_ENV_VAR, "0"))
+    except ValueError:
+        sample_ms = 0
+    return path, sample_ms / 1000 if sample_ms > 0 else None
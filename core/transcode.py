@@ -0,0 +1,109 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from PIL import Image
+
+try:
+    import pillow_avif  # noqa: F401  adds AVIF to Pillow builds without it
+except ImportError:
+    pillow_avif = None
+
+# Transcoding profiles: name -> (Pillow format, file extension)
+TRANSCODE_PROFILES = {
+    "webp": ("WEBP", ".webp"),
+    "avif": ("AVIF", ".avif"),
+}
+
+# Encoder quality (1-100) used when none is given
+DEFAULT_QUALITY = 80
+
+# Output formats whose pages get transcoded; PDF embeds its pages in formats of its own
+TRANSCODE_OUTPUT_FORMATS = (".cbz", ".png")
+
+# Optional package that adds AVIF to Pillow builds without it
+AVIF_PLUGIN_PACKAGE = "pillow-avif-plugin"
+
+
+# Function to list the profiles this Pillow build can encode
+def available_profiles():
+    Image.init()
+    return [name for name, (pil_format, _) in TRANSCODE_PROFILES.items() if pil_format in Image.SAVE]
+
+
+# Function to re-encode one page image, run in the worker processes
+# Returns None for pages that should be kept as they are (animated GIFs, already in the target format)
+def encode_page(image_data, profile, quality):
+    pil_format = TRANSCODE_PROFILES[profile][0]
+    img = Image.open(BytesIO(image_data))
+    if img.format == pil_format or getattr(img, "is_animated", False):
+        return None
+    buffer = BytesIO()
+    img.save(buffer, pil_format, quality=quality)
+    return buffer.getvalue()
+
+
+class Transcoder:
+    """
+    Re-encodes downloaded pages to WebP or AVIF at the given quality. Pages are encoded on
+    a pool of `workers` processes (one per core by default) so encoding isn't held back by
+    the GIL; with processes=False they are encoded on the calling thread instead.
+    The pool is started with "spawn" when the transcoder is created, so the workers are
+    never forked from a process that already has download threads running.
+    A page keeps its original bytes when the re-encoded one isn't smaller or can't be made.
+    Safe to share between chapters and worker threads.
+    """
+
+    def __init__(self, profile, quality=DEFAULT_QUALITY, workers=None, processes=True):
+        if profile not in TRANSCODE_PROFILES:
+            raise ValueError(f"Unknown transcode profile: {profile}")
+        if profile not in available_profiles():
+            hint = f" (pip install {AVIF_PLUGIN_PACKAGE})" if profile == "avif" else ""
+            raise ValueError(f"{profile.upper()} encoding is not supported by the installed Pillow{hint}")
+        self.profile = profile
+        self.quality = max(1, min(100, int(quality)))
+        self.workers = workers or os.cpu_count() or 1
+        self.processes = processes
+        self.extension = TRANSCODE_PROFILES[profile][1]
+
+        # Bytes in and out of transcode(), for reporting the savings
+        self.input_bytes = 0
+        self.output_bytes = 0
+
+        self._lock = threading.Lock()
+        self._pool = None
+        if processes:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def transcode(self, image_data):
+        """Return the page re-encoded to this profile, or the original bytes"""
+        try:
+            if self._pool is not None:
+                encoded = self._pool.submit(encode_page, image_data, self.profile, self.quality).result()
+            else:
+                encoded = encode_page(image_data, self.profile, self.quality)
+        except Exception as e:
+            print(f"Could not transcode page, keeping the original: {str(e)}")
+            encoded = None
+
+        if encoded is None or len(encoded) >= len(image_data):
+            encoded = image_data
+        with self._lock:
+            self.input_bytes += len(image_data)
+            self.output_bytes += len(encoded)
+        return encoded
+
+    def close(self):
+        """Shut the worker processes down"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
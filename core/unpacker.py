@@ -0,0 +1,67 @@
+import re
+
+# Arguments of a Dean Edwards packer call: }('payload',radix,count,'symbols'.split('|'),0,{}))
+PACKED_ARGS_RE = re.compile(
+    r"}\s*\(\s*'(?P<payload>(?:\\.|[^'\\])*)'\s*,\s*(?P<radix>\d+)\s*,\s*(?P<count>\d+)\s*,"
+    r"\s*'(?P<symbols>(?:\\.|[^'\\])*)'\s*\.split\(\s*'\|'\s*\)",
+    re.DOTALL
+)
+
+# Words the packer replaced, same as the '\\b\\w+\\b' regex used by the JS decoder
+WORD_RE = re.compile(r"\b\w+\b", re.ASCII)
+
+# A JS expression made only of string literals joined with '+', e.g. ''+'a'+"b"
+STRING_CONCAT_RE = re.compile(r"""\s*(?:'[^'\\]*'|"[^"\\]*")(?:\s*\+\s*(?:'[^'\\]*'|"[^"\\]*"))*\s*""")
+STRING_LITERAL_RE = re.compile(r"""'([^'\\]*)'|"([^"\\]*)\"""")
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def is_packed(script):
+    """Check whether a script looks like p,a,c,k,e,d packer output"""
+    return PACKED_ARGS_RE.search(script) is not None
+
+
+def encode_base(value, radix):
+    """Python port of the packer's e() function that turns a symbol index into its token"""
+    prefix = "" if value < radix else encode_base(value // radix, radix)
+    value = value % radix
+    return prefix + (chr(value + 29) if value > 35 else DIGITS[value])
+
+
+def _unescape(text):
+    return re.sub(r"\\(['\"\\])", r"\1", text)
+
+
+def unpack(script):
+    """
+    Decode a Dean Edwards p,a,c,k,e,d packed script without running any JavaScript.
+    Raises ValueError if the script isn't in the packer format.
+    """
+    match = PACKED_ARGS_RE.search(script)
+    if not match:
+        raise ValueError("Script is not in p,a,c,k,e,d format")
+    
+    payload = _unescape(match.group("payload"))
+    radix = int(match.group("radix"))
+    count = int(match.group("count"))
+    symbols = _unescape(match.group("symbols")).split("|")
+    
+    # Same table the JS decoder builds: d[e(c)] = k[c] || e(c)
+    lookup = {}
+    for index in range(count):
+        token = encode_base(index, radix)
+        symbol = symbols[index] if index < len(symbols) else ""
+        lookup[token] = symbol or token
+    
+    return WORD_RE.sub(lambda word: lookup.get(word.group(0), word.group(0)), payload)
+
+
+def evaluate_string_concat(expression):
+    """
+    Evaluate a JS expression made only of string literals joined with '+'.
+    Raises ValueError for anything more complex.
+    """
+    if not STRING_CONCAT_RE.fullmatch(expression):
+        raise ValueError("Expression is not a plain string concatenation")
+    return "".join(single or double for single, double in STRING_LITERAL_RE.findall(expression))
@@ -1,22 +1,23 @@
 import tkinter as tk
 from tkinter import filedialog, ttk
 import customtkinter
-import requests
 import os
-import re
 import time
 import threading
 from PIL import Image, ImageDraw
-import shutil
-from io import BytesIO
 import urllib.request
 import subprocess
 import sys
-from providers.manga.mangapill import MangaPill
-from providers.manga.mangapark import Mangapark
-from providers.manga.mangahere import MangaHere
+from collections import OrderedDict
+from core.engine import FORMATS, configure_logging, create_providers, download_chapter, download_chapters, image_client
+from core.chapter_list import SORT_NEWEST_FIRST, SORT_OLDEST_FIRST, ChapterList, diff_rows
+from core.thumbnails import THUMBNAIL_SIZE, ThumbnailCache, make_thumbnail
+from core.tracing import get_env_trace_settings, trace_session
+from core.transcode import DEFAULT_QUALITY, Transcoder, available_profiles
+from ui.event_bus import UIEventBus
+from ui.progress import TkProgressReporter
+from ui.virtual_list import VirtualList
 
-total_chapters_cache = {}
 PROVIDERS = {}
 last_downloaded_file = None
 last_downloaded_dir = None
@@ -60,253 +61,55 @@ COLORS = {
 }
 
 # Available formats for download (will add more)
-formats = ['.cbz', '.pdf', '.png'] 
-
-# Function to filter out illegal characters from file names
-def filter_path(path):
-    illegal_chars = ["\\", "/", ":", "*", "?", "\"", "<", ">", "|"]
-    for char in illegal_chars:
-        path = path.replace(char, "")
-    return path
-
-# Function to clean chapter IDs to extract just the chapter number
-def clean_chapter_id(chapter_id):
-    """
-    Extract a clean chapter number/identifier from complex chapter IDs.
-    Common patterns: "552-10558000bleach-chapter-558", "11784-en-berserk", etc.
-    """
-    # Convert to string if not already
-    chapter_id_str = str(chapter_id)
-    
-    # Pattern 1: Extract chapter number from "chapter-XXX" pattern
-    chapter_match = re.search(r'chapter[_-](\d+(?:\.\d+)?)', chapter_id_str, re.IGNORECASE)
-    if chapter_match:
-        return chapter_match.group(1)
-    
-    # Pattern 2: Handle volume pattern
-    volume_match = re.search(r'volume[_-](\d+(?:\.\d+)?)', chapter_id_str, re.IGNORECASE)
-    if volume_match:
-        return f"v{volume_match.group(1)}"
-    
-    # Pattern 3: Extract numeric ID from the beginning (before any text)
-    numeric_match = re.search(r'^(\d+(?:-\d+)?)', chapter_id_str)
-    if numeric_match:
-        return numeric_match.group(1)
-    
-    # Pattern 4: Look for numbers after the last dash
-    dash_match = re.search(r'-(\d+)(?:[^0-9-]|$)', chapter_id_str)
-    if dash_match:
-        return dash_match.group(1)
-    
-    # If no pattern matches, return the original ID after filtering illegal chars
-    return filter_path(chapter_id_str)
-
-# Function to download manga chapter images
-def download_chapter_images(chapter_id, provider_name, progress_var, status_label, manga_title="", chapter_title=None, chapter_num=None):
+formats = FORMATS
+
+# Ready-to-show cover images (most recently used last), backed by the on-disk thumbnail cache
+COVER_IMAGE_CACHE_SIZE = 64
+cover_images = OrderedDict()
+cover_images_lock = threading.Lock()
+thumbnail_cache = ThumbnailCache()
+
+# Chapters of the open manga, and the chapter indices currently in the listbox
+chapter_list = ChapterList()
+listbox_rows = []
+
+# Page transcoding choices offered next to the format ("Off" keeps the pages as downloaded)
+TRANSCODE_OFF = "Off"
+transcode_options = [TRANSCODE_OFF] + [profile.upper() for profile in available_profiles()]
+
+# Chapter search runs once typing pauses for this long (ms)
+FILTER_DELAY_MS = 150
+filter_timer = None
+MAX_LISTBOX_EDITS = 100
+
+# Download threads post their widget updates here; the main loop applies them every tick
+ui_events = UIEventBus()
+ui_events.start(root)
+
+# Function to build the page transcoder from the download options, or None to keep the original pages
+def get_transcoder():
+    profile = transcode_dropdown.get()
+    if profile == TRANSCODE_OFF:
+        return None
     try:
-        provider = PROVIDERS[provider_name]
-        
-        # Create temp directory if it doesn't exist
-        # Use chapter title if provided, otherwise use chapter ID
-        if chapter_title and chapter_title.strip():
-            safe_chapter_name = filter_path(chapter_title)
-            # If chapter number is provided, include it at the beginning
-            if chapter_num:
-                safe_chapter_name = f"Ch{chapter_num}_{safe_chapter_name}"
-        else:
-            # Fallback to the cleaned chapter ID
-            safe_chapter_name = f"Chapter_{clean_chapter_id(chapter_id)}"
-            
-        temp_dir = os.path.join("temp", f"{filter_path(manga_title)}_{safe_chapter_name}")
-        if not os.path.exists("temp"):
-            os.makedirs("temp")
-        if not os.path.exists(temp_dir):
-            os.makedirs(temp_dir)
-        
-        # Get chapter pages
-        pages = provider.fetch_chapter_pages(chapter_id)
-        total_pages = len(pages)
-        
-        status_label.configure(text=f"Downloading {total_pages} pages...")
-        
-        # Download each page
-        for i, page in enumerate(pages):
-            try:
-                page_num = page.get("page", i+1)
-                img_url = page.get("img")
-                headers = page.get("headerForImage", {})
-                
-                # Download image
-                response = requests.get(img_url, headers=headers)
-                response.raise_for_status()
-                
-                # Save image
-                img = Image.open(BytesIO(response.content))
-                img.save(os.path.join(temp_dir, f"{page_num}.png"))
-                
-                # Update progress
-                progress_var.set(int((i+1) / total_pages * 100))
-                status_label.configure(text=f"Downloaded page {i+1}/{total_pages}")
-                root.update_idletasks()
-                
-            except Exception as e:
-                print(f"Error downloading page {i+1}: {str(e)}")
-                continue
-        
-        return temp_dir, total_pages
-    
-    except Exception as e:
-        status_label.configure(text=f"Error: {str(e)}")
-        return None, 0
+        quality = int(transcode_quality_var.get())
+    except ValueError:
+        quality = DEFAULT_QUALITY
+    # Pages are encoded on the page worker threads rather than a process pool: spawned
+    # worker processes would import this module, and build the whole window, again
+    return Transcoder(profile.lower(), quality, processes=False)
 
-# Function to convert downloaded images to selected format
-def convert_to_format(temp_dir, output_path, format_type, manga_title, chapter_id, status_label, chapter_title=None, chapter_num=None):
-    try:
-        # Ensure the output directory exists
-        if not os.path.exists(output_path):
-            os.makedirs(output_path)
-            
-        # Create a safe filename
-        safe_manga_title = filter_path(manga_title)
-        
-        # Use chapter title if provided, otherwise use chapter ID
-        if chapter_title and chapter_title.strip():
-            safe_chapter_name = filter_path(chapter_title)
-            # If chapter number is provided, include it at the beginning
-            if chapter_num:
-                safe_chapter_name = f"Ch{chapter_num}_{safe_chapter_name}"
-        else:
-            # Fallback to the cleaned chapter ID
-            safe_chapter_name = f"Chapter_{clean_chapter_id(chapter_id)}"
-        
-        # Ensure unique filenames by checking if file already exists
-        base_output_file = os.path.join(output_path, f"{safe_manga_title}_{safe_chapter_name}")
-        output_file = f"{base_output_file}{format_type}"
-        
-        # If the file already exists (from a previous batch download in the same session),
-        # add a timestamp to make it unique
-        if os.path.exists(output_file):
-            timestamp = int(time.time())
-            base_output_file = os.path.join(output_path, f"{safe_manga_title}_{safe_chapter_name}_{timestamp}")
-            output_file = f"{base_output_file}{format_type}"
-        
-        # Get all images in the temp directory
-        image_files = os.listdir(temp_dir)
-        image_files = [f for f in image_files if f.endswith('.png')]
-        
-        # Check if there are any images
-        if not image_files:
-            status_label.configure(text="No images found to convert")
-            return False, None
-            
-        image_files.sort(key=lambda x: int(x.split('.')[0]))  # Sort numerically
-        
-        status_label.configure(text=f"Converting to {format_type}...")
-        
-        if format_type == ".pdf":
-            try:
-                # Convert to PDF
-                images = []
-                for img_file in image_files:
-                    img_path = os.path.join(temp_dir, img_file)
-                    img = Image.open(img_path)
-                    if img.mode == 'RGBA':
-                        img = img.convert('RGB')
-                    images.append(img)
-                
-                if images:
-                    # Make sure the path isn't too long
-                    if len(output_file) > 240:  # Windows has 260 char path limit
-                        short_title = safe_manga_title[:20] if len(safe_manga_title) > 20 else safe_manga_title
-                        short_chapter = safe_chapter_name[:20] if len(safe_chapter_name) > 20 else safe_chapter_name
-                        output_file = os.path.join(output_path, f"{short_title}_{short_chapter}{format_type}")
-                    
-                    # Save the PDF
-                    images[0].save(
-                        output_file, 
-                        "PDF", 
-                        resolution=100.0, 
-                        save_all=True, 
-                        append_images=images[1:]
-                    )
-            except Exception as pdf_error:
-                status_label.configure(text=f"PDF conversion error: {str(pdf_error)}")
-                return False, None
-        
-        elif format_type == ".cbz":
-            # Create zip and rename to CBZ
-            zip_file = base_output_file
-            
-            # Make sure the path isn't too long
-            if len(zip_file) > 240:  # Windows has 260 char path limit
-                short_title = safe_manga_title[:20] if len(safe_manga_title) > 20 else safe_manga_title
-                short_chapter = safe_chapter_name[:20] if len(safe_chapter_name) > 20 else safe_chapter_name
-                zip_file = os.path.join(output_path, f"{short_title}_{short_chapter}")
-                output_file = f"{zip_file}.cbz"
-                
-            try:
-                shutil.make_archive(zip_file, "zip", temp_dir)
-                
-                # Rename to CBZ
-                if os.path.exists(output_file):
-                    os.remove(output_file)
-                os.rename(f"{zip_file}.zip", output_file)
-            except Exception as zip_error:
-                status_label.configure(text=f"CBZ creation error: {str(zip_error)}")
-                return False, None
-        
-        elif format_type == ".png":
-            # Create a subfolder for the PNGs
-            png_folder = base_output_file
-            
-            # Make sure the path isn't too long
-            if len(png_folder) > 240:  # Windows has 260 char path limit
-                short_title = safe_manga_title[:20] if len(safe_manga_title) > 20 else safe_manga_title
-                short_chapter = safe_chapter_name[:20] if len(safe_chapter_name) > 20 else safe_chapter_name
-                png_folder = os.path.join(output_path, f"{short_title}_{short_chapter}")
-                
-            # If folder already exists, add timestamp
-            if os.path.exists(png_folder):
-                timestamp = int(time.time())
-                png_folder = f"{png_folder}_{timestamp}"
-                
-            if not os.path.exists(png_folder):
-                os.makedirs(png_folder)
-                
-            # Just copy all PNG files to the destination folder
-            try:
-                for img_file in image_files:
-                    src = os.path.join(temp_dir, img_file)
-                    dst = os.path.join(png_folder, img_file)
-                    shutil.copy(src, dst)
-                output_file = png_folder  # For opening folder later
-            except Exception as png_error:
-                status_label.configure(text=f"PNG copy error: {str(png_error)}")
-                return False, None
-        
-        # Clean up temp directory
-        try:
-            shutil.rmtree(temp_dir)
-        except Exception as cleanup_error:
-            print(f"Warning: Could not clean up temp directory: {str(cleanup_error)}")
-        
-        # Create "Open File" and "Open Folder" buttons
-        status_label.configure(text=f"Successfully saved to {output_file}")
-        
-        # Store the output file path and directory for the open buttons
-        global last_downloaded_file, last_downloaded_dir
-        last_downloaded_file = output_file
-        last_downloaded_dir = output_path
-        
-        # Show the open buttons
-        show_open_buttons()
-        
-        return True, output_file
+# Function to remember the last download and show the open buttons
+def mark_download_complete(output_file, output_path, status_label):
+    status_label.configure(text=f"Successfully saved to {output_file}")
     
-    except Exception as e:
-        status_label.configure(text=f"Error converting: {str(e)}")
-        print(f"Conversion error: {str(e)}")
-        return False, None
+    # Store the output file path and directory for the open buttons
+    global last_downloaded_file, last_downloaded_dir
+    last_downloaded_file = output_file
+    last_downloaded_dir = output_path
+    
+    # Show the open buttons
+    show_open_buttons()
 
 # Function to handle manga search
 def search_manga():
@@ -319,7 +122,7 @@ def search_manga():
     
     # Clear previous results
     results_listbox.delete(0, tk.END)
-    chapters_listbox.delete(0, tk.END)
+    clear_chapters()
     status_label.configure(text=f"Searching for '{query}' on {provider_name}...")
     
     def perform_search():
@@ -375,7 +178,7 @@ def on_manga_selected(event):
         return
     
     # Clear previous chapters
-    chapters_listbox.delete(0, tk.END)
+    clear_chapters()
     
     provider_name = provider_dropdown.get()
     status_label.configure(text=f"Fetching chapters for {manga_data.get('title', 'Unknown')}...")
@@ -403,8 +206,9 @@ def on_manga_selected(event):
                 status_label.configure(text="No chapters available")
                 return
             
-            # Store all chapters for searching/filtering
-            chapters_listbox.all_chapters = chapters
+            # Build the chapter list used for searching/filtering/sorting
+            global chapter_list
+            chapter_list = ChapterList(chapters)
             chapters_listbox.manga_title = manga_info.get("title", "Unknown Manga")
             chapters_listbox.manga_id = manga_id
             
@@ -416,7 +220,7 @@ def on_manga_selected(event):
                 print(f"Using image from search results: {manga_info['image']}")
             
             # Display chapters in listbox
-            display_chapters(chapters)
+            display_chapters()
             
             # Update manga info panel
             update_manga_info_panel(manga_info)
@@ -438,74 +242,91 @@ def calculate_image_size():
     return (100, 150)
 
 # Update load_manga_cover to use a fixed size
+def remember_cover_image(image_url, photo_img):
+    """Keep a ready CTkImage in the in-memory LRU"""
+    with cover_images_lock:
+        cover_images[image_url] = photo_img
+        cover_images.move_to_end(image_url)
+        while len(cover_images) > COVER_IMAGE_CACHE_SIZE:
+            cover_images.popitem(last=False)
+
+def download_cover_image(image_url):
+    """Download the raw bytes of a cover image"""
+    # Determine appropriate referer based on URL
+    referer = "https://mangapill.com"  # Default referer
+    if "mangapill" in image_url:
+        referer = "https://mangapill.com"
+    elif "mangapark" in image_url:
+        referer = "https://mangapark.net"
+    elif "mangahere" in image_url:
+        referer = "https://www.mangahere.cc"
+    
+    # Get current provider to use as referer
+    provider_name = provider_dropdown.get()
+    if provider_name in PROVIDERS and hasattr(PROVIDERS[provider_name], "base_url"):
+        referer = PROVIDERS[provider_name].base_url
+    
+    print(f"Using referer: {referer}")
+    
+    # Try with requests first (handles more headers/redirects)
+    try:
+        response = image_client.get(image_url, headers={"Referer": referer})
+        response.raise_for_status()
+        image_data = response.content
+        print(f"Successfully downloaded image with requests: {len(image_data)} bytes")
+    except Exception as e:
+        print(f"Requests failed, trying urlopen with custom headers: {str(e)}")
+        # Fallback to urlopen with custom headers
+        try:
+            req = urllib.request.Request(
+                image_url,
+                headers={
+                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+                    "Referer": referer
+                }
+            )
+            response = urllib.request.urlopen(req)
+            image_data = response.read()
+            print(f"Successfully downloaded image with urllib: {len(image_data)} bytes")
+        except Exception as e2:
+            print(f"Both download methods failed: {str(e2)}")
+            raise e2
+    
+    return image_data
+
 def load_manga_cover(image_url, max_size=None):
     """Load manga cover image from URL and resize it"""
     # Use a fixed size for better performance
-    max_size = (100, 150)
+    max_size = THUMBNAIL_SIZE
         
     try:
         if not image_url:
             print("No image URL provided")
             return None
             
-        print(f"Loading image from: {image_url}")
-        
-        # Determine appropriate referer based on URL
-        referer = "https://mangapill.com"  # Default referer
-        if "mangapill" in image_url:
-            referer = "https://mangapill.com"
-        elif "mangapark" in image_url:
-            referer = "https://mangapark.net"
-        elif "mangahere" in image_url:
-            referer = "https://www.mangahere.cc"
-        
-        # Get current provider to use as referer
-        provider_name = provider_dropdown.get()
-        if provider_name in PROVIDERS and hasattr(PROVIDERS[provider_name], "base_url"):
-            referer = PROVIDERS[provider_name].base_url
-        
-        print(f"Using referer: {referer}")
+        # Covers shown before are ready to use straight away
+        with cover_images_lock:
+            if image_url in cover_images:
+                cover_images.move_to_end(image_url)
+                return cover_images[image_url]
         
-        # Try with requests first (handles more headers/redirects)
-        try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                "Referer": referer,
-                "Accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8"
-            }
-            response = requests.get(image_url, headers=headers)
-            response.raise_for_status()
-            image_data = response.content
-            print(f"Successfully downloaded image with requests: {len(image_data)} bytes")
-        except Exception as e:
-            print(f"Requests failed, trying urlopen with custom headers: {str(e)}")
-            # Fallback to urlopen with custom headers
+        img = thumbnail_cache.get(image_url)
+        if img is None:
+            print(f"Loading image from: {image_url}")
+            image_data = download_cover_image(image_url)
+            
+            # Decode at reduced size and resize while maintaining aspect ratio
+            img = make_thumbnail(image_data, max_size)
+            print(f"Image resized to: {img.size}")
             try:
-                req = urllib.request.Request(
-                    image_url,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                        "Referer": referer
-                    }
-                )
-                response = urllib.request.urlopen(req)
-                image_data = response.read()
-                print(f"Successfully downloaded image with urllib: {len(image_data)} bytes")
-            except Exception as e2:
-                print(f"Both download methods failed: {str(e2)}")
-                raise e2
-        
-        # Convert to PIL Image
-        img = Image.open(BytesIO(image_data))
-        print(f"Image opened: {img.format}, {img.size}, {img.mode}")
-        
-        # Resize image while maintaining aspect ratio
-        img.thumbnail(max_size)
-        print(f"Image resized to: {img.size}")
+                thumbnail_cache.put(image_url, img)
+            except Exception as e:
+                print(f"Could not cache thumbnail: {str(e)}")
         
         # Convert to CTkImage for customtkinter
         photo_img = customtkinter.CTkImage(light_image=img, dark_image=img, size=img.size)
         print(f"Successfully created CTkImage")
+        remember_cover_image(image_url, photo_img)
         return photo_img
     except Exception as e:
         print(f"Error loading image: {str(e)}")
@@ -610,87 +431,66 @@ def update_manga_info_panel(manga_info):
     
     manga_info_label.configure(text=info_text)
 
-def display_chapters(chapters):
-    """Display chapters in the listbox with formatting"""
+def display_chapters():
+    """Display the rows of the chapter list in the listbox"""
+    global listbox_rows
     chapters_listbox.delete(0, tk.END)
+    if len(chapter_list):
+        chapters_listbox.insert(tk.END, *chapter_list.row_labels())
+    listbox_rows = list(chapter_list.rows)
+
+def clear_chapters():
+    """Empty the chapter list and the listbox"""
+    global chapter_list
+    chapter_list = ChapterList()
+    display_chapters()
+
+def update_displayed_chapters():
+    """Bring the listbox up to date with the chapter list, only touching rows that changed"""
+    global listbox_rows
+    edits = diff_rows(listbox_rows, chapter_list.rows)
+    # Past a point one bulk redraw is cheaper than many small listbox calls
+    if edits is None or len(edits) > MAX_LISTBOX_EDITS:
+        display_chapters()
+        return
     
-    for chapter in chapters:
-        chapter_title = chapter.get("title", "")
-        chapter_num = chapter.get("chapter", "")
-        
-        if chapter_num:
-            try:
-                # For numeric sorting
-                chapter["chapter_num"] = float(chapter_num)
-            except:
-                chapter["chapter_num"] = 0
-                
-            display_text = f"Chapter {chapter_num} - {chapter_title}"
-        else:
-            display_text = chapter_title
-            chapter["chapter_num"] = 0
-        
-        chapters_listbox.insert(tk.END, display_text)
+    for start, delete_count, inserted_rows in edits:
+        if delete_count:
+            chapters_listbox.delete(start, start + delete_count - 1)
+        if inserted_rows:
+            chapters_listbox.insert(start, *[chapter_list.labels[i] for i in inserted_rows])
+    listbox_rows = list(chapter_list.rows)
 
 def filter_chapters():
     """Filter chapters based on search text"""
-    if not hasattr(chapters_listbox, 'all_chapters'):
+    global filter_timer
+    filter_timer = None
+    if not chapter_list.chapters:
         return
     
-    search_text = chapter_search_entry.get().lower()
-    
-    if not search_text:
-        # If search is empty, show all chapters
-        display_chapters(chapters_listbox.all_chapters)
+    search_text = chapter_search_entry.get()
+    if not chapter_list.filter(search_text):
         return
+    update_displayed_chapters()
     
-    # Filter chapters based on search text
-    filtered_chapters = []
-    for chapter in chapters_listbox.all_chapters:
-        chapter_title = chapter.get("title", "").lower()
-        chapter_num = str(chapter.get("chapter", "")).lower()
-        
-        if search_text in chapter_title or search_text in chapter_num:
-            filtered_chapters.append(chapter)
-    
-    # Display filtered chapters
-    display_chapters(filtered_chapters)
-    status_label.configure(text=f"Found {len(filtered_chapters)} matching chapters")
+    if search_text:
+        status_label.configure(text=f"Found {len(chapter_list)} matching chapters")
+
+def schedule_filter_chapters(event=None):
+    """Filter once typing pauses instead of on every keystroke"""
+    global filter_timer
+    if filter_timer is not None:
+        root.after_cancel(filter_timer)
+    filter_timer = root.after(FILTER_DELAY_MS, filter_chapters)
 
 def sort_chapters():
     """Sort chapters based on selected sort option"""
-    if not hasattr(chapters_listbox, 'all_chapters'):
+    if not chapter_list.chapters:
         return
     
-    sort_option = sort_var.get()
-    
-    # Get the currently displayed chapters (which might be filtered)
-    displayed_chapters = []
-    for i in range(chapters_listbox.size()):
-        display_text = chapters_listbox.get(i)
-        for chapter in chapters_listbox.all_chapters:
-            chapter_title = chapter.get("title", "")
-            chapter_num = chapter.get("chapter", "")
-            
-            if chapter_num:
-                if f"Chapter {chapter_num} - {chapter_title}" == display_text:
-                    displayed_chapters.append(chapter)
-                    break
-            elif chapter_title == display_text:
-                displayed_chapters.append(chapter)
-                break
-    
-    if not displayed_chapters:
-        displayed_chapters = chapters_listbox.all_chapters.copy()
-    
-    # Sort the displayed chapters
-    if sort_option == "Newest First":
-        displayed_chapters.sort(key=lambda x: float(x.get("chapter_num", 0) or 0), reverse=True)
-    elif sort_option == "Oldest First":
-        displayed_chapters.sort(key=lambda x: float(x.get("chapter_num", 0) or 0))
-    
-    # Display sorted chapters
-    display_chapters(displayed_chapters)
+    # Sorts the displayed (possibly filtered) chapters, later filters keep the order
+    chapter_list.sort(sort_var.get())
+    display_chapters()
 
 # Function to download selected chapter
 def download_selected_chapter():
@@ -703,36 +503,14 @@ def download_selected_chapter():
         play_sound("error")
         return
     
-    # Get all chapters (filtered or not)
-    all_displayed_chapters = []
-    for i in range(chapters_listbox.size()):
-        # Find the corresponding chapter from all_chapters
-        display_text = chapters_listbox.get(i)
-        for chapter in chapters_listbox.all_chapters:
-            chapter_title = chapter.get("title", "")
-            chapter_num = chapter.get("chapter", "")
-            
-            if chapter_num:
-                if f"Chapter {chapter_num} - {chapter_title}" == display_text:
-                    all_displayed_chapters.append(chapter)
-                    break
-            elif chapter_title == display_text:
-                all_displayed_chapters.append(chapter)
-                break
-    
-    if not all_displayed_chapters:
-        status_label.configure(text="Error finding chapter data")
-        play_sound("error")
-        return
-        
     selected_idx = selected_idx[0]
-    if selected_idx >= len(all_displayed_chapters):
+    if selected_idx >= len(chapter_list):
         status_label.configure(text="Invalid chapter selection")
         play_sound("error")
         return
         
     # Get chapter data
-    chapter = all_displayed_chapters[selected_idx]
+    chapter = chapter_list.chapter_at(selected_idx)
     chapter_id = chapter.get("id", "")
     
     if not chapter_id:
@@ -747,8 +525,9 @@ def download_selected_chapter():
         play_sound("error")
         return
     
-    # Get selected format
+    # Get selected format and transcoding profile
     format_type = format_dropdown.get()
+    transcoder = get_transcoder()
     
     # Get manga title
     manga_title = getattr(chapters_listbox, 'manga_title', "Unknown Manga")
@@ -763,59 +542,53 @@ def download_selected_chapter():
     # Play start sound
     play_sound("start")
     
+    provider_name = provider_dropdown.get()
+    
+    # Download images
+    status_label.configure(text=f"Downloading chapter...")
+    progress_var.set(0)
+    # Show progress frame and progress bar
+    progress_frame.pack(fill=tk.X, padx=5, pady=2)
+    
+    # Add a label for the progress bar
+    progress_label = customtkinter.CTkLabel(
+        progress_frame,
+        text="Chapter Progress:",
+        anchor="w",
+        text_color=COLORS["text_primary"],
+        font=("Arial", 11)
+    )
+    progress_label.pack(fill=tk.X, padx=5, pady=(2, 0), anchor="w")
+    
+    progress_bar.pack(fill=tk.X, padx=5, pady=(0, 5))
+    
+    # Runs on the main loop once the download thread is done
+    def finish_download(success, output_file, error=None):
+        if error is not None:
+            status_label.configure(text=f"Download error: {error}")
+        elif success:
+            # Create "Open File" and "Open Folder" buttons
+            mark_download_complete(output_file, download_path, status_label)
+        
+        # Clear progress bars and enable the download buttons
+        clear_progress_bars()
+        download_button.configure(state="normal")
+        batch_download_button.configure(state="normal")
+    
     def perform_download():
         try:
-            provider_name = provider_dropdown.get()
-            
-            # Download images
-            status_label.configure(text=f"Downloading chapter...")
-            progress_var.set(0)
-            # Show progress frame and progress bar
-            progress_frame.pack(fill=tk.X, padx=5, pady=2)
+            # Download and save in the selected format, getting the output file path
+            reporter = TkProgressReporter(ui_events, progress_var, status_label)
+            # MANGA_TRACE=<file> records the download as a Chrome trace
+            with trace_session(*get_env_trace_settings(), name=f"{provider_name} chapter"):
+                success, output_file = download_chapter(PROVIDERS[provider_name], chapter, download_path, format_type, manga_title, reporter, transcoder=transcoder)
+            ui_events.call(finish_download, success, output_file)
             
-            # Add a label for the progress bar
-            progress_label = customtkinter.CTkLabel(
-                progress_frame,
-                text="Chapter Progress:",
-                anchor="w",
-                text_color=COLORS["text_primary"],
-                font=("Arial", 11)
-            )
-            progress_label.pack(fill=tk.X, padx=5, pady=(2, 0), anchor="w")
-            
-            progress_bar.pack(fill=tk.X, padx=5, pady=(0, 5))
-            
-            temp_dir, total_pages = download_chapter_images(chapter_id, provider_name, progress_var, status_label, manga_title, chapter.get("title"), chapter.get("chapter"))
-            
-            if not temp_dir or total_pages == 0:
-                status_label.configure(text="Download failed")
-                download_button.configure(state="normal")
-                batch_download_button.configure(state="normal")
-                # Clear progress bars when failed
-                clear_progress_bars()
-                play_sound("error")
-                return
-            
-            # Convert to selected format and get the output file path
-            success, output_file = convert_to_format(temp_dir, download_path, format_type, manga_title, chapter_id, status_label, chapter.get("title"), chapter.get("chapter"))
-            
-            # Clear progress bars when done
-            clear_progress_bars()
-            
-            # Enable download button
-            download_button.configure(state="normal")
-            batch_download_button.configure(state="normal")
-            
-            # Play completion sound
-            play_sound("complete")
+            # Play completion or error sound (off the main loop, winsound blocks)
+            play_sound("complete" if success else "error")
         
         except Exception as e:
-            status_label.configure(text=f"Download error: {str(e)}")
-            download_button.configure(state="normal")
-            batch_download_button.configure(state="normal")
-            # Clear progress bars on error
-            clear_progress_bars()
-            # Play error sound
+            ui_events.call(finish_download, False, None, str(e))
             play_sound("error")
     
     # Run download in a separate thread
@@ -841,39 +614,15 @@ def download_batch_chapters():
         play_sound("error")
         return
     
-    # Get selected format
+    # Get selected format and transcoding profile
     format_type = format_dropdown.get()
+    transcoder = get_transcoder()
     
     # Get manga title
     manga_title = getattr(chapters_listbox, 'manga_title', "Unknown Manga")
     
-    # Get all displayed chapters
-    all_displayed_chapters = []
-    for i in range(chapters_listbox.size()):
-        # Find the corresponding chapter from all_chapters
-        display_text = chapters_listbox.get(i)
-        for chapter in chapters_listbox.all_chapters:
-            chapter_title = chapter.get("title", "")
-            chapter_num = chapter.get("chapter", "")
-            
-            if chapter_num:
-                if f"Chapter {chapter_num} - {chapter_title}" == display_text:
-                    all_displayed_chapters.append(chapter)
-                    break
-            elif chapter_title == display_text:
-                all_displayed_chapters.append(chapter)
-                break
-    
-    if not all_displayed_chapters:
-        status_label.configure(text="Error finding chapter data")
-        play_sound("error")
-        return
-    
     # Get selected chapters
-    selected_chapters = []
-    for idx in selected_indices:
-        if idx < len(all_displayed_chapters):
-            selected_chapters.append(all_displayed_chapters[idx])
+    selected_chapters = chapter_list.chapters_at(selected_indices)
     
     if not selected_chapters:
         status_label.configure(text="No valid chapters selected")
@@ -922,70 +671,33 @@ def download_batch_chapters():
     )
     batch_progress_bar.pack(fill=tk.X, padx=5, pady=(0, 5))
     
-    def perform_batch_download():
-        provider_name = provider_dropdown.get()
-        completed = 0
-        failed = 0
-        last_successful_file = None
-        
-        for i, chapter in enumerate(selected_chapters):
-            try:
-                chapter_id = chapter.get("id", "")
-                if not chapter_id:
-                    print(f"Invalid chapter ID for chapter {i}")
-                    failed += 1
-                    continue
-                
-                # Update status
-                chapter_num = chapter.get("chapter", i+1)
-                status_label.configure(text=f"Downloading chapter {chapter_num} ({i+1}/{len(selected_chapters)})")
-                
-                # Download chapter
-                progress_var.set(0)
-                # Show progress frame if not already visible
-                if not progress_frame.winfo_ismapped():
-                    progress_frame.pack(fill=tk.X, padx=5, pady=2)
-                
-                # Add a label for the chapter progress bar if not already added
-                if not any(isinstance(widget, customtkinter.CTkLabel) and widget.cget("text") == "Chapter Progress:" 
-                          for widget in progress_frame.winfo_children()):
-                    progress_label = customtkinter.CTkLabel(
-                        progress_frame,
-                        text="Chapter Progress:",
-                        anchor="w",
-                        text_color=COLORS["text_primary"],
-                        font=("Arial", 11)
-                    )
-                    progress_label.pack(fill=tk.X, padx=5, pady=(2, 0), anchor="w")
-                
-                progress_bar.pack(fill=tk.X, padx=5, pady=(0, 5))
-                
-                temp_dir, total_pages = download_chapter_images(chapter_id, provider_name, progress_var, status_label, manga_title, chapter.get("title"), chapter.get("chapter"))
-                
-                if not temp_dir or total_pages == 0:
-                    print(f"Download failed for chapter {chapter_num}")
-                    failed += 1
-                    continue
-                
-                # Convert to selected format and get output file path
-                success, output_file = convert_to_format(temp_dir, download_path, format_type, manga_title, chapter_id, status_label, chapter.get("title"), chapter.get("chapter"))
-                if success:
-                    completed += 1
-                    last_successful_file = output_file
-                else:
-                    failed += 1
-                
-                # Update batch progress
-                batch_progress_var.set(i + 1)
-                batch_progress_label.configure(text=f"Batch Progress: {i+1}/{total_progress} (Completed: {completed}, Failed: {failed})")
-                
-                # Small delay to prevent overwhelming the server
-                time.sleep(1)
-                
-            except Exception as e:
-                print(f"Error downloading chapter: {str(e)}")
-                failed += 1
-        
+    provider_name = provider_dropdown.get()
+    
+    # Chapters without an ID can't be downloaded
+    valid_chapters = [chapter for chapter in selected_chapters if chapter.get("id", "")]
+    
+    # Show progress frame if not already visible
+    progress_var.set(0)
+    if not progress_frame.winfo_ismapped():
+        progress_frame.pack(fill=tk.X, padx=5, pady=2)
+    
+    # Add a label for the chapter progress bar if not already added
+    if not any(isinstance(widget, customtkinter.CTkLabel) and widget.cget("text") == "Chapter Progress:" 
+              for widget in progress_frame.winfo_children()):
+        progress_label = customtkinter.CTkLabel(
+            progress_frame,
+            text="Chapter Progress:",
+            anchor="w",
+            text_color=COLORS["text_primary"],
+            font=("Arial", 11)
+        )
+        progress_label.pack(fill=tk.X, padx=5, pady=(2, 0), anchor="w")
+    
+    progress_bar.pack(fill=tk.X, padx=5, pady=(0, 5))
+    status_label.configure(text=f"Downloading {len(valid_chapters)} chapters...")
+    
+    # Runs on the main loop once the batch thread is done
+    def finish_batch_download(completed, failed, last_successful_file):
         # Clear all progress bars
         clear_progress_bars()
         
@@ -1002,6 +714,43 @@ def download_batch_chapters():
             last_downloaded_file = last_successful_file
             last_downloaded_dir = download_path
             show_open_buttons()
+    
+    def perform_batch_download():
+        counts = {"done": 0, "completed": 0, "failed": len(selected_chapters) - len(valid_chapters)}
+        last_successful_file = None
+        
+        # Each chapter reports with its number in front, since several run at once
+        def make_reporter(i, chapter):
+            return TkProgressReporter(ui_events, progress_var, status_label, prefix=f"Chapter {chapter.get('chapter', i+1)}: ")
+        
+        # Update batch progress as each chapter finishes
+        def on_chapter_done(i, chapter, success, output_file):
+            nonlocal last_successful_file
+            counts["done"] += 1
+            if success:
+                counts["completed"] += 1
+                last_successful_file = output_file
+            else:
+                print(f"Download failed for chapter {chapter.get('chapter', i+1)}")
+                counts["failed"] += 1
+            ui_events.set_var(batch_progress_var, counts["done"])
+            ui_events.configure(
+                batch_progress_label,
+                text=f"Batch Progress: {counts['done']}/{total_progress} (Completed: {counts['completed']}, Failed: {counts['failed']})"
+            )
+        
+        # Several chapters are in flight at once, sharing one page pool and the per-host rate limits
+        try:
+            with trace_session(*get_env_trace_settings(), name=f"{provider_name} batch"):
+                download_chapters(
+                    PROVIDERS[provider_name], valid_chapters, download_path, format_type, manga_title,
+                    reporter_factory=make_reporter, on_chapter_done=on_chapter_done, transcoder=transcoder
+                )
+        except Exception as e:
+            print(f"Error downloading chapters: {str(e)}")
+        
+        completed = counts["completed"]
+        ui_events.call(finish_batch_download, completed, len(selected_chapters) - completed, last_successful_file)
         
         # Play completion sound
         play_sound("complete")
@@ -1222,14 +971,14 @@ chapter_search_entry = customtkinter.CTkEntry(
     corner_radius=8
 )
 chapter_search_entry.pack(side=tk.LEFT, padx=10)
-chapter_search_entry.bind("<KeyRelease>", lambda e: filter_chapters())
+chapter_search_entry.bind("<KeyRelease>", schedule_filter_chapters)
 
 # Chapter sort options
-sort_var = tk.StringVar(value="Newest First")
+sort_var = tk.StringVar(value=SORT_NEWEST_FIRST)
 sort_dropdown = customtkinter.CTkOptionMenu(
     chapters_control_frame,
     variable=sort_var,
-    values=["Newest First", "Oldest First"],
+    values=[SORT_NEWEST_FIRST, SORT_OLDEST_FIRST],
     command=lambda x: sort_chapters(),
     fg_color=COLORS["bg_tertiary"],
     text_color=COLORS["text_primary"],
@@ -1250,19 +999,16 @@ sort_label.pack(side=tk.RIGHT, padx=5)
 chapters_frame = customtkinter.CTkFrame(right_panel, fg_color=COLORS["bg_primary"])
 chapters_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=3)
 
-chapters_listbox = tk.Listbox(
+# Only the visible rows are drawn, so series with thousands of chapters open instantly
+# (supports Ctrl/Shift multiple selection for batch download like an extended Listbox)
+chapters_listbox = VirtualList(
     chapters_frame, 
-    height=10, 
-    width=50,
+    height=200, 
+    width=400,
     bg=COLORS["bg_secondary"],
     fg=COLORS["text_primary"],
     selectbackground=COLORS["accent"],
-    font=("Arial", 12),
-    relief="flat",
-    borderwidth=0,
-    highlightthickness=0,
-    activestyle="none",
-    selectmode=tk.EXTENDED  # Allow multiple selections for batch download
+    font=("Arial", 12)
 )
 chapters_scrollbar = ttk.Scrollbar(chapters_frame, command=chapters_listbox.yview, style="TScrollbar")
 chapters_listbox.configure(yscrollcommand=chapters_scrollbar.set)
@@ -1319,6 +1065,43 @@ format_dropdown = customtkinter.CTkOptionMenu(
 format_dropdown.pack(side=tk.LEFT, padx=5, pady=5)
 format_dropdown.set(".cbz")
 
+# Optional WebP/AVIF re-encoding of .cbz and folder pages
+transcode_label = customtkinter.CTkLabel(download_options_frame, text="Transcode:", font=("Arial", 14), text_color=COLORS["text_primary"])
+transcode_label.pack(side=tk.LEFT, padx=(10, 5), pady=5)
+
+transcode_dropdown = customtkinter.CTkOptionMenu(
+    download_options_frame, 
+    values=transcode_options,
+    fg_color=COLORS["bg_tertiary"], 
+    text_color=COLORS["text_primary"],
+    bg_color=COLORS["bg_secondary"],
+    button_color=COLORS["bg_tertiary"],
+    dropdown_fg_color=COLORS["bg_tertiary"],
+    dropdown_hover_color=COLORS["accent"],
+    width=80,
+    font=("Arial", 13),
+    corner_radius=8
+)
+transcode_dropdown.pack(side=tk.LEFT, padx=5, pady=5)
+transcode_dropdown.set(TRANSCODE_OFF)
+
+transcode_quality_label = customtkinter.CTkLabel(download_options_frame, text="Quality:", font=("Arial", 14), text_color=COLORS["text_primary"])
+transcode_quality_label.pack(side=tk.LEFT, padx=(10, 5), pady=5)
+
+transcode_quality_var = tk.StringVar(value=str(DEFAULT_QUALITY))
+transcode_quality_entry = customtkinter.CTkEntry(
+    download_options_frame, 
+    textvariable=transcode_quality_var,
+    width=50,
+    fg_color=COLORS["bg_tertiary"],
+    border_width=1,
+    border_color=COLORS["bg_tertiary"],
+    font=("Arial", 12),
+    height=30,
+    corner_radius=8
+)
+transcode_quality_entry.pack(side=tk.LEFT, padx=5, pady=5)
+
 download_folder_label = customtkinter.CTkLabel(download_options_frame, text="Download Folder:", font=("Arial", 14), text_color=COLORS["text_primary"])
 download_folder_label.pack(side=tk.LEFT, padx=(10, 5), pady=5)
 
@@ -1489,11 +1272,7 @@ open_folder_button = customtkinter.CTkButton(
 )
 
 # Initialize providers
-PROVIDERS = {
-    "MangaPill": MangaPill(),
-    "MangaPark": Mangapark(),
-    "MangaHere": MangaHere()
-}
+PROVIDERS = create_providers()
 
 # Add a function to handle window resize
 def on_window_resize(event):
@@ -1594,4 +1373,5 @@ def clear_progress_bars():
 
 # Start the app
 if __name__ == "__main__":
+    configure_logging(sys.argv[1:].count("--verbose"))
     root.mainloop()
\ No newline at end of file
@@ -1,12 +1,44 @@
-import requests
-from bs4 import BeautifulSoup
-import execjs
 import re
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from core.http_client import HttpClient, configure_host
+from core.parsing import compile_selector, only, parse_html
+from core.tracing import tracer
+from core.unpacker import unpack, evaluate_string_concat
+
+# execjs is only needed as a fallback when the Python unpacker can't decode a script
+try:
+    import execjs
+except ImportError:
+    execjs = None
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Only the page navigation is needed from a chapter page, and only the results and the
+# pager from a search page
+PAGER = only(["select", "div"], class_=["mangaread-page", "pager-list-left"])
+SEARCH_SECTIONS = only("div", class_=["container", "pager-list-left"])
+
+INFO_TITLE = compile_selector("span.detail-info-right-title-font")
+INFO_DESCRIPTION = compile_selector("div.detail-info-right > p.fullcontent")
+INFO_COVER = compile_selector("div.detail-info-cover > img")
+INFO_GENRES = compile_selector("p.detail-info-right-tag-list > a")
+INFO_STATUS = compile_selector("span.detail-info-right-title-tip")
+INFO_RATING = compile_selector("span.detail-info-right-title-star > span:last-child")
+INFO_AUTHORS = compile_selector("p.detail-info-right-say > a")
+INFO_CHAPTERS = compile_selector("ul.detail-main-list > li > a")
+CHAPTER_TITLE = compile_selector("div > p.title3")
+CHAPTER_RELEASE_DATE = compile_selector("div > p.title2")
+PAGE_OPTIONS = compile_selector("select.mangaread-page option")
+PAGE_LINKS = compile_selector("div.pager-list-left a:not([class]), div.pager-list-left span")
+SEARCH_NEXT_PAGE = compile_selector("div.pager-list-left > a.active + a")
+SEARCH_ITEMS = compile_selector("div.container > div > div > ul > li")
+SEARCH_LINK = compile_selector("a")
+SEARCH_TITLE = compile_selector("p.manga-list-4-item-title > a")
+SEARCH_IMAGE = compile_selector("a > img")
+SEARCH_PARAGRAPHS = compile_selector("p")
+SEARCH_STATUS = compile_selector("p.manga-list-4-show-tag-list-2 > a")
+
 class MangaHere:
     def __init__(self):
         self.name = "MangaHere"
@@ -15,8 +47,22 @@ class MangaHere:
             "https://i.pinimg.com/564x/51/08/62/51086247ed16ff8abae2df0bb06448e4.jpg"
         )
         self.class_path = "MANGA.MangaHere"
+        self.page_workers = 4
+        self.requests_per_second = 4
+        self.client = HttpClient(name=self.name)
+        configure_host(self.base_url, self.page_workers, rate=self.requests_per_second)
 
     def fetch_manga_info(self, manga_id):
+        try:
+            return self.client.get_text(
+                f"{self.base_url}/manga/{manga_id}", cache_kind="manga_info", headers={"cookie": "isAdult=1"},
+                parse=lambda html: self.parse_manga_info(html, manga_id)
+            )
+        except Exception as e:
+            raise Exception(f"Error fetching manga info:v {str(e)}")
+
+    def parse_manga_info(self, html, manga_id):
+        """Extract the title details and chapter list from a manga page"""
         manga_info = {
             "id": manga_id,
             "title": "",
@@ -29,139 +75,62 @@ class MangaHere:
             "authors": [],
             "chapters": [],
         }
-        try:
-            response = requests.get(
-                f"{self.base_url}/manga/{manga_id}", headers={"cookie": "isAdult=1"}
-            )
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            manga_info["title"] = soup.select_one(
-                "span.detail-info-right-title-font"
-            ).text.strip()
-            manga_info["description"] = soup.select_one(
-                "div.detail-info-right > p.fullcontent"
-            ).text.strip()
-            manga_info["image"] = soup.select_one("div.detail-info-cover > img")["src"]
-            manga_info["genres"] = [
-                a["title"].strip()
-                for a in soup.select("p.detail-info-right-tag-list > a")
-            ]
-            status_text = soup.select_one(
-                "span.detail-info-right-title-tip"
-            ).text.strip()
-            manga_info["status"] = (
-                "ONGOING"
-                if status_text == "Ongoing"
-                else "COMPLETED" if status_text == "Completed" else "UNKNOWN"
-            )
-            manga_info["rating"] = float(
-                soup.select_one(
-                    "span.detail-info-right-title-star > span:last-child"
-                ).text.strip()
-            )
-            manga_info["authors"] = [
-                a["title"] for a in soup.select("p.detail-info-right-say > a")
-            ]
-            print(soup.select("ul.detail-main-list > li"))
-            manga_info["chapters"] = [
-                {
-                    "id": a["href"].split("/manga/")[1].replace(".html", ""),
-                    "title": a.select_one("div > p.title3").text.strip(),
-                    "releasedDate": a.select_one("div > p.title2").text.strip(),
-                }
-                for a in soup.select("ul.detail-main-list > li > a")
-            ]
+        soup = parse_html(html)
+
+        manga_info["title"] = INFO_TITLE.select_one(soup).text.strip()
+        manga_info["description"] = INFO_DESCRIPTION.select_one(soup).text.strip()
+        manga_info["image"] = INFO_COVER.select_one(soup)["src"]
+        manga_info["genres"] = [
+            a["title"].strip()
+            for a in INFO_GENRES.select(soup)
+        ]
+        status_text = INFO_STATUS.select_one(soup).text.strip()
+        manga_info["status"] = (
+            "ONGOING"
+            if status_text == "Ongoing"
+            else "COMPLETED" if status_text == "Completed" else "UNKNOWN"
+        )
+        manga_info["rating"] = float(
+            INFO_RATING.select_one(soup).text.strip()
+        )
+        manga_info["authors"] = [
+            a["title"] for a in INFO_AUTHORS.select(soup)
+        ]
+        manga_info["chapters"] = [
+            {
+                "id": a["href"].split("/manga/")[1].replace(".html", ""),
+                "title": CHAPTER_TITLE.select_one(a).text.strip(),
+                "releasedDate": CHAPTER_RELEASE_DATE.select_one(a).text.strip(),
+            }
+            for a in INFO_CHAPTERS.select(soup)
+        ]
+
+        return manga_info
 
-            return manga_info
-        except Exception as e:
-            raise Exception(f"Error fetching manga info:v {str(e)}")
-        
     def fetch_chapter_pages(self, chapter_id):
-        chapter_pages = []
         url = f"{self.base_url}/manga/{chapter_id}/1.html"
         
         try:
-            response = requests.get(url, headers={"cookie": "isAdult=1"})
-            response.raise_for_status()
-            html = response.text
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Get total pages first
-            page_elements = soup.select('select.mangaread-page option')
-            if not page_elements:
-                page_elements = soup.select('div.pager-list-left a:not([class]), div.pager-list-left span')
-            
-            if not page_elements:
-                raise Exception("Could not determine number of pages")
-                
-            total_pages = max([
-                int(el.text.strip()) 
-                for el in page_elements 
-                if el.text.strip().isdigit()
-            ])
-            
-            logger.debug(f"Total pages found: {total_pages}")
-
-            # Get chapter ID and key
-            chapter_id_match = re.search(r'chapterid\s*=\s*(\d+)', html)
-            if not chapter_id_match:
-                raise Exception("Could not find chapter ID")
-            chapter_num = chapter_id_match.group(1)
-            s_key = self.extract_key(html)
-
-            # Fetch all pages
-            for page_num in range(1, total_pages + 1):
-                page_url = f"{self.base_url}/chapterfun.ashx"
-                params = {
-                    'cid': chapter_num,
-                    'page': page_num,
-                    'key': s_key
-                }
-                headers = {
-                    "Referer": url,
-                    "X-Requested-With": "XMLHttpRequest",
-                    "cookie": "isAdult=1"
+            total_pages, chapter_num, s_key = self.client.get_text(
+                url, cache_kind="chapter_pages", headers={"cookie": "isAdult=1"}, parse=self.parse_chapter_page
+            )
+
+            # Resolve every page's image URL through chapterfun.ashx
+            image_urls = self.resolve_page_urls(url, chapter_num, s_key, total_pages)
+            chapter_pages = [
+                {
+                    "page": page_num,  # Using actual page number instead of index
+                    "img": image_urls[page_num],
+                    "headerForImage": {
+                        "Referer": self.base_url
+                    }
                 }
-                
-                response = requests.get(page_url, params=params, headers=headers)
-                if not response.text:
-                    continue
-                    
-                # Decode the response
-                script = response.text.replace('eval', '')
-                try:
-                    ctx = execjs.compile(f"function getResult() {{ return {script} }}")
-                    decoded_script = ctx.call("getResult")
-                    
-                    # Extract image URLs
-                    base_url_match = re.search(r'pix\s*=\s*["\']([^"\']+)["\']', decoded_script)
-                    image_paths_match = re.search(r'pvalue\s*=\s*\[(.*?)\]', decoded_script)
-                    
-                    if base_url_match and image_paths_match:
-                        base_url = base_url_match.group(1)
-                        image_paths = [p.strip('"\'') for p in image_paths_match.group(1).split(',')]
-                        
-                        # Only take the first image from each response
-                        if image_paths and image_paths[0]:
-                            img_path = image_paths[0]
-                            img_url = f"https:{base_url}{img_path}" if not base_url.startswith('http') else f"{base_url}{img_path}"
-                            chapter_pages.append({
-                                "page": page_num,  # Using actual page number instead of index
-                                "img": img_url,
-                                "headerForImage": {
-                                    "Referer": self.base_url
-                                }
-                            })
-                except Exception as e:
-                    logger.error(f"Error processing page {page_num}: {str(e)}")
-                    continue
+                for page_num in sorted(image_urls)
+            ]
 
             if not chapter_pages:
                 raise Exception("No pages found")
-                
-            # Ensure pages are in correct order
-            chapter_pages.sort(key=lambda x: x["page"])
+
             logger.info(f"Successfully extracted {len(chapter_pages)} pages")
             return chapter_pages
             
@@ -169,65 +138,205 @@ class MangaHere:
             logger.exception(f"Error fetching chapter pages: {str(e)}")
             raise Exception(f"Error fetching chapter pages: {str(e)}")
     
+    def forget_chapter_pages(self, chapter_id):
+        """Drop the cached reader page of a chapter, so its image URLs are resolved with a fresh key"""
+        self.client.forget_text(f"{self.base_url}/manga/{chapter_id}/1.html")
+
+    def parse_chapter_page(self, html):
+        """
+        Read what resolving a chapter's images needs from its first reader page:
+        the page count, the chapter ID and the chapterfun.ashx key
+        """
+        soup = parse_html(html, parse_only=PAGER)
+
+        # Get total pages first
+        page_elements = PAGE_OPTIONS.select(soup)
+        if not page_elements:
+            page_elements = PAGE_LINKS.select(soup)
+        
+        if not page_elements:
+            raise Exception("Could not determine number of pages")
+            
+        total_pages = max([
+            int(el.text.strip()) 
+            for el in page_elements 
+            if el.text.strip().isdigit()
+        ])
+        
+        logger.debug(f"Total pages found: {total_pages}")
+
+        # Get chapter ID and key
+        chapter_id_match = re.search(r'chapterid\s*=\s*(\d+)', html)
+        if not chapter_id_match:
+            raise Exception("Could not find chapter ID")
+        return total_pages, chapter_id_match.group(1), self.extract_key(html)
+
+    def fetch_page_batch(self, chapter_url, cid, key, page_num):
+        """
+        Request chapterfun.ashx for one page. Each response lists the image for that page
+        and usually the ones after it, so return every URL in order (None for empty slots).
+        """
+        params = {
+            'cid': cid,
+            'page': page_num,
+            'key': key
+        }
+        headers = {
+            "Referer": chapter_url,
+            "X-Requested-With": "XMLHttpRequest",
+            "cookie": "isAdult=1"
+        }
+        
+        # Decode the response and extract image URLs. The URLs are signed with a token
+        # that expires (?token=...&ttl=...), so the response is never cached
+        decoded_script = self.client.get_text(
+            f"{self.base_url}/chapterfun.ashx", params=params, headers=headers,
+            parse=lambda script: self.decode_packed(script) if script else ""
+        )
+        if not decoded_script:
+            return []
+        base_url_match = re.search(r'pix\s*=\s*["\']([^"\']+)["\']', decoded_script)
+        image_paths_match = re.search(r'pvalue\s*=\s*\[(.*?)\]', decoded_script)
+        if not base_url_match or not image_paths_match:
+            return []
+        
+        base_url = base_url_match.group(1)
+        image_urls = []
+        for img_path in image_paths_match.group(1).split(','):
+            img_path = img_path.strip().strip('"\'')
+            if not img_path:
+                image_urls.append(None)
+            elif base_url.startswith('http'):
+                image_urls.append(f"{base_url}{img_path}")
+            else:
+                image_urls.append(f"https:{base_url}{img_path}")
+        return image_urls
+
+    def resolve_page_urls(self, chapter_url, cid, key, total_pages):
+        """
+        Map page numbers to image URLs with as few chapterfun.ashx requests as possible.
+        The first response tells us how many pages each request covers; the remaining
+        requests are spaced by that stride and run on a bounded pool, then any gaps
+        left by short or failed responses are requested individually.
+        """
+        image_urls = {}
+        requested = set()
+        
+        def store(page_num, batch):
+            for offset, img_url in enumerate(batch):
+                if img_url and page_num + offset <= total_pages:
+                    image_urls.setdefault(page_num + offset, img_url)
+        
+        def request(page_num):
+            requested.add(page_num)
+            try:
+                return self.fetch_page_batch(chapter_url, cid, key, page_num)
+            except Exception as e:
+                logger.error(f"Error processing page {page_num}: {str(e)}")
+                return []
+        
+        first_batch = request(1)
+        store(1, first_batch)
+        stride = max(1, len(first_batch))
+        pending = list(range(1 + stride, total_pages + 1, stride))
+        
+        with ThreadPoolExecutor(max_workers=self.page_workers) as executor:
+            while pending:
+                futures = {
+                    executor.submit(request, page_num): page_num
+                    for page_num in pending
+                    if page_num not in image_urls
+                }
+                for future in as_completed(futures):
+                    store(futures[future], future.result())
+                
+                # Fill in whatever the batched responses didn't cover
+                pending = [
+                    page_num for page_num in range(1, total_pages + 1)
+                    if page_num not in image_urls and page_num not in requested
+                ]
+        
+        logger.debug(f"Resolved {len(image_urls)}/{total_pages} pages with {len(requested)} requests")
+        return image_urls
+
     def search(self, query, page=1):
-        search_res = {"currentPage": page, "results": [], "hasNextPage": False}
         try:
-            response = requests.get(f"{self.base_url}/search?title={query}&page={page}")
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            with open("search.html", "w",encoding='utf-8') as f:
-                f.write(response.text)
-            search_res["hasNextPage"] = (
-                soup.select_one("div.pager-list-left > a.active + a").text.strip()
-                != ">"
+            return self.client.get_text(
+                f"{self.base_url}/search?title={query}&page={page}", cache_kind="search",
+                parse=lambda html: self.parse_search(html, page)
             )
-            print(soup.select("div.container > div > div > ul > li"))
-            search_res["results"] = [
-                {
-                    "id": a.select_one("a")["href"].split("/")[2],
-                    "title": a.select_one("p.manga-list-4-item-title > a").text.strip(),
-                    "headerForImage": {"Referer": self.base_url},
-                    "image": a.select_one("a > img")["src"],
-                    "description": a.select("p")[-1].text.strip(),
-                    "status": (
-                        "ONGOING"
-                        if a.select_one(
-                            "p.manga-list-4-show-tag-list-2 > a"
-                        ).text.strip()
-                        == "Ongoing"
-                        else (
-                            "COMPLETED"
-                            if a.select_one(
-                                "p.manga-list-4-show-tag-list-2 > a"
-                            ).text.strip()
-                            == "Completed"
-                            else "UNKNOWN"
-                        )
-                    ),
-                }
-                for a in soup.select("div.container > div > div > ul > li")
-            ]
-
-            return search_res
         except Exception as e:
             raise Exception(f"Error searching manga: {str(e)}")
 
+    def parse_search(self, html, page=1):
+        """Extract the results and paging from a search page"""
+        search_res = {"currentPage": page, "results": [], "hasNextPage": False}
+        soup = parse_html(html, parse_only=SEARCH_SECTIONS)
+        search_res["hasNextPage"] = (
+            SEARCH_NEXT_PAGE.select_one(soup).text.strip()
+            != ">"
+        )
+        search_res["results"] = [
+            {
+                "id": SEARCH_LINK.select_one(a)["href"].split("/")[2],
+                "title": SEARCH_TITLE.select_one(a).text.strip(),
+                "headerForImage": {"Referer": self.base_url},
+                "image": SEARCH_IMAGE.select_one(a)["src"],
+                "description": SEARCH_PARAGRAPHS.select(a)[-1].text.strip(),
+                "status": (
+                    "ONGOING"
+                    if SEARCH_STATUS.select_one(a).text.strip()
+                    == "Ongoing"
+                    else (
+                        "COMPLETED"
+                        if SEARCH_STATUS.select_one(a).text.strip()
+                        == "Completed"
+                        else "UNKNOWN"
+                    )
+                ),
+            }
+            for a in SEARCH_ITEMS.select(soup)
+        ]
+
+        return search_res
+
+    def decode_packed(self, script: str) -> str:
+        """Decode a p,a,c,k,e,d packed script in Python, falling back to execjs"""
+        try:
+            with tracer.span("unpack", "js"):
+                return unpack(script)
+        except ValueError as e:
+            if execjs is None:
+                raise
+            logger.debug(f"Falling back to execjs to decode script: {str(e)}")
+            with tracer.span("execjs decode", "js"):
+                ctx = execjs.compile(f"function getResult() {{ return {script.replace('eval', '')} }}")
+                return ctx.call("getResult")
+
+    def evaluate_key(self, key_str: str) -> str:
+        """Evaluate the key expression in Python, falling back to execjs"""
+        try:
+            with tracer.span("evaluate key", "js"):
+                return evaluate_string_concat(key_str)
+        except ValueError as e:
+            if execjs is None:
+                raise
+            logger.debug(f"Falling back to execjs to evaluate key: {str(e)}")
+            with tracer.span("execjs evaluate key", "js"):
+                ctx = execjs.compile(f"function getKey() {{ return {key_str} }}")
+                return ctx.call("getKey")
+
     def extract_key(self, html: str) -> str:
         try:
             start_idx = html.find('eval(function(p,a,c,k,e,d)')
             end_idx = html.find('</script>', start_idx)
-            script = html[start_idx:end_idx].replace('eval', '')
-            
-            ctx = execjs.compile(f"function getResult() {{ return {script} }}")
-            decoded_script = ctx.call("getResult")
+            decoded_script = self.decode_packed(html[start_idx:end_idx])
             
             start_key = decoded_script.find("'")
             end_key = decoded_script.find(';')
             key_str = decoded_script[start_key:end_key]
             
-            ctx = execjs.compile(f"function getKey() {{ return {key_str} }}")
-            return ctx.call("getKey")
+            return self.evaluate_key(key_str)
         except Exception as e:
             logger.error(f"Error extracting key: {str(e)}")
             return ''
-
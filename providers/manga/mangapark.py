@@ -2,194 +2,242 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import re
+from core.http_client import HttpClient, configure_host
+from core.parsing import compile_selector, only, parse_html
+
+# Chapter pages keep their image list in a qwik/json script
+QWIK_JSON_RE = re.compile(r"<script[^>]*type=[\"']qwik/json[\"'][^>]*>(.*?)</script>", re.DOTALL | re.IGNORECASE)
+SCRIPT_RE = re.compile(r"<script[^>]*>(.*?)</script>", re.DOTALL | re.IGNORECASE)
+IMAGE_URL_RE = re.compile(r'https://[^"\'\s]+?(?:/media/|/i0\.wp\.com/).+?\.(?:jpg|jpeg|png|gif|webp)')
+
+# Selectors are compiled once instead of on every call
+INFO_TITLE = compile_selector("h3.text-lg.font-bold > a")
+INFO_IMAGE = compile_selector("img.w-full.not-prose.shadow-md")
+INFO_DESCRIPTION = compile_selector("div.limit-html-p")
+INFO_AUTHORS = compile_selector("div.mt-2.text-sm.md\\:text-base.opacity-80 a")
+INFO_GENRES = compile_selector("div.flex.items-center.flex-wrap span span:nth-child(1)")
+INFO_STATUS = compile_selector("span.font-bold.uppercase.text-success")
+INFO_STATUS_FALLBACK = compile_selector("div.space-y-2 span.font-bold.uppercase.text-warning")
+INFO_RATING = compile_selector("span.font-bold.opacity-80.whitespace-nowrap")
+INFO_VOTES = compile_selector("div.text-sm.opacity-80.whitespace-nowrap")
+INFO_RATING_BARS = compile_selector("div.flex.items-center.text-xs.md\\:text-sm.space-x-2")
+INFO_RATING_STARS = compile_selector("div.flex.items-center.font-mono.font-bold.opacity-80 span")
+INFO_RATING_PERCENTAGE = compile_selector("span.font-mono.opacity-80")
+INFO_SCORE_WIDTH = compile_selector("div.absolute.top-0.bottom-0.left-0.overflow-hidden")
+INFO_VIEWS = compile_selector("div.mt-5.space-y-3:has(b.text-lg.font-bold:-soup-contains('Views'))")
+INFO_READERS = compile_selector("div.mt-5.space-y-3:has(b.text-lg.font-bold:-soup-contains('Readers'))")
+INFO_STAT_SPANS = compile_selector("span.whitespace-nowrap")
+INFO_LANGUAGE = compile_selector("div.whitespace-nowrap.overflow-hidden")
+INFO_PUBLICATION = compile_selector("div:has(span.font-bold.uppercase.text-success)")
+INFO_CHAPTERS = compile_selector(".px-2.py-2")
+CHAPTER_LINK = compile_selector("div.space-x-1 a")
+CHAPTER_SUFFIX = compile_selector("div.space-x-1 span")
+CHAPTER_DIVS = compile_selector("div")
+CHAPTER_TIME = compile_selector("time")
+CHAPTER_TIME_TEXT = compile_selector("span")
+PAGE_IMAGES = compile_selector('img[src*="/media/"], img[src*="/i0.wp.com/"]')
+MANGA_ITEMS = compile_selector("div.flex.border-b.border-b-base-200")
+MANGA_LINK = compile_selector("h3.font-bold a")
+MANGA_IMAGE = compile_selector("img")
+MANGA_GENRES = compile_selector("div.flex.flex-wrap.text-xs span.whitespace-nowrap")
+SEARCH_PAGE_LINKS = compile_selector("a[href*='page=']")
+MANGA_LATEST_CHAPTER = compile_selector("div.flex.flex-nowrap.justify-between a")
+MANGA_TIME = compile_selector("time")
+MANGA_TIME_TEXT = compile_selector("span")
+MANGA_RATING = compile_selector("span.flex.flex-nowrap.items-center.text-yellow-500 span.font-bold")
+GENRE_LINKS = compile_selector("a.link-hover")
 
 class Mangapark:
     name = "Mangapark"
     base_url = "https://mangapark.net"
     logo = "https://raw.githubusercontent.com/tachiyomiorg/tachiyomi-extensions/repo/icon/tachiyomi-en.mangapark-v1.3.23.png"
     class_path = "MANGA.Mangapark"
+    page_workers = 6
+    requests_per_second = 4
 
     def __init__(self):
-        self.client = requests.Session()
+        self.client = HttpClient(name=self.name)
+        configure_host(self.base_url, self.page_workers, rate=self.requests_per_second)
 
     def fetch_manga_info(self, manga_id: str, *args) -> dict:
         if not manga_id:
             raise ValueError("Manga ID cannot be empty")
         
-        manga_info = {"id": manga_id, "title": ""}
         url = f"{self.base_url}/title/{manga_id}"
 
         try:
-            response = self.client.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            manga_info["title"] = soup.select_one("h3.text-lg.font-bold > a").text if soup.select_one("h3.text-lg.font-bold > a") else "Unknown Title"
-            manga_info["image"] = soup.select_one("img.w-full.not-prose.shadow-md")["src"] if soup.select_one("img.w-full.not-prose.shadow-md") else None
-            # Extract description - simplest direct approach
-            description_elem = soup.select_one("div.limit-html-p")
-            if description_elem:
-                manga_info["description"] = description_elem.text.strip()
-            else:
-                manga_info["description"] = "No description available"
-            
-            # Extract authors
-            authors = []
-            author_elements = soup.select("div.mt-2.text-sm.md\\:text-base.opacity-80 a")
-            for author_elem in author_elements:
-                authors.append(author_elem.text.strip())
-            manga_info["authors"] = authors
-            
-            manga_info["genres"] = [
-                genre.text
-                for genre in soup.select(
-                    "div.flex.items-center.flex-wrap span span:nth-child(1)"
-                )
-            ]
-            manga_info["status"] = soup.select("span.font-bold.uppercase.text-success")[
-                0
-            ].text if soup.select("span.font-bold.uppercase.text-success") else soup.select_one(
-                "div.space-y-2 span.font-bold.uppercase.text-warning"
-            ).text.strip() 
-            
-            # Extract rating information
-            manga_info["rating"] = {
-                "score": None,
-                "votes": None,
-                "distribution": {}
-            }
-            
-            # Try to find the rating score directly
-            rating_elem = soup.select_one("span.font-bold.opacity-80.whitespace-nowrap")
-            if rating_elem:
-                rating_text = rating_elem.text.strip()
-                if rating_text and rating_text[0].isdigit():
-                    try:
-                        manga_info["rating"]["score"] = float(rating_text)
-                    except ValueError:
-                        pass
-            
-            # Extract vote count
-            votes_elem = soup.select_one("div.text-sm.opacity-80.whitespace-nowrap")
-            if votes_elem:
-                votes_text = votes_elem.text.strip()
-                if votes_text:
-                    votes_count = votes_text.split()[0]
-                    manga_info["rating"]["votes"] = votes_count
-            
-            # Extract rating distribution
-            rating_bars = soup.select("div.flex.items-center.text-xs.md\\:text-sm.space-x-2")
-            for bar in rating_bars:
-                stars_elem = bar.select_one("div.flex.items-center.font-mono.font-bold.opacity-80 span")
-                if stars_elem:
-                    stars = stars_elem.text.strip()
-                    percentage_elem = bar.select_one("span.font-mono.opacity-80")
-                    if percentage_elem:
-                        percentage = percentage_elem.text.strip()
-                        manga_info["rating"]["distribution"][stars] = percentage
-            
-            # If we couldn't find the score directly, try to calculate it from the width
-            if manga_info["rating"]["score"] is None:
-                score_width_elem = soup.select_one("div.absolute.top-0.bottom-0.left-0.overflow-hidden")
-                if score_width_elem and "style" in score_width_elem.attrs:
-                    style = score_width_elem["style"]
-                    width_match = re.search(r'width:(\d+\.?\d*)%', style)
-                    if width_match:
-                        width_percentage = float(width_match.group(1))
-                        # Calculate score out of 5
-                        manga_info["rating"]["score"] = round((width_percentage / 100) * 5, 2)
-            
-            # Extract view statistics
-            views_section = soup.select_one("div.mt-5.space-y-3:has(b.text-lg.font-bold:contains('Views'))")
-            if views_section:
-                views_data = {}
-                view_spans = views_section.select("span.whitespace-nowrap")
-                for span in view_spans:
-                    text = span.text.strip()
-                    if ":" in text:
-                        key, value = text.split(":", 1)
-                        views_data[key.strip()] = value.strip()
-                    elif "Total" in text:
-                        views_data["Total"] = text.replace("Total:", "").strip()
-                    else:
-                        # Handle format like "360 days: 207.6K"
-                        parts = text.split()
-                        if len(parts) >= 2 and parts[-1].isalpha() or parts[-1][-1].isalpha():
-                            key = ' '.join(parts[:-1])
-                            value = parts[-1]
-                            views_data[key] = value
-                manga_info["views"] = views_data
-            
-            # Extract reader statistics
-            readers_section = soup.select_one("div.mt-5.space-y-3:has(b.text-lg.font-bold:contains('Readers'))")
-            if readers_section:
-                readers_data = {}
-                reader_spans = readers_section.select("span.whitespace-nowrap")
-                for span in reader_spans:
-                    text = span.text.strip()
-                    if len(text.split()) > 1:
-                        key = ' '.join(text.split()[1:])  # Get everything after the first word
-                        value = text.split()[0]
-                        readers_data[key] = value
-                manga_info["readers"] = readers_data
-            
-            # Extract language information
-            lang_elem = soup.select_one("div.whitespace-nowrap.overflow-hidden")
-            if lang_elem:
-                lang_text = lang_elem.text.strip()
-                # Clean up language info by removing emoji codes
-                lang_text = re.sub(r'\uD83C[\uDDE6-\uDDFF]\uD83C[\uDDE6-\uDDFF]', '', lang_text)
-                lang_text = re.sub(r'Tr From', 'Translated From', lang_text)
-                manga_info["language"] = lang_text.strip()
-            
-            # Extract publication info
-            pub_elem = soup.select_one("div:has(span.font-bold.uppercase.text-success)")
-            if pub_elem:
-                pub_text = pub_elem.text.strip()
-                # Clean up the publication status text
-                if ":" in pub_text:
-                    pub_text = pub_text.split(":", 1)[1].strip()
-                # Further clean up by removing any content after the status
-                if pub_text:
-                    status_words = ["Ongoing", "Completed", "Cancelled", "Hiatus"]
-                    for status in status_words:
-                        if status in pub_text:
-                            pub_text = status
-                            break
-                manga_info["publication_status"] = pub_text
-            
-            chapters = []
-            for chapter in soup.select(".px-2.py-2"):
-                chapter_id = chapter.select_one("div.space-x-1 a")["href"].replace(
-                    "/title/", ""
-                )
-                title = (
-                    chapter.select_one("div.space-x-1 a").text
-                    + ""
-                    + chapter.select_one("div.space-x-1 span").text
-                    if chapter.select_one("div.space-x-1 span").text.startswith(": ")
-                    else chapter.select_one("div.space-x-1 a").text
-                )
-                release_data_element = (
-                    chapter.select("div")[1].select("div")[-1].select_one("time")
-                )
-                release_date = release_data_element.select_one("span").text
-                release_date_in_unix = release_data_element["data-time"]
+            return self.client.get_text(url, cache_kind="manga_info", parse=lambda html: self.parse_manga_info(html, manga_id))
 
-                chapters.append(
-                    {
-                        "id": chapter_id,
-                        "title": title,
-                        "releaseDate": release_date,
-                        "releaseDateUnix": release_date_in_unix,
-                    }
-                )
+        except Exception as e:
+            raise Exception(f"Error fetching manga info: {str(e)}")
 
-            manga_info["chapters"] = chapters
+    def parse_manga_info(self, html: str, manga_id: str) -> dict:
+        """
+        Extracts the title details, ratings and chapter list from a title page
+        """
+        manga_info = {"id": manga_id, "title": ""}
+        soup = parse_html(html)
+        title_elem = INFO_TITLE.select_one(soup)
+        manga_info["title"] = title_elem.text if title_elem else "Unknown Title"
+        image_elem = INFO_IMAGE.select_one(soup)
+        manga_info["image"] = image_elem["src"] if image_elem else None
+        # Extract description - simplest direct approach
+        description_elem = INFO_DESCRIPTION.select_one(soup)
+        if description_elem:
+            manga_info["description"] = description_elem.text.strip()
+        else:
+            manga_info["description"] = "No description available"
+        
+        # Extract authors
+        authors = []
+        author_elements = INFO_AUTHORS.select(soup)
+        for author_elem in author_elements:
+            authors.append(author_elem.text.strip())
+        manga_info["authors"] = authors
+        
+        manga_info["genres"] = [
+            genre.text
+            for genre in INFO_GENRES.select(soup)
+        ]
+        status_elem = INFO_STATUS.select_one(soup)
+        manga_info["status"] = status_elem.text if status_elem else INFO_STATUS_FALLBACK.select_one(soup).text.strip()
+        
+        # Extract rating information
+        manga_info["rating"] = {
+            "score": None,
+            "votes": None,
+            "distribution": {}
+        }
+        
+        # Try to find the rating score directly
+        rating_elem = INFO_RATING.select_one(soup)
+        if rating_elem:
+            rating_text = rating_elem.text.strip()
+            if rating_text and rating_text[0].isdigit():
+                try:
+                    manga_info["rating"]["score"] = float(rating_text)
+                except ValueError:
+                    pass
+        
+        # Extract vote count
+        votes_elem = INFO_VOTES.select_one(soup)
+        if votes_elem:
+            votes_text = votes_elem.text.strip()
+            if votes_text:
+                votes_count = votes_text.split()[0]
+                manga_info["rating"]["votes"] = votes_count
+        
+        # Extract rating distribution
+        rating_bars = INFO_RATING_BARS.select(soup)
+        for bar in rating_bars:
+            stars_elem = INFO_RATING_STARS.select_one(bar)
+            if stars_elem:
+                stars = stars_elem.text.strip()
+                percentage_elem = INFO_RATING_PERCENTAGE.select_one(bar)
+                if percentage_elem:
+                    percentage = percentage_elem.text.strip()
+                    manga_info["rating"]["distribution"][stars] = percentage
+        
+        # If we couldn't find the score directly, try to calculate it from the width
+        if manga_info["rating"]["score"] is None:
+            score_width_elem = INFO_SCORE_WIDTH.select_one(soup)
+            if score_width_elem and "style" in score_width_elem.attrs:
+                style = score_width_elem["style"]
+                width_match = re.search(r'width:(\d+\.?\d*)%', style)
+                if width_match:
+                    width_percentage = float(width_match.group(1))
+                    # Calculate score out of 5
+                    manga_info["rating"]["score"] = round((width_percentage / 100) * 5, 2)
+        
+        # Extract view statistics
+        views_section = INFO_VIEWS.select_one(soup)
+        if views_section:
+            views_data = {}
+            view_spans = INFO_STAT_SPANS.select(views_section)
+            for span in view_spans:
+                text = span.text.strip()
+                if ":" in text:
+                    key, value = text.split(":", 1)
+                    views_data[key.strip()] = value.strip()
+                elif "Total" in text:
+                    views_data["Total"] = text.replace("Total:", "").strip()
+                else:
+                    # Handle format like "360 days: 207.6K"
+                    parts = text.split()
+                    if len(parts) >= 2 and parts[-1].isalpha() or parts[-1][-1].isalpha():
+                        key = ' '.join(parts[:-1])
+                        value = parts[-1]
+                        views_data[key] = value
+            manga_info["views"] = views_data
+        
+        # Extract reader statistics
+        readers_section = INFO_READERS.select_one(soup)
+        if readers_section:
+            readers_data = {}
+            reader_spans = INFO_STAT_SPANS.select(readers_section)
+            for span in reader_spans:
+                text = span.text.strip()
+                if len(text.split()) > 1:
+                    key = ' '.join(text.split()[1:])  # Get everything after the first word
+                    value = text.split()[0]
+                    readers_data[key] = value
+            manga_info["readers"] = readers_data
+        
+        # Extract language information
+        lang_elem = INFO_LANGUAGE.select_one(soup)
+        if lang_elem:
+            lang_text = lang_elem.text.strip()
+            # Clean up language info by removing emoji codes
+            lang_text = re.sub(r'\uD83C[\uDDE6-\uDDFF]\uD83C[\uDDE6-\uDDFF]', '', lang_text)
+            lang_text = re.sub(r'Tr From', 'Translated From', lang_text)
+            manga_info["language"] = lang_text.strip()
+        
+        # Extract publication info
+        pub_elem = INFO_PUBLICATION.select_one(soup)
+        if pub_elem:
+            pub_text = pub_elem.text.strip()
+            # Clean up the publication status text
+            if ":" in pub_text:
+                pub_text = pub_text.split(":", 1)[1].strip()
+            # Further clean up by removing any content after the status
+            if pub_text:
+                status_words = ["Ongoing", "Completed", "Cancelled", "Hiatus"]
+                for status in status_words:
+                    if status in pub_text:
+                        pub_text = status
+                        break
+            manga_info["publication_status"] = pub_text
+        
+        chapters = []
+        for chapter in INFO_CHAPTERS.select(soup):
+            chapter_link = CHAPTER_LINK.select_one(chapter)
+            chapter_suffix = CHAPTER_SUFFIX.select_one(chapter)
+            chapter_id = chapter_link["href"].replace(
+                "/title/", ""
+            )
+            title = (
+                chapter_link.text + chapter_suffix.text
+                if chapter_suffix.text.startswith(": ")
+                else chapter_link.text
+            )
+            release_data_element = CHAPTER_TIME.select_one(
+                CHAPTER_DIVS.select(CHAPTER_DIVS.select(chapter)[1])[-1]
+            )
+            release_date = CHAPTER_TIME_TEXT.select_one(release_data_element).text
+            release_date_in_unix = release_data_element["data-time"]
 
-            return manga_info
+            chapters.append(
+                {
+                    "id": chapter_id,
+                    "title": title,
+                    "releaseDate": release_date,
+                    "releaseDateUnix": release_date_in_unix,
+                }
+            )
 
-        except Exception as e:
-            raise Exception(f"Error fetching manga info: {str(e)}")
+        manga_info["chapters"] = chapters
+
+        return manga_info
 
     def fetch_chapter_pages(self, chapter_id: str) -> list:
         if not chapter_id:
@@ -197,71 +245,62 @@ class Mangapark:
         
         url = f"{self.base_url}/title/{chapter_id}"
         try:
-            response = self.client.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Find all script tags
-            scripts = soup.find_all('script')
-            pages = []
-            page_number = 1
-            
-            # Look for image URLs in all script contents
-            for script in scripts:
-                if not script.string:
-                    continue
-                    
-                # Try to parse as JSON if it looks like JSON data
-                if script.get('type') == 'qwik/json' or script.string.strip().startswith('{'):
-                    try:
-                        data = json.loads(script.string)
-                        # Recursively search for image URLs in the JSON data
-                        def extract_images(obj):
-                            if isinstance(obj, str) and obj.startswith('https://') and ('/media/' in obj or '/i0.wp.com/' in obj):
-                                pages.append({
-                                    "page": len(pages) + 1,
-                                    "img": obj
-                                })
-                            elif isinstance(obj, dict):
-                                for value in obj.values():
-                                    extract_images(value)
-                            elif isinstance(obj, list):
-                                for item in obj:
-                                    extract_images(item)
-                                    
-                        extract_images(data)
-                    except json.JSONDecodeError:
-                        continue
-                
-                # Also look for direct image URLs in script content
-                if isinstance(script.string, str):
-                    urls = re.findall(r'https://[^"\'\s]+?(?:/media/|/i0\.wp\.com/).+?\.(?:jpg|jpeg|png|gif|webp)', script.string)
-                    for url in urls:
-                        if url not in [p["img"] for p in pages]:
-                            pages.append({
-                                "page": len(pages) + 1,
-                                "img": url
-                            })
-            
-            if not pages:
-                # Fallback: Look for image tags directly
-                images = soup.select('img[src*="/media/"], img[src*="/i0.wp.com/"]')
-                for img in images:
-                    src = img.get('src')
-                    if src and src not in [p["img"] for p in pages]:
-                        pages.append({
-                            "page": len(pages) + 1,
-                            "img": src
-                        })
+            pages = self.client.get_text(url, cache_kind="chapter_pages", parse=self.parse_chapter_pages)
             
             if not pages:
                 raise Exception("No pages found")
                 
-            return sorted(pages, key=lambda x: x["page"])
+            return pages
 
         except Exception as e:
             raise Exception(f"Error fetching chapter pages: {str(e)}")
 
+    @staticmethod
+    def is_page_image(value: str) -> bool:
+        return value.startswith('https://') and ('/media/' in value or '/i0.wp.com/' in value)
+
+    def parse_chapter_pages(self, html: str) -> list:
+        """
+        Extracts page images from chapter HTML in a single pass over the qwik/json payload.
+        Falls back to scanning script text, then <img> tags, if the payload has no images.
+        """
+        # Insertion-ordered set of image URLs
+        urls = {}
+        
+        for match in QWIK_JSON_RE.finditer(html):
+            try:
+                data = json.loads(match.group(1))
+            except json.JSONDecodeError:
+                continue
+            
+            # Iterative depth-first walk, children pushed in reverse to keep document order
+            stack = [data]
+            while stack:
+                obj = stack.pop()
+                if isinstance(obj, str):
+                    if self.is_page_image(obj):
+                        urls[obj] = None
+                elif isinstance(obj, dict):
+                    stack.extend(reversed(list(obj.values())))
+                elif isinstance(obj, list):
+                    stack.extend(reversed(obj))
+        
+        if not urls:
+            # Look for direct image URLs in script content
+            for script in SCRIPT_RE.finditer(html):
+                for url in IMAGE_URL_RE.findall(script.group(1)):
+                    urls[url] = None
+        
+        if not urls:
+            # Fallback: Look for image tags directly
+            soup = parse_html(html, parse_only=only("img"))
+            for img in PAGE_IMAGES.select(soup):
+                src = img.get('src')
+                if src:
+                    urls[src] = None
+        
+        return [{"page": i + 1, "img": url} for i, url in enumerate(urls)]
+
     def search(self, query: str, page: int = 1, *args) -> dict:
         if not query:
             raise ValueError("Search query cannot be empty")
@@ -273,65 +312,66 @@ class Mangapark:
         url = f"{self.base_url}/search?word={query}&page={page}"
 
         try:
-            response = self.client.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            results = []
-            for item in soup.select("div.flex.border-b.border-b-base-200"):
-                title_link = item.select_one("h3.font-bold a")
-                if not title_link:
-                    continue
-                    
-                manga_id = title_link["href"].replace("/title/", "")
-                title = title_link.text.strip()
-                
-                # Get image URL
-                image = item.select_one("img")
-                image_url = image["src"] if image else None
-                
-                # Get additional info
-                genres = [
-                    span.text.strip() 
-                    for span in item.select("div.flex.flex-wrap.text-xs span.whitespace-nowrap")
-                    if span.text.strip()
-                ]
-                
-                results.append({
-                    "id": manga_id,
-                    "title": title,
-                    "image": image_url,
-                    "genres": genres
-                })
-
-            return {
-                "results": results,
-                "hasNextPage": bool(soup.select_one("a[href*='page=" + str(page + 1) + "']"))
-            }
+            return self.client.get_text(url, cache_kind="search", parse=lambda html: self.parse_search(html, page))
 
         except Exception as e:
             raise Exception(f"Error searching manga: {str(e)}")
+
+    def parse_search(self, html: str, page: int = 1) -> dict:
+        """
+        Extracts search results from a search page
+        """
+        soup = parse_html(html)
+
+        results = []
+        for item in MANGA_ITEMS.select(soup):
+            title_link = MANGA_LINK.select_one(item)
+            if not title_link:
+                continue
+                
+            manga_id = title_link["href"].replace("/title/", "")
+            title = title_link.text.strip()
             
+            # Get image URL
+            image = MANGA_IMAGE.select_one(item)
+            image_url = image["src"] if image else None
+            
+            # Get additional info
+            genres = [
+                span.text.strip() 
+                for span in MANGA_GENRES.select(item)
+                if span.text.strip()
+            ]
+            
+            results.append({
+                "id": manga_id,
+                "title": title,
+                "image": image_url,
+                "genres": genres
+            })
+
+        return {
+            "results": results,
+            "hasNextPage": any(f"page={page + 1}" in a["href"] for a in SEARCH_PAGE_LINKS.select(soup))
+        }
+        
     def fetch_home_page(self, *args) -> BeautifulSoup:
         """
         Fetches the home page HTML and returns the BeautifulSoup object
         """
         url = f"{self.base_url}/"
         try:
-            response = self.client.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            return soup
+            return self.client.get_text(url, cache_kind="home", parse=parse_html)
         except Exception as e:
             raise Exception(f"Error fetching home page: {str(e)}")
             
 
     
-    def get_latest_releases(self) -> list:
+    def get_latest_releases(self, html: str = None) -> list:
         """
-        Extracts latest manga releases from the home page
+        Extracts latest manga releases from the home page (fetched unless its html is given)
         """
-        soup = self.fetch_home_page()
+        soup = parse_html(html) if html is not None else self.fetch_home_page()
             
         latest_releases = []
         
@@ -347,12 +387,12 @@ class Mangapark:
             return latest_releases
             
         # Extract manga items
-        manga_items = latest_section.select("div.flex.border-b.border-b-base-200")
+        manga_items = MANGA_ITEMS.select(latest_section)
         
         for item in manga_items:
             try:
                 # Extract manga ID and title
-                title_link = item.select_one("h3.font-bold a")
+                title_link = MANGA_LINK.select_one(item)
                 if not title_link:
                     continue
                     
@@ -360,30 +400,31 @@ class Mangapark:
                 title = title_link.text.strip()
                 
                 # Extract image
-                image = item.select_one("img")
+                image = MANGA_IMAGE.select_one(item)
                 image_url = image["src"] if image else None
                 
                 # Extract latest chapter
-                chapter_link = item.select_one("div.flex.flex-nowrap.justify-between a")
+                chapter_link = MANGA_LATEST_CHAPTER.select_one(item)
                 latest_chapter = {
                     "id": chapter_link["href"].replace("/title/", "") if chapter_link else None,
                     "title": chapter_link.text.strip() if chapter_link else None
                 }
                 
                 # Extract release date
-                time_elem = item.select_one("time")
-                release_date = time_elem.select_one("span").text.strip() if time_elem and time_elem.select_one("span") else None
+                time_elem = MANGA_TIME.select_one(item)
+                time_text = MANGA_TIME_TEXT.select_one(time_elem) if time_elem else None
+                release_date = time_text.text.strip() if time_text else None
                 release_date_unix = time_elem["data-time"] if time_elem and "data-time" in time_elem.attrs else None
                 
                 # Extract genres
                 genres = [
                     span.text.strip() 
-                    for span in item.select("div.flex.flex-wrap.text-xs span.whitespace-nowrap")
+                    for span in MANGA_GENRES.select(item)
                     if span.text.strip()
                 ]
                 
                 # Extract rating if available
-                rating_elem = item.select_one("span.flex.flex-nowrap.items-center.text-yellow-500 span.font-bold")
+                rating_elem = MANGA_RATING.select_one(item)
                 rating = rating_elem.text.strip() if rating_elem else None
                 
                 manga_data = {
@@ -405,11 +446,11 @@ class Mangapark:
                 
         return latest_releases
     
-    def get_genres(self) -> list:
+    def get_genres(self, html: str = None) -> list:
         """
-        Extracts available genres from the home page
+        Extracts available genres from the home page (fetched unless its html is given)
         """
-        soup = self.fetch_home_page()
+        soup = parse_html(html) if html is not None else self.fetch_home_page()
             
         genres = []
         
@@ -423,12 +464,12 @@ class Mangapark:
         
         if not genres_section:
             # Try to find genres from manga items
-            genre_elements = soup.select("div.flex.flex-wrap.text-xs span.whitespace-nowrap")
+            genre_elements = MANGA_GENRES.select(soup)
             genres = list(set([elem.text.strip() for elem in genre_elements if elem.text.strip()]))
             return genres
             
         # If we found a dedicated genres section, extract from there
-        genre_links = genres_section.select("a.link-hover")
+        genre_links = GENRE_LINKS.select(genres_section)
         genres = [link.text.strip() for link in genre_links if link.text.strip()]
         
         return genres
@@ -1,6 +1,27 @@
 import requests
-from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
+from core.http_client import HttpClient, configure_host
+from core.parsing import compile_selector, only, parse_html
+
+# Everything MangaPill shows lives in div.container blocks or <chapter-page> elements,
+# so only those subtrees are built
+CONTAINERS = only("div", class_="container")
+CHAPTER_PAGES = only("chapter-page")
+
+# Selectors are compiled once instead of on every call
+SEARCH_ITEMS = compile_selector("div.container div.my-3.justify-end > div")
+SEARCH_LINK = compile_selector("a")
+SEARCH_IMAGE = compile_selector("a img")
+SEARCH_TITLE = compile_selector("div > a > div")
+INFO_TITLE = compile_selector("div.container div.my-3 div.flex-col div.mb-3 h1")
+INFO_COVER = compile_selector("div.container div.my-3 div.flex-row img")
+INFO_DESCRIPTION = compile_selector("p.text-sm.text--secondary")
+INFO_RELEASE_DATE = compile_selector("div.grid.grid-cols-1.gap-3.mb-3 div:nth-child(3) div")
+INFO_GENRES = compile_selector('div.container div.my-3 div.flex-col div.mb-3:-soup-contains("Genres")')
+INFO_CHAPTERS = compile_selector("div.container div.border-border div#chapters div.grid-cols-1 a")
+PAGE_ITEMS = compile_selector("chapter-page")
+PAGE_IMAGE = compile_selector("div picture img")
+PAGE_SUMMARY = compile_selector("div[data-summary] > div")
 
 
 class MangaPill:
@@ -9,128 +30,122 @@ class MangaPill:
         self.base_url = "https://mangapill.com"
         self.logo = "https://scontent-man2-1.xx.fbcdn.net/v/t39.30808-6/300819578_399903675586699_2357525969702348451_n.png?_nc_cat=100&ccb=1-7&_nc_sid=09cbfe&_nc_ohc=Md2cQ4wRNWwAX-_U0fz&_nc_ht=scontent-man2-1.xx&oh=00_AfCJjAYDk9bsndz8uyNG-GdFIYcPvdIzbHnetHGzf1pVSw&oe=63BDD131"
         self.class_path = "MANGA.MangaPill"
+        self.page_workers = 6
+        self.requests_per_second = 4
         self.headers = {
             "User-Agent": "Mozilla/5.0",
         }
+        self.client = HttpClient(headers=self.headers, name=self.name)
+        configure_host(self.base_url, self.page_workers, rate=self.requests_per_second)
 
-    def _get_request(self, url: str) -> str:
-        response = requests.get(f"{self.base_url}{url}", headers=self.headers)
-        response.raise_for_status()
-        return response.text
+    def _get_request(self, url: str, cache_kind: Optional[str] = None, parse=None):
+        return self.client.get_text(f"{self.base_url}{url}", cache_kind=cache_kind, parse=parse)
 
     def search(self, query: str) -> Dict:
         try:
             query = requests.utils.quote(query)
-            html_data = self._get_request(f"/search?q={query}")
-            soup = BeautifulSoup(html_data, "html.parser")
-
-            results = []
-            for el in soup.select("div.container div.my-3.justify-end > div"):
-                link = el.select_one("a")
-                img = el.select_one("a img")
-                results.append(
-                    {
-                        "id": link["href"].split("/manga/")[1] if link else "",
-                        "title": (
-                            el.select_one("div > a > div").text.strip()
-                            if el.select_one("div > a > div")
-                            else ""
-                        ),
-                        "image": img["data-src"] if img else "",
-                        "headerForImage": {
-                            "Referer": self.base_url
-                        },
-                    }
-                )
-
-            return {"results": results}
+            return self._get_request(f"/search?q={query}", cache_kind="search", parse=self.parse_search)
         except requests.HTTPError as e:
             raise ValueError(f"HTTP Error: {str(e)}")
         except Exception as e:
             raise ValueError(f"Error: {str(e)}")
 
+    def parse_search(self, html_data: str) -> Dict:
+        """Extracts search results from a search page"""
+        soup = parse_html(html_data, parse_only=CONTAINERS)
+
+        results = []
+        for el in SEARCH_ITEMS.select(soup):
+            link = SEARCH_LINK.select_one(el)
+            img = SEARCH_IMAGE.select_one(el)
+            title = SEARCH_TITLE.select_one(el)
+            results.append(
+                {
+                    "id": link["href"].split("/manga/")[1] if link else "",
+                    "title": title.text.strip() if title else "",
+                    "image": img["data-src"] if img else "",
+                    "headerForImage": {
+                        "Referer": self.base_url
+                    },
+                }
+            )
+
+        return {"results": results}
+
     def fetch_manga_info(self, manga_id: str) -> Dict:
+        try:
+            return self._get_request(
+                f"/manga/{manga_id}", cache_kind="manga_info", parse=lambda html_data: self.parse_manga_info(html_data, manga_id)
+            )
+        except requests.HTTPError as e:
+            raise ValueError(f"HTTP Error: {str(e)}")
+        except Exception as e:
+            raise ValueError(f"Error: {str(e)}")
+
+    def parse_manga_info(self, html_data: str, manga_id: str) -> Dict:
+        """Extracts the title details and chapter list from a manga page"""
         manga_info = {
             "id": manga_id,
             "title": "",
         }
-        try:
-            html_data = self._get_request(f"/manga/{manga_id}")
-            soup = BeautifulSoup(html_data, "html.parser")
+        soup = parse_html(html_data, parse_only=CONTAINERS)
 
-            manga_info["title"] = soup.select_one(
-                "div.container div.my-3 div.flex-col div.mb-3 h1"
-            ).text.strip()
+        manga_info["title"] = INFO_TITLE.select_one(soup).text.strip()
+        
+        # Get cover image
+        cover_img = INFO_COVER.select_one(soup)
+        if cover_img and cover_img.has_attr("data-src"):
+            manga_info["cover"] = cover_img["data-src"]
+        elif cover_img and cover_img.has_attr("src"):
+            manga_info["cover"] = cover_img["src"]
             
-            # Get cover image
-            cover_img = soup.select_one("div.container div.my-3 div.flex-row img")
-            if cover_img and cover_img.has_attr("data-src"):
-                manga_info["cover"] = cover_img["data-src"]
-            elif cover_img and cover_img.has_attr("src"):
-                manga_info["cover"] = cover_img["src"]
-                
-            manga_info["description"] = " ".join(
-                soup.select_one(
-                    "p.text-sm.text--secondary"
-                ).text.split("\n")
-            ).strip()
-            manga_info["releaseDate"] = (
-                soup.select_one(
-                    'div.grid.grid-cols-1.gap-3.mb-3 div:nth-child(3) div'
-                ).text.strip()
-            )
-            manga_info["genres"] = [
-                genre.strip()
-                for genre in soup.select_one(
-                    'div.container div.my-3 div.flex-col div.mb-3:contains("Genres")'
-                ).text.split("\n")
-                if genre.strip() and genre != "Genres"
-            ]
-
-            manga_info["chapters"] = [
-                {
-                    "id": el["href"].split("/chapters/")[1] if el else "",
-                    "title": el.text.strip(),
-                    "chapter": (
-                        el.text.split("Chapter ")[1] if "Chapter " in el.text else ""
-                    ),
-                }
-                for el in soup.select(
-                    "div.container div.border-border div#chapters div.grid-cols-1 a"
-                )
-            ]
+        manga_info["description"] = " ".join(
+            INFO_DESCRIPTION.select_one(soup).text.split("\n")
+        ).strip()
+        manga_info["releaseDate"] = INFO_RELEASE_DATE.select_one(soup).text.strip()
+        manga_info["genres"] = [
+            genre.strip()
+            for genre in INFO_GENRES.select_one(soup).text.split("\n")
+            if genre.strip() and genre != "Genres"
+        ]
+
+        manga_info["chapters"] = [
+            {
+                "id": el["href"].split("/chapters/")[1] if el else "",
+                "title": el.text.strip(),
+                "chapter": (
+                    el.text.split("Chapter ")[1] if "Chapter " in el.text else ""
+                ),
+            }
+            for el in INFO_CHAPTERS.select(soup)
+        ]
 
-            return manga_info
+        return manga_info
+
+    def fetch_chapter_pages(self, chapter_id: str) -> List[Dict]:
+        try:
+            return self._get_request(f"/chapters/{chapter_id}", cache_kind="chapter_pages", parse=self.parse_chapter_pages)
         except requests.HTTPError as e:
             raise ValueError(f"HTTP Error: {str(e)}")
         except Exception as e:
             raise ValueError(f"Error: {str(e)}")
 
-    def fetch_chapter_pages(self, chapter_id: str) -> List[Dict]:
-        try:
-            html_data = self._get_request(f"/chapters/{chapter_id}")
-            soup = BeautifulSoup(html_data, "html.parser")
+    def parse_chapter_pages(self, html_data: str) -> List[Dict]:
+        """Extracts the page images from a chapter page"""
+        soup = parse_html(html_data, parse_only=CHAPTER_PAGES)
 
-            pages = [
+        pages = []
+        for el in PAGE_ITEMS.select(soup):
+            summary = PAGE_SUMMARY.select_one(el)
+            pages.append(
                 {
-                    "img": el.select_one("div picture img")["data-src"],
-                    "page": (
-                            el.select_one("div[data-summary] > div").text.split(
-                                "page "
-                            )[1].split("/")[0]
-                        if el.select_one("div[data-summary] > div")
-                        else 0
-                    ),
+                    "img": PAGE_IMAGE.select_one(el)["data-src"],
+                    "page": summary.text.split("page ")[1].split("/")[0] if summary else 0,
                     "headerForImage": {
                         "Referer": self.base_url
                     },
                 }
-                for el in soup.select("chapter-page")
-            ]
+            )
 
-            return pages
-        except requests.HTTPError as e:
-            raise ValueError(f"HTTP Error: {str(e)}")
-        except Exception as e:
-            raise ValueError(f"Error: {str(e)}")
+        return pages
 
@@ -0,0 +1,138 @@
+import unittest
+from email.utils import formatdate
+from unittest import mock
+
+from core.adaptive import MIN_WINDOW, AdaptiveLimit, HostConcurrency, parse_retry_after
+
+
+class FakeClock:
+    """Stands in for time.monotonic()"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class AdaptiveLimitTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("core.adaptive.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def request(self, limit, latency=0.1, **kwargs):
+        limit.acquire()
+        limit.release(latency, **kwargs)
+
+    def window(self, limit, completions, saturated=True, latency=0.1, rate_wait=0.0):
+        """Finish `completions` requests spread over one throughput window"""
+        limit._window_saturated = saturated
+        length = MIN_WINDOW * 1.01
+        for _ in range(completions):
+            self.clock.now += length / completions
+            self.request(limit, latency, rate_wait=rate_wait)
+
+    def test_grows_while_throughput_rises(self):
+        limit = AdaptiveLimit(initial=4)
+        self.window(limit, 10)
+        self.assertEqual(limit.current, 5)
+        self.window(limit, 20)
+        self.assertEqual(limit.current, 6)
+
+    def test_stops_growing_when_throughput_is_flat(self):
+        limit = AdaptiveLimit(initial=4)
+        self.window(limit, 10)
+        self.window(limit, 10)
+        self.window(limit, 10)
+        self.assertEqual(limit.current, 5)
+
+    def test_only_grows_when_every_slot_was_in_use(self):
+        limit = AdaptiveLimit(initial=4)
+        self.window(limit, 10, saturated=False)
+        self.window(limit, 20, saturated=False)
+        self.assertEqual(limit.current, 4)
+
+    def test_stays_within_bounds(self):
+        limit = AdaptiveLimit(initial=4, maximum=5)
+        for completions in (10, 20, 40):
+            self.window(limit, completions)
+        self.assertEqual(limit.current, 5)
+
+    def test_shrinks_to_what_the_rate_limit_needs(self):
+        limit = AdaptiveLimit(initial=12)
+        # 20 requests/s at 100ms each keep about 2 slots busy, plus 1 spare
+        self.window(limit, 10, latency=0.1, rate_wait=0.1)
+        self.assertEqual(limit.current, 3)
+
+    def test_throttling_halves_once_per_round_trip(self):
+        limit = AdaptiveLimit(initial=8)
+        self.request(limit, 0.2)
+        self.request(limit, 0.2, status=429)
+        self.assertEqual(limit.current, 4)
+        self.request(limit, 0.2, status=503)
+        self.assertEqual(limit.current, 4)
+        self.clock.now += 0.3
+        self.request(limit, 0.2, status=503)
+        self.assertEqual(limit.current, 2)
+
+    def test_connection_errors_and_latency_spikes_back_off(self):
+        limit = AdaptiveLimit(initial=8)
+        limit.acquire()
+        limit.release(failed=True)
+        self.assertEqual(limit.current, 4)
+
+        for _ in range(5):
+            self.request(limit, 0.2)
+        self.clock.now += 1
+        self.request(limit, 2.0)
+        self.assertEqual(limit.current, 2)
+
+    def test_never_below_the_minimum(self):
+        limit = AdaptiveLimit(initial=2)
+        for _ in range(5):
+            self.clock.now += 2
+            self.request(limit, status=429)
+        self.assertEqual(limit.current, 1)
+
+    def test_retry_after_pauses_the_host(self):
+        limit = AdaptiveLimit(initial=8)
+        self.request(limit, 0.2, retry_after=5)
+        self.assertEqual(limit.current, 4)
+        self.assertAlmostEqual(limit.paused_until, self.clock.now + 5)
+
+    def test_retry_after_is_capped(self):
+        limit = AdaptiveLimit(initial=8)
+        self.request(limit, 0.2, retry_after=86400)
+        self.assertLessEqual(limit.paused_until - self.clock.now, 120)
+
+
+class HostConcurrencyTest(unittest.TestCase):
+    def test_configure_keeps_learned_limits(self):
+        hosts = HostConcurrency(initial=4)
+        hosts.configure("https://a.invalid", 2)
+        self.assertEqual(hosts.get("https://a.invalid").current, 2)
+        self.assertEqual(hosts.get("https://b.invalid").current, 4)
+
+        hosts.get("https://a.invalid").limit = 7
+        hosts.configure("https://a.invalid", 2)
+        self.assertEqual(hosts.snapshot(), {"https://a.invalid": 7, "https://b.invalid": 4})
+
+
+class ParseRetryAfterTest(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after("5"), 5.0)
+        self.assertEqual(parse_retry_after("-3"), 0.0)
+
+    def test_http_date(self):
+        self.assertAlmostEqual(parse_retry_after(formatdate(usegmt=True)), 0.0, delta=1.0)
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after(""))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+if __name__ == "__main__":
+    unittest.main()
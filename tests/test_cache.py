@@ -0,0 +1,168 @@
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from benchmarks.standin_server import add_server_arguments, create_server
+from core.cache import CACHE_TTLS, ResponseCache, get_response_cache, set_response_cache
+from core.http_client import HttpClient, configure_host
+from providers.manga.mangahere import MangaHere
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.cache = ResponseCache(self.workdir)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def test_entries_expire_after_their_ttl(self):
+        self.cache.set("Test", "http://site.invalid/a", "body")
+        self.assertEqual(self.cache.get("Test", "http://site.invalid/a", 60), "body")
+
+        later = time.time() + 61
+        with mock.patch("core.cache.time.time", return_value=later):
+            self.assertIsNone(self.cache.get("Test", "http://site.invalid/a", 60))
+            self.assertEqual(self.cache.get("Test", "http://site.invalid/a", 3600), "body")
+
+    def test_entries_are_per_provider(self):
+        self.cache.set("Test", "http://site.invalid/a", "body")
+        self.assertIsNone(self.cache.get("Other", "http://site.invalid/a", 60))
+
+    def test_delete(self):
+        self.cache.set("Test", "http://site.invalid/a", "body")
+        self.cache.delete("Test", "http://site.invalid/a")
+        self.assertIsNone(self.cache.get("Test", "http://site.invalid/a", 60))
+        self.cache.delete("Test", "http://site.invalid/a")
+
+    def test_least_recently_used_are_evicted(self):
+        self.cache.set("Test", "probe", os.urandom(2000).hex())
+        size = self.cache._scan()[1]
+        self.cache.clear()
+
+        cache = ResponseCache(self.workdir, max_bytes=int(size * 3.5))
+        for n, age in enumerate((300, 200, 100)):
+            url = f"http://site.invalid/{n}"
+            cache.set("Test", url, os.urandom(2000).hex())
+            stamp = time.time() - age
+            os.utime(cache._path("Test", url), (stamp, stamp))
+
+        # Reading the oldest makes it the most recently used
+        self.assertIsNotNone(cache.get("Test", "http://site.invalid/0", 60))
+        cache.set("Test", "http://site.invalid/new", os.urandom(2000).hex())
+
+        self.assertIsNone(cache.get("Test", "http://site.invalid/1", 60))
+        self.assertIsNotNone(cache.get("Test", "http://site.invalid/0", 60))
+        self.assertIsNotNone(cache.get("Test", "http://site.invalid/new", 60))
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeClient(HttpClient):
+    """Answers every GET with the next body in `bodies`"""
+
+    def __init__(self, bodies):
+        super().__init__(name="Test")
+        self.bodies = list(bodies)
+        self.requests = 0
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests += 1
+        return FakeResponse(self.bodies.pop(0))
+
+
+def parse_pages(text):
+    return [line for line in text.splitlines() if line.startswith("page")]
+
+
+class ParseGateTest(unittest.TestCase):
+    """get_text() only caches responses that parse"""
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.cache = get_response_cache()
+        set_response_cache(ResponseCache(self.workdir))
+
+    def tearDown(self):
+        set_response_cache(self.cache)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def test_responses_that_parse_are_cached(self):
+        client = FakeClient(["page 1\npage 2"])
+        self.assertEqual(client.get_text("http://site.invalid/c1", cache_kind="chapter_pages", parse=parse_pages), ["page 1", "page 2"])
+        self.assertEqual(client.get_text("http://site.invalid/c1", cache_kind="chapter_pages", parse=parse_pages), ["page 1", "page 2"])
+        self.assertEqual(client.requests, 1)
+
+    def test_responses_that_dont_parse_are_not_cached(self):
+        client = FakeClient(["<html>Checking your browser</html>", "page 1"])
+        self.assertEqual(client.get_text("http://site.invalid/c1", cache_kind="chapter_pages", parse=parse_pages), [])
+        self.assertEqual(client.get_text("http://site.invalid/c1", cache_kind="chapter_pages", parse=parse_pages), ["page 1"])
+        self.assertEqual(client.requests, 2)
+
+    def test_cached_copy_that_no_longer_parses_is_dropped(self):
+        get_response_cache().set("Test", "http://site.invalid/c1", "stale")
+        client = FakeClient(["page 1"])
+        self.assertEqual(client.get_text("http://site.invalid/c1", cache_kind="chapter_pages", parse=parse_pages), ["page 1"])
+        self.assertEqual(get_response_cache().get("Test", "http://site.invalid/c1", CACHE_TTLS["chapter_pages"]), "page 1")
+
+    def test_params_are_part_of_the_key(self):
+        client = FakeClient(["page 1", "page 2"])
+        self.assertEqual(client.get_text("http://site.invalid/c", cache_kind="search", params={"page": 1}, parse=parse_pages), ["page 1"])
+        self.assertEqual(client.get_text("http://site.invalid/c", cache_kind="search", params={"page": 2}, parse=parse_pages), ["page 2"])
+        self.assertEqual(client.get_text("http://site.invalid/c", cache_kind="search", params={"page": 1}, parse=parse_pages), ["page 1"])
+        self.assertEqual(client.requests, 2)
+
+
+class MangaHereCacheTest(unittest.TestCase):
+    """What MangaHere keeps in the response cache, against the offline stand-in site"""
+
+    def setUp(self):
+        parser = argparse.ArgumentParser()
+        add_server_arguments(parser)
+        self.server = create_server(parser.parse_args(["--pages", "6", "--image-size", "60x80"]))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        configure_host(self.server.root, 4, rate=0)
+
+        self.workdir = tempfile.mkdtemp()
+        self.cache = get_response_cache()
+        set_response_cache(ResponseCache(self.workdir))
+        self.provider = MangaHere()
+        self.provider.base_url = self.server.base_url("MangaHere")
+
+    def tearDown(self):
+        set_response_cache(self.cache)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetch(self):
+        before = self.server.stats()["requests"]
+        pages = self.provider.fetch_chapter_pages("fixture_here/c001")
+        self.assertEqual(len(pages), 6)
+        return self.server.stats()["requests"] - before
+
+    def test_signed_image_urls_are_not_cached(self):
+        first = self.fetch()
+        # The reader page comes from the cache, the chapterfun.ashx responses don't
+        self.assertEqual(self.fetch(), first - 1)
+
+    def test_forget_chapter_pages(self):
+        first = self.fetch()
+        self.provider.forget_chapter_pages("fixture_here/c001")
+        self.assertEqual(self.fetch(), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from core.cbz import CbzWriter, page_sort_key
+
+
+class CbzWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.workdir, "chapter.cbz")
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def test_page_sort_key(self):
+        names = ["10.jpg", "cover.txt", "2.png", "1.5.jpg", "1.jpg"]
+        self.assertEqual(sorted(names, key=page_sort_key), ["1.jpg", "1.5.jpg", "2.png", "10.jpg", "cover.txt"])
+
+    def test_images_are_stored_and_the_rest_deflated(self):
+        with CbzWriter(self.output_file) as writer:
+            writer.add_page("1.jpg", b"\xff\xd8\xff" + b"0" * 500)
+            writer.add_page("ComicInfo.xml", b"<ComicInfo/>" * 50)
+        with zipfile.ZipFile(self.output_file) as archive:
+            self.assertEqual(archive.getinfo("1.jpg").compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(archive.getinfo("ComicInfo.xml").compress_type, zipfile.ZIP_DEFLATED)
+        self.assertFalse(os.path.exists(self.output_file + ".part"))
+
+    def test_failure_discards_the_archive(self):
+        with self.assertRaises(RuntimeError):
+            with CbzWriter(self.output_file) as writer:
+                writer.add_page("1.jpg", b"page 1")
+                raise RuntimeError("download failed")
+        self.assertEqual(os.listdir(self.workdir), [])
+
+    def test_resume_keeps_page_order_and_unique_names(self):
+        writer = CbzWriter(self.output_file)
+        writer.add_page("3.jpg", b"page 3")
+        writer.add_page("1.jpg", b"page 1")
+        writer.add_page("2.jpg", b"damaged")
+        writer.suspend()
+
+        writer = CbzWriter(self.output_file, resume=True)
+        self.assertTrue(writer.resumed)
+        self.assertTrue(writer.has_page("1.jpg", 6))
+        self.assertFalse(writer.has_page("4.jpg", 6))
+        writer.retain({"1.jpg", "3.jpg"})
+        writer.add_page("2.jpg", b"page 2")
+        writer.add_page("10.jpg", b"page 10")
+        writer.add_page("3.jpg", b"page 3 again")
+        writer.close()
+
+        with zipfile.ZipFile(self.output_file) as archive:
+            self.assertEqual(archive.namelist(), ["1.jpg", "2.jpg", "3.jpg", "10.jpg"])
+            self.assertEqual(archive.read("2.jpg"), b"page 2")
+            self.assertEqual(archive.read("3.jpg"), b"page 3 again")
+
+    def test_has_page_checks_the_digest(self):
+        writer = CbzWriter(self.output_file)
+        writer.add_page("1.jpg", b"page 1")
+        self.assertTrue(writer.has_page("1.jpg", 6, hashlib.sha256(b"page 1").hexdigest()))
+        self.assertFalse(writer.has_page("1.jpg", 6, hashlib.sha256(b"page 2").hexdigest()))
+        self.assertFalse(writer.has_page("1.jpg", 7))
+        writer.abort()
+
+    def test_resume_ignores_a_damaged_part_file(self):
+        with open(self.output_file + ".part", "wb") as f:
+            f.write(b"not a zip file")
+        writer = CbzWriter(self.output_file, resume=True)
+        self.assertFalse(writer.resumed)
+        writer.add_page("1.jpg", b"page 1")
+        writer.close()
+        with zipfile.ZipFile(self.output_file) as archive:
+            self.assertEqual(archive.namelist(), ["1.jpg"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import random
+import unittest
+
+from core.chapter_list import SORT_NEWEST_FIRST, SORT_OLDEST_FIRST, ChapterList, diff_rows, format_chapter_label
+
+CHAPTERS = [
+    {"id": "c1", "title": "The Beginning", "chapter": "1"},
+    {"id": "c2", "title": "Chapter 2: Rain", "chapter": ""},
+    {"id": "c10", "title": "Ten", "chapter": "10"},
+    {"id": "c10.5", "title": "Extra", "chapter": "10.5"},
+    {"id": "c3", "title": "Return", "chapter": "3"},
+]
+
+
+def apply_edits(rows, edits):
+    rows = list(rows)
+    for start, delete_count, inserted in edits:
+        rows[start:start + delete_count] = inserted
+    return rows
+
+
+class ChapterListTest(unittest.TestCase):
+    def test_labels(self):
+        self.assertEqual(format_chapter_label(CHAPTERS[0]), "Chapter 1 - The Beginning")
+        self.assertEqual(format_chapter_label(CHAPTERS[1]), "Chapter 2: Rain")
+
+    def test_rows_map_back_to_their_chapters(self):
+        chapters = ChapterList(CHAPTERS)
+        chapters.sort(SORT_NEWEST_FIRST)
+        self.assertEqual([chapter["id"] for chapter in chapters.chapters_at(range(len(chapters)))], ["c10.5", "c10", "c3", "c2", "c1"])
+        self.assertEqual(chapters.chapter_at(0)["id"], "c10.5")
+        self.assertEqual(chapters.chapters_at([1, 7, -1]), [CHAPTERS[2]])
+
+    def test_filter_by_title_or_number(self):
+        chapters = ChapterList(CHAPTERS)
+        self.assertTrue(chapters.filter("RAIN"))
+        self.assertEqual(chapters.row_labels(), ["Chapter 2: Rain"])
+        self.assertFalse(chapters.filter("rain"))
+
+        chapters.filter("10")
+        self.assertEqual([chapter["id"] for chapter in chapters.chapters_at(range(len(chapters)))], ["c10", "c10.5"])
+
+        chapters.filter("")
+        self.assertEqual(len(chapters), len(CHAPTERS))
+
+    def test_query_cannot_match_across_fields(self):
+        chapters = ChapterList(CHAPTERS)
+        chapters.filter("beginning1")
+        self.assertEqual(len(chapters), 0)
+
+    def test_narrowing_and_widening_agree_with_a_fresh_search(self):
+        chapters = ChapterList(CHAPTERS)
+        for query in ("e", "re", "ret", "re", "t", "te", "", "x"):
+            chapters.filter(query)
+            fresh = ChapterList(CHAPTERS)
+            fresh.filter(query)
+            self.assertEqual(chapters.rows, fresh.rows, query)
+
+    def test_sort_is_kept_by_filters(self):
+        chapters = ChapterList(CHAPTERS)
+        chapters.sort(SORT_OLDEST_FIRST)
+        chapters.filter("e")
+        numbers = [chapters.numbers[i] for i in chapters.rows]
+        self.assertEqual(numbers, sorted(numbers))
+        chapters.sort(SORT_NEWEST_FIRST)
+        chapters.filter("")
+        numbers = [chapters.numbers[i] for i in chapters.rows]
+        self.assertEqual(numbers, sorted(numbers, reverse=True))
+
+
+class DiffRowsTest(unittest.TestCase):
+    def test_filtering_edits(self):
+        old = [0, 1, 2, 3, 4, 5]
+        new = [1, 2, 5]
+        self.assertEqual(apply_edits(old, diff_rows(old, new)), new)
+        self.assertEqual(apply_edits(new, diff_rows(new, old)), old)
+
+    def test_edits_run_from_the_bottom_up(self):
+        edits = diff_rows([0, 1, 2, 3], [1, 3])
+        self.assertEqual([start for start, _, _ in edits], [2, 0])
+
+    def test_unchanged_rows_need_no_edits(self):
+        self.assertEqual(diff_rows([1, 2, 3], [1, 2, 3]), [])
+        self.assertEqual(diff_rows([], []), [])
+
+    def test_reordered_rows_need_a_redraw(self):
+        self.assertIsNone(diff_rows([0, 1, 2], [2, 1, 0]))
+
+    def test_random_subsets(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            universe = list(range(30))
+            old = sorted(rng.sample(universe, rng.randint(0, 30)))
+            new = sorted(rng.sample(universe, rng.randint(0, 30)))
+            self.assertEqual(apply_edits(old, diff_rows(old, new)), new)
+
+
+if __name__ == "__main__":
+    unittest.main()
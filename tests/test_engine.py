@@ -0,0 +1,108 @@
+import threading
+import time
+import unittest
+
+import requests
+
+import core.engine as engine
+from core.retry import RetryPolicy
+
+PAGES = 12
+
+
+def page_bytes(page_num):
+    return b"\x89PNG\r\n\x1a\n" + f"page {page_num} ".encode() * 20
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class FakeClient:
+    """
+    Serves pages with later pages answering first, so they complete out of order.
+    Page numbers in `flaky` get a 503 on their first request.
+    """
+
+    def __init__(self, flaky=()):
+        self.flaky = set(flaky)
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None):
+        page_num = int(url.rsplit("/", 1)[1].split(".")[0])
+        with self._lock:
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+            flaky = page_num in self.flaky
+            self.flaky.discard(page_num)
+        try:
+            time.sleep((PAGES - page_num) * 0.005)
+            return FakeResponse(503) if flaky else FakeResponse(200, page_bytes(page_num))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class FakeProvider:
+    name = "Fake"
+    page_workers = 4
+
+    def __init__(self, client):
+        self.client = client
+
+    def fetch_chapter_pages(self, chapter_id):
+        return [{"page": n, "img": f"http://fake-engine.invalid/{chapter_id}/{n}.png"} for n in range(1, PAGES + 1)]
+
+
+class RecordingWriter:
+    """Page writer that keeps the pages in the order they were handed over"""
+
+    def __init__(self):
+        self.pages = []
+
+    def add_page(self, filename, data):
+        self.pages.append((filename, data))
+
+
+class DownloadChapterImagesTest(unittest.TestCase):
+    def setUp(self):
+        self.retry_policy = engine.page_retry_policy
+        engine.page_retry_policy = RetryPolicy(base_delay=0.01)
+
+    def tearDown(self):
+        engine.page_retry_policy = self.retry_policy
+
+    def download(self, client, max_workers=None):
+        writer = RecordingWriter()
+        _, total_pages = engine.download_chapter_images(FakeProvider(client), "chapter-1", page_writer=writer, max_workers=max_workers)
+        self.assertEqual(total_pages, PAGES)
+        return writer.pages
+
+    def test_pages_are_written_in_order(self):
+        client = FakeClient()
+        pages = self.download(client)
+        self.assertEqual(pages, [(f"{n}.png", page_bytes(n)) for n in range(1, PAGES + 1)])
+        self.assertGreater(client.most_in_flight, 1)
+
+    def test_concurrency_override(self):
+        client = FakeClient()
+        self.download(client, max_workers=1)
+        self.assertEqual(client.most_in_flight, 1)
+
+    def test_failed_pages_are_retried(self):
+        pages = self.download(FakeClient(flaky={1, 7}))
+        self.assertEqual([filename for filename, _ in pages], [f"{n}.png" for n in range(1, PAGES + 1)])
+        self.assertEqual(engine.page_retry_policy.retries, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import tkinter as tk
+import unittest
+
+import core.engine as engine
+from benchmarks.standin_server import add_server_arguments, create_server
+from core.cache import get_response_cache, set_response_cache
+from core.http_client import configure_host
+from ui.event_bus import UIEventBus
+from ui.progress import TkProgressReporter
+
+
+class FakeLabel:
+    """Stands in for a CTkLabel, which needs a display; records every configure()"""
+
+    def __init__(self, name):
+        self.name = name
+        self.texts = []
+
+    def configure(self, text):
+        self.texts.append(text)
+
+    def __str__(self):
+        return self.name
+
+
+class UIEventBusTest(unittest.TestCase):
+    def setUp(self):
+        # A Tcl interpreter without Tk, so real tkinter Variables work without a display
+        self.tcl = tk.Tcl()
+        self.events = UIEventBus()
+
+    def test_variables_are_coalesced(self):
+        var = tk.IntVar(master=self.tcl)
+        for percent in range(100):
+            self.events.set_var(var, percent)
+        self.assertEqual(self.events.drain(), 1)
+        self.assertEqual(var.get(), 99)
+
+    def test_reporter_from_worker_threads(self):
+        var = tk.IntVar(master=self.tcl)
+        label = FakeLabel(".status")
+        reporter = TkProgressReporter(self.events, var, label, prefix="Chapter 1: ")
+
+        def work():
+            for page in range(1, 51):
+                reporter.progress(page * 2)
+                reporter.status(f"Downloaded page {page}/50")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.events.drain(), 2)
+        self.assertEqual(var.get(), 100)
+        self.assertEqual(label.texts, ["Chapter 1: Downloaded page 50/50"])
+
+    def test_calls_keep_their_order(self):
+        var = tk.IntVar(master=self.tcl)
+        order = []
+        self.events.set_var(var, 1)
+        self.events.call(order.append, "done")
+        self.events.set_var(var, 2)
+        self.events.call(order.append, "after")
+        self.events.drain()
+        self.assertEqual(order, ["done", "after"])
+        self.assertEqual(var.get(), 2)
+
+
+class ReporterDownloadTest(unittest.TestCase):
+    """A chapter download reporting through TkProgressReporter, against the offline stand-in site"""
+
+    def setUp(self):
+        parser = argparse.ArgumentParser()
+        add_server_arguments(parser)
+        self.server = create_server(parser.parse_args(["--pages", "4", "--image-size", "60x80"]))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        configure_host(self.server.root, 4, rate=0)
+
+        self.cache = get_response_cache()
+        set_response_cache(None)
+        self.workdir = tempfile.mkdtemp()
+        self.temp_dir = engine.TEMP_DIR
+        engine.TEMP_DIR = os.path.join(self.workdir, "temp")
+
+    def tearDown(self):
+        engine.TEMP_DIR = self.temp_dir
+        set_response_cache(self.cache)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_download_chapter(self):
+        tcl = tk.Tcl()
+        events = UIEventBus()
+        var = tk.IntVar(master=tcl)
+        label = FakeLabel(".status")
+        provider = engine.PROVIDER_CLASSES["MangaPill"]()
+        provider.base_url = self.server.base_url("MangaPill")
+        chapter = {"id": "2085-1/fixture-chapter-1", "title": "Chapter 1", "chapter": "1"}
+        output_path = os.path.join(self.workdir, "out")
+
+        reporter = TkProgressReporter(events, var, label)
+        success, output_file = engine.download_chapter(provider, chapter, output_path, ".cbz", "Test", reporter)
+        self.assertTrue(success)
+        self.assertTrue(os.path.exists(output_file))
+
+        # Downloading it again takes the "already downloaded" path, which reports too
+        success, _ = engine.download_chapter(provider, chapter, output_path, ".cbz", "Test", reporter)
+        self.assertTrue(success)
+
+        events.drain()
+        self.assertEqual(var.get(), 100)
+        self.assertTrue(label.texts[-1].startswith("Already downloaded"))
+
+
+if __name__ == "__main__":
+    unittest.main()
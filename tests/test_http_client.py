@@ -0,0 +1,20 @@
+import unittest
+
+from core.http_client import configure_host, get_host, rate_limiter
+
+
+class HostRateLimitTest(unittest.TestCase):
+    def test_unconfigured_host_is_not_rate_limited(self):
+        host = get_host("https://cdn.unconfigured.invalid/image/1.jpg")
+        waited = sum(rate_limiter.acquire(host) for _ in range(100))
+        self.assertEqual(waited, 0.0)
+
+    def test_configured_host_is_rate_limited(self):
+        url = "https://site.configured.invalid/manga/1"
+        configure_host(url, 4, rate=50, burst=1)
+        waited = sum(rate_limiter.acquire(get_host(url)) for _ in range(5))
+        self.assertGreater(waited, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import unittest
+
+from benchmarks.bench_mangapark_pages import legacy_parse_chapter_pages
+from benchmarks.make_fixtures import load_fixture
+from providers.manga.mangapark import Mangapark
+
+IMAGE = "https://s01.invalid/media/mpup/{}.jpg"
+
+
+class ChapterPagesTest(unittest.TestCase):
+    def setUp(self):
+        self.provider = Mangapark()
+
+    def urls(self, html):
+        pages = self.provider.parse_chapter_pages(html)
+        self.assertEqual([page["page"] for page in pages], list(range(1, len(pages) + 1)))
+        return [page["img"] for page in pages]
+
+    def test_matches_the_legacy_extractor(self):
+        html = load_fixture("mangapark_chapter.html")
+        pages = self.provider.parse_chapter_pages(html)
+        self.assertTrue(pages)
+        self.assertEqual(pages, legacy_parse_chapter_pages(html))
+
+    def test_qwik_json_in_document_order_without_duplicates(self):
+        data = {
+            "objs": [IMAGE.format(1), {"nested": [IMAGE.format(2), "https://s01.invalid/avatar.png"]}, IMAGE.format(3)],
+            "again": IMAGE.format(1),
+        }
+        html = f'<html><script type="qwik/json">{json.dumps(data)}</script></html>'
+        self.assertEqual(self.urls(html), [IMAGE.format(n) for n in (1, 2, 3)])
+
+    def test_falls_back_to_script_text(self):
+        html = f"<html><script>var pages = ['{IMAGE.format(1)}', '{IMAGE.format(2)}', '{IMAGE.format(1)}'];</script></html>"
+        self.assertEqual(self.urls(html), [IMAGE.format(1), IMAGE.format(2)])
+
+    def test_falls_back_to_image_tags(self):
+        html = f'<html><body><img src="{IMAGE.format(1)}"><img src="https://s01.invalid/logo.png"></body></html>'
+        self.assertEqual(self.urls(html), [IMAGE.format(1)])
+
+    def test_broken_json_is_skipped(self):
+        html = f'<html><script type="qwik/json">{{not json</script><script>x="{IMAGE.format(1)}"</script></html>'
+        self.assertEqual(self.urls(html), [IMAGE.format(1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.manifest import ChapterManifest
+
+
+class ChapterManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.workdir, "chapter.cbz.manifest.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def new_manifest(self):
+        manifest = ChapterManifest.load(self.path)
+        manifest.reset("chapter-1", ".cbz")
+        manifest.set_urls([{"img": f"http://cdn.invalid/{n}.jpg?token=a"} for n in range(1, 4)])
+        return manifest
+
+    def test_unreadable_manifest_starts_empty(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        manifest = ChapterManifest.load(self.path)
+        self.assertFalse(manifest.matches("chapter-1", ".cbz"))
+        self.assertEqual(manifest.saved_pages, 0)
+
+    def test_round_trip(self):
+        manifest = self.new_manifest()
+        manifest.record_page(1, "1.jpg", b"page one")
+        manifest.save()
+
+        loaded = ChapterManifest.load(self.path)
+        self.assertTrue(loaded.matches("chapter-1", ".cbz"))
+        self.assertFalse(loaded.matches("chapter-1", ".pdf"))
+        self.assertEqual(loaded.total_pages, 3)
+        self.assertEqual(loaded.get_page(1)["bytes"], len(b"page one"))
+
+    def test_new_tokens_keep_saved_pages(self):
+        manifest = self.new_manifest()
+        manifest.record_page(1, "1.jpg", b"page one")
+        manifest.set_urls([{"img": f"http://cdn.invalid/{n}.jpg?token=b"} for n in range(1, 4)])
+        self.assertEqual(manifest.saved_pages, 1)
+
+    def test_changed_chapter_drops_saved_pages(self):
+        manifest = self.new_manifest()
+        manifest.record_page(1, "1.jpg", b"page one")
+        manifest.set_urls([{"img": f"http://cdn.invalid/{n}.jpg"} for n in range(1, 5)])
+        self.assertEqual(manifest.saved_pages, 0)
+
+    def test_forget_page(self):
+        manifest = self.new_manifest()
+        manifest.record_page(1, "1.jpg", b"page one")
+        manifest.record_page(2, "2.jpg", b"page two")
+        manifest.forget_page(1)
+        manifest.forget_page(3)
+        self.assertIsNone(manifest.get_page(1))
+        self.assertEqual(manifest.saved_pages, 1)
+
+    def test_has_file_checks_size_and_checksum(self):
+        manifest = self.new_manifest()
+        manifest.record_page(1, "1.jpg", b"page one")
+        path = os.path.join(self.workdir, "1.jpg")
+        self.assertFalse(manifest.has_file(1, self.workdir))
+
+        with open(path, "wb") as f:
+            f.write(b"page one")
+        self.assertTrue(manifest.has_file(1, self.workdir))
+
+        # Same size, different bytes
+        with open(path, "wb") as f:
+            f.write(b"page two")
+        self.assertFalse(manifest.has_file(1, self.workdir))
+        self.assertFalse(manifest.has_file(2, self.workdir))
+
+    def test_is_finished_needs_the_output_file(self):
+        manifest = self.new_manifest()
+        output_file = os.path.join(self.workdir, "chapter.cbz")
+        manifest.mark_complete(output_file)
+        self.assertFalse(ChapterManifest.load(self.path).is_finished("chapter-1", ".cbz"))
+
+        open(output_file, "wb").close()
+        loaded = ChapterManifest.load(self.path)
+        self.assertTrue(loaded.is_finished("chapter-1", ".cbz"))
+        self.assertFalse(loaded.is_finished("chapter-2", ".cbz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
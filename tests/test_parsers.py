@@ -0,0 +1,35 @@
+import unittest
+
+import core.parsing
+from benchmarks.bench_parsers import backend_available, build_cases
+from benchmarks.make_fixtures import load_fixture
+from providers.manga.mangapark import Mangapark
+
+
+class ParserBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.backend = core.parsing.HTML_PARSER
+
+    def tearDown(self):
+        core.parsing.HTML_PARSER = self.backend
+
+    @unittest.skipUnless(backend_available("lxml"), "lxml is not installed")
+    def test_backends_agree(self):
+        for name, fixture, parse in build_cases():
+            with self.subTest(name):
+                html = load_fixture(fixture)
+                core.parsing.HTML_PARSER = "html.parser"
+                expected = parse(html)
+                core.parsing.HTML_PARSER = "lxml"
+                self.assertEqual(parse(html), expected)
+
+    def test_mangapark_search_next_page(self):
+        html = load_fixture("mangapark_search.html")
+        first = Mangapark().parse_search(html, 1)
+        self.assertTrue(first["results"])
+        self.assertTrue(first["hasNextPage"])
+        self.assertFalse(Mangapark().parse_search(html, 50)["hasNextPage"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from io import BytesIO
+
+from PIL import Image
+
+from core.pdf import PdfWriter
+
+
+def encode(img, pil_format):
+    buffer = BytesIO()
+    img.save(buffer, pil_format)
+    return buffer.getvalue()
+
+
+class PdfWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.workdir, "chapter.pdf")
+        self.jpeg = encode(Image.new("RGB", (40, 60), "red"), "JPEG")
+        self.pages = [
+            ("1.jpg", self.jpeg),
+            ("2.png", encode(Image.new("RGBA", (30, 50), "blue"), "PNG")),
+            ("3.gif", encode(Image.new("P", (20, 20)), "GIF")),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def write(self):
+        with PdfWriter(self.output_file) as writer:
+            for filename, data in self.pages:
+                writer.add_page(filename, data)
+        with open(self.output_file, "rb") as f:
+            return f.read()
+
+    def test_xref_offsets_point_at_their_objects(self):
+        pdf = self.write()
+        self.assertTrue(pdf.startswith(b"%PDF-1.4\n"))
+        self.assertTrue(pdf.endswith(b"%%EOF\n"))
+
+        xref_offset = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", pdf).group(1))
+        self.assertEqual(pdf[xref_offset:xref_offset + 5], b"xref\n")
+
+        count = int(re.match(rb"xref\n0 (\d+)\n", pdf[xref_offset:]).group(1))
+        entries = re.findall(rb"(\d{10}) (\d{5}) ([fn]) \n", pdf[xref_offset:])
+        self.assertEqual(len(entries), count)
+        self.assertEqual(entries[0], (b"0000000000", b"65535", b"f"))
+        for obj_id, (offset, _, _) in enumerate(entries[1:], start=1):
+            offset = int(offset)
+            self.assertEqual(pdf[offset:offset + len(f"{obj_id} 0 obj\n")], f"{obj_id} 0 obj\n".encode())
+        self.assertIn(f"/Size {count}/Root 1 0 R".encode(), pdf)
+
+    def test_pages_and_stream_lengths(self):
+        pdf = self.write()
+        self.assertIn(b"/Type/Pages/Kids[", pdf)
+        self.assertIn(b"/Count 3>>", pdf)
+        for match in re.finditer(rb"/Length (\d+)>>\nstream\n", pdf):
+            end = match.end() + int(match.group(1))
+            self.assertEqual(pdf[end:end + 10], b"\nendstream")
+
+    def test_jpeg_is_embedded_as_is(self):
+        pdf = self.write()
+        self.assertIn(self.jpeg, pdf)
+        self.assertEqual(pdf.count(b"/Filter/DCTDecode"), 1)
+        self.assertEqual(pdf.count(b"/Filter/FlateDecode"), 2)
+
+    def test_failure_discards_the_pdf(self):
+        with self.assertRaises(RuntimeError):
+            with PdfWriter(self.output_file) as writer:
+                writer.add_page(*self.pages[0])
+                raise RuntimeError("download failed")
+        self.assertEqual(os.listdir(self.workdir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
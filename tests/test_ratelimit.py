@@ -0,0 +1,79 @@
+import unittest
+from unittest import mock
+
+from core.ratelimit import HostRateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Stands in for time.monotonic(); sleep() moves it forward instead of waiting"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RateLimitTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        for name, fake in (("monotonic", self.clock), ("sleep", self.clock.sleep)):
+            patcher = mock.patch(f"core.ratelimit.time.{name}", fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TokenBucketTest(RateLimitTestCase):
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+
+    def test_idle_time_refills_up_to_the_burst(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        for _ in range(3):
+            bucket.acquire()
+        self.clock.sleep(60)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertGreater(bucket.acquire(), 0.0)
+
+    def test_burst_defaults_to_the_rate(self):
+        bucket = TokenBucket(rate=4)
+        self.assertEqual(sum(bucket.acquire() for _ in range(4)), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 0.25)
+
+    def test_rate_over_time(self):
+        bucket = TokenBucket(rate=5, burst=1)
+        start = self.clock.now
+        for _ in range(51):
+            bucket.acquire()
+        self.assertAlmostEqual(self.clock.now - start, 10.0)
+
+
+class HostRateLimiterTest(RateLimitTestCase):
+    def test_hosts_have_their_own_buckets(self):
+        limiter = HostRateLimiter()
+        limiter.set_rate("https://a.invalid", 1, 1)
+        limiter.set_rate("https://b.invalid", 1, 1)
+        self.assertEqual(limiter.acquire("https://a.invalid"), 0.0)
+        self.assertEqual(limiter.acquire("https://b.invalid"), 0.0)
+        self.assertAlmostEqual(limiter.acquire("https://a.invalid"), 1.0)
+
+    def test_no_rate_means_no_limit(self):
+        limiter = HostRateLimiter()
+        limiter.set_rate("https://a.invalid", 0)
+        self.assertEqual(sum(limiter.acquire("https://a.invalid") for _ in range(100)), 0.0)
+        self.assertEqual(sum(limiter.acquire("https://other.invalid") for _ in range(100)), 0.0)
+
+    def test_default_rate_for_unknown_hosts(self):
+        limiter = HostRateLimiter(default_rate=10, default_burst=1)
+        self.assertEqual(limiter.acquire("https://other.invalid"), 0.0)
+        self.assertAlmostEqual(limiter.acquire("https://other.invalid"), 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+import requests
+
+import core.engine as engine
+from core.manifest import ChapterManifest
+
+PAGES = 5
+CHAPTER = {"id": "fake-chapter-1", "title": "Chapter 1", "chapter": "1"}
+
+
+def page_bytes(page_num):
+    # PNG signature, so the engine keeps the bytes as-is without decoding them
+    return b"\x89PNG\r\n\x1a\n" + f"page {page_num} ".encode() * 50
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class FakeClient:
+    """Serves every page, except the page numbers in `missing`, which get `missing_status`"""
+
+    def __init__(self):
+        self.missing = set()
+        self.missing_status = 404
+        self.requested = []
+
+    def get(self, url, headers=None):
+        page_num = int(url.rsplit("/", 1)[1].split(".")[0])
+        self.requested.append(page_num)
+        if page_num in self.missing:
+            return FakeResponse(self.missing_status)
+        return FakeResponse(200, page_bytes(page_num))
+
+
+class FakeProvider:
+    name = "Fake"
+    page_workers = 2
+
+    def __init__(self):
+        self.client = FakeClient()
+        self.forgotten = []
+
+    def forget_chapter_pages(self, chapter_id):
+        self.forgotten.append(chapter_id)
+
+    def fetch_chapter_pages(self, chapter_id):
+        return [{"page": n, "img": f"http://fake.invalid/{chapter_id}/{n}.png"} for n in range(1, PAGES + 1)]
+
+
+class ResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.temp_dir = engine.TEMP_DIR
+        engine.TEMP_DIR = os.path.join(self.workdir, "temp")
+        self.output_path = os.path.join(self.workdir, "out")
+        self.provider = FakeProvider()
+
+    def tearDown(self):
+        engine.TEMP_DIR = self.temp_dir
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def download(self, format_type, missing=(), missing_status=404):
+        self.provider.client.missing = set(missing)
+        self.provider.client.missing_status = missing_status
+        self.provider.client.requested = []
+        return engine.download_chapter(self.provider, CHAPTER, self.output_path, format_type, "Test")
+
+    def manifest(self, format_type):
+        return ChapterManifest.load(engine.get_manifest_path("Test", CHAPTER["id"], format_type, CHAPTER["title"], CHAPTER["chapter"]))
+
+    def chapter_temp_dir(self):
+        return engine.get_temp_dir("Test", CHAPTER["id"], CHAPTER["title"], CHAPTER["chapter"])
+
+    def test_folder_resume_refetches_damaged_page(self):
+        self.assertEqual(self.download(".png", missing={5}), (False, None))
+        with open(os.path.join(self.chapter_temp_dir(), "2.png"), "wb") as f:
+            f.write(b"damaged")
+
+        # Page 2 has to be fetched again and fails, so the chapter can't be complete
+        self.assertEqual(self.download(".png", missing={2}), (False, None))
+        self.assertFalse(self.manifest(".png").complete)
+
+        success, folder = self.download(".png")
+        self.assertTrue(success)
+        self.assertEqual(sorted(os.listdir(folder)), [f"{n}.png" for n in range(1, PAGES + 1)])
+        with open(os.path.join(folder, "2.png"), "rb") as f:
+            self.assertEqual(f.read(), page_bytes(2))
+
+    def test_cbz_resume_after_damaged_archive(self):
+        self.assertEqual(self.download(".cbz", missing={5}), (False, None))
+        partial_file = self.manifest(".cbz").output_file + ".part"
+        with open(partial_file, "wb") as f:
+            f.write(b"not a zip file")
+
+        self.assertEqual(self.download(".cbz", missing={2}), (False, None))
+        self.assertFalse(self.manifest(".cbz").complete)
+
+        success, output_file = self.download(".cbz")
+        self.assertTrue(success)
+        with zipfile.ZipFile(output_file) as archive:
+            self.assertEqual(archive.namelist(), [f"{n}.png" for n in range(1, PAGES + 1)])
+
+    def test_cbz_resume_refetches_same_size_damaged_entry(self):
+        self.assertEqual(self.download(".cbz", missing={5}), (False, None))
+        partial_file = self.manifest(".cbz").output_file + ".part"
+
+        # Swap page 2 for different bytes of the same size
+        with zipfile.ZipFile(partial_file) as archive:
+            entries = [(name, archive.read(name)) for name in archive.namelist()]
+        with zipfile.ZipFile(partial_file, "w") as archive:
+            for name, data in entries:
+                archive.writestr(name, data[::-1] if name == "2.png" else data)
+
+        success, output_file = self.download(".cbz")
+        self.assertTrue(success)
+        self.assertEqual(sorted(self.provider.client.requested), [2, 5])
+        with zipfile.ZipFile(output_file) as archive:
+            self.assertEqual(archive.namelist(), [f"{n}.png" for n in range(1, PAGES + 1)])
+            self.assertEqual(archive.read("2.png"), page_bytes(2))
+
+    def test_forbidden_page_forgets_page_list(self):
+        self.assertEqual(self.download(".cbz", missing={3}), (False, None))
+        self.assertEqual(self.provider.forgotten, [])
+
+        # A 403 means the signed image URLs expired, so the cached page list is dropped
+        self.assertEqual(self.download(".cbz", missing={3}, missing_status=403), (False, None))
+        self.assertEqual(self.provider.forgotten, [CHAPTER["id"]])
+
+        success, _ = self.download(".cbz")
+        self.assertTrue(success)
+        self.assertEqual(self.provider.client.requested, [3])
+
+    def test_finished_chapter_is_skipped(self):
+        success, output_file = self.download(".cbz")
+        self.assertTrue(success)
+        self.assertEqual(self.download(".cbz"), (True, output_file))
+        self.assertEqual(self.provider.client.requested, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import requests
+
+from core.retry import RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def http_error(status_code, headers=None):
+    return requests.HTTPError(f"{status_code} error", response=FakeResponse(status_code, headers))
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=10.0)
+
+    def test_transient_errors_are_retried(self):
+        for error in (
+            http_error(429), http_error(503), http_error(500),
+            requests.ConnectionError("reset"), requests.Timeout("slow"),
+            requests.exceptions.ChunkedEncodingError("cut off"),
+        ):
+            with self.subTest(error=str(error)):
+                self.assertTrue(self.policy.is_retryable(error))
+
+    def test_other_errors_are_fatal(self):
+        for error in (http_error(404), http_error(403), requests.HTTPError("no response"), ValueError("bad image")):
+            with self.subTest(error=str(error)):
+                self.assertFalse(self.policy.is_retryable(error))
+
+    def test_gives_up_after_max_attempts(self):
+        error = http_error(503)
+        self.assertTrue(self.policy.should_retry(error, 1))
+        self.assertTrue(self.policy.should_retry(error, 2))
+        self.assertFalse(self.policy.should_retry(error, 3))
+
+    def test_backoff_is_jittered_and_capped(self):
+        for attempts in range(1, 8):
+            ceiling = min(10.0, 1.0 * 2 ** (attempts - 1))
+            delays = [self.policy.get_delay(attempts) for _ in range(50)]
+            with self.subTest(attempts=attempts):
+                self.assertTrue(all(0 <= delay <= ceiling for delay in delays))
+                self.assertGreater(len(set(delays)), 1)
+
+    def test_retry_after_wins(self):
+        self.assertEqual(self.policy.get_delay(1, http_error(429, {"Retry-After": "4"})), 4.0)
+        self.assertEqual(self.policy.get_delay(1, http_error(429, {"Retry-After": "600"})), 10.0)
+        self.assertLessEqual(self.policy.get_delay(1, http_error(429, {"Retry-After": "soon"})), 1.0)
+
+    def test_counts_retries(self):
+        self.policy.record_retry()
+        self.policy.record_retry()
+        self.assertEqual(self.policy.retries, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from PIL import Image
+
+from core.thumbnails import ThumbnailCache
+
+
+def make_cover():
+    # Noise doesn't compress, so every thumbnail takes about the same space
+    return Image.frombytes("L", (60, 90), os.urandom(60 * 90))
+
+
+class ThumbnailCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def put_aged(self, cache, url, age):
+        cache.put(url, make_cover())
+        stamp = time.time() - age
+        os.utime(cache._path(url), (stamp, stamp))
+
+    def test_round_trip(self):
+        cache = ThumbnailCache(self.workdir)
+        self.assertIsNone(cache.get("http://covers.invalid/1.jpg"))
+        cache.put("http://covers.invalid/1.jpg", make_cover())
+        self.assertEqual(cache.get("http://covers.invalid/1.jpg").size, (60, 90))
+
+    def test_least_recently_used_are_evicted(self):
+        probe = ThumbnailCache(os.path.join(self.workdir, "probe"))
+        probe.put("probe", make_cover())
+        size = os.path.getsize(probe._path("probe"))
+
+        # Room for about four thumbnails
+        cache = ThumbnailCache(os.path.join(self.workdir, "covers"), max_bytes=int(size * 4.5))
+        urls = [f"http://covers.invalid/{n}.jpg" for n in range(4)]
+        for age, url in zip((400, 300, 200, 100), urls):
+            self.put_aged(cache, url, age)
+
+        # Reading the oldest makes it the most recently used
+        self.assertIsNotNone(cache.get(urls[0]))
+        cache.put("http://covers.invalid/new.jpg", make_cover())
+
+        self.assertIsNone(cache.get(urls[1]))
+        self.assertIsNotNone(cache.get(urls[0]))
+        self.assertIsNotNone(cache.get("http://covers.invalid/new.jpg"))
+        self.assertLessEqual(cache._scan()[1], cache.max_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import shutil
+import subprocess
+import unittest
+
+from benchmarks.packer import pack
+from core.unpacker import encode_base, evaluate_string_concat, is_packed, unpack
+
+SOURCE = (
+    "function dm5imagefun(){var cid=12345;var pix=\"//cdn.invalid/store/manga/12345\";"
+    "var pvalue=[\"/p001.jpg?token=abc&ttl=1700000000\",\"/p002.jpg\"];"
+    "for(var i=0;i<pvalue.length;i++){pvalue[i]=pix+pvalue[i]}return pvalue}var d;d=dm5imagefun();"
+    "var msg='it\\'s here';"
+)
+
+# A script with more words than a radix-62 token of one character can number
+LONG_SOURCE = "var " + ",".join(f"w{n}={n}" for n in range(300)) + ";"
+
+
+def packed(payload, radix, symbols):
+    return f"eval(function(p,a,c,k,e,d){{}}('{payload}',{radix},{len(symbols)},'{'|'.join(symbols)}'.split('|'),0,{{}}))"
+
+
+class EncodeBaseTest(unittest.TestCase):
+    def test_matches_the_javascript_encoder(self):
+        # e(c) = (c<a ? '' : e(parseInt(c/a))) + ((c=c%a) > 35 ? String.fromCharCode(c+29) : c.toString(36))
+        cases = {
+            (0, 62): "0", (9, 62): "9", (10, 62): "a", (35, 62): "z", (36, 62): "A", (61, 62): "Z",
+            (62, 62): "10", (63, 62): "11", (3843, 62): "ZZ", (3844, 62): "100",
+            (10, 10): "10", (99, 10): "99", (35, 36): "z", (36, 36): "10", (40, 16): "28",
+        }
+        for (value, radix), token in cases.items():
+            with self.subTest(value=value, radix=radix):
+                self.assertEqual(encode_base(value, radix), token)
+
+
+class UnpackTest(unittest.TestCase):
+    def test_hand_packed_script(self):
+        self.assertEqual(unpack(packed("0 1=\\'2\\';", 62, ["var", "x", "hello"])), "var x='hello';")
+
+    def test_empty_symbols_keep_their_token(self):
+        self.assertEqual(unpack(packed("0 1 2", 10, ["var", "", "b"])), "var 1 b")
+
+    def test_multi_character_tokens(self):
+        # Index 62 is "10" in radix 62 and must not be read as 1 followed by 0
+        symbols = [f"s{n}" for n in range(64)]
+        self.assertEqual(unpack(packed("10 11 1 0 Z", 62, symbols)), "s62 s63 s1 s0 s61")
+
+    def test_round_trip(self):
+        for radix in (10, 36, 62):
+            for source in (SOURCE, LONG_SOURCE):
+                with self.subTest(radix=radix, words=len(source)):
+                    script = pack(source, radix)
+                    self.assertTrue(is_packed(script))
+                    self.assertEqual(unpack(script), source)
+
+    @unittest.skipUnless(shutil.which("node"), "node is not installed")
+    def test_matches_node(self):
+        for radix in (10, 36, 62):
+            script = pack(LONG_SOURCE, radix)
+            with self.subTest(radix=radix):
+                result = subprocess.run(
+                    ["node", "-e", f"process.stdout.write(JSON.stringify({script.replace('eval', '', 1)}))"],
+                    capture_output=True, text=True, check=True
+                )
+                self.assertEqual(unpack(script), json.loads(result.stdout))
+
+    def test_rejects_other_scripts(self):
+        self.assertFalse(is_packed("var x = 1;"))
+        with self.assertRaises(ValueError):
+            unpack("var x = 1;")
+
+
+class EvaluateStringConcatTest(unittest.TestCase):
+    def test_concatenation(self):
+        self.assertEqual(evaluate_string_concat("''+'ab'+\"cd\" + 'e'"), "abcde")
+        self.assertEqual(evaluate_string_concat("'single'"), "single")
+
+    def test_rejects_anything_else(self):
+        for expression in ("'a'+b", "'a'.toUpperCase()", "1+2", ""):
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    evaluate_string_concat(expression)
+
+
+if __name__ == "__main__":
+    unittest.main()
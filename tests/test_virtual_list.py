@@ -0,0 +1,71 @@
+import tkinter as tk
+import unittest
+
+from ui.virtual_list import VirtualList
+
+
+class VirtualListTest(unittest.TestCase):
+    """The Listbox-compatible API of VirtualList; needs a display, skipped without one"""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            cls.root = tk.Tk()
+        except tk.TclError as e:
+            raise unittest.SkipTest(f"no display: {e}")
+        cls.root.withdraw()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.root.destroy()
+
+    def setUp(self):
+        self.rows = VirtualList(self.root)
+        self.rows.insert(tk.END, *[f"row {n}" for n in range(10)])
+
+    def tearDown(self):
+        self.rows.destroy()
+
+    def test_insert_get_delete(self):
+        self.assertEqual(self.rows.size(), 10)
+        self.rows.insert(0, "first")
+        self.assertEqual(self.rows.get(0), "first")
+        self.rows.delete(0)
+        self.rows.delete(5, tk.END)
+        self.assertEqual(self.rows.size(), 5)
+        self.assertEqual(self.rows.get(4), "row 4")
+        self.rows.delete(0, tk.END)
+        self.assertEqual(self.rows.size(), 0)
+
+    def test_selection_follows_inserts_and_deletes(self):
+        self.rows.selection_set(2, 4)
+        self.assertEqual(self.rows.curselection(), (2, 3, 4))
+
+        # A row inserted among selected rows pushes the ones below it down and isn't selected itself
+        self.rows.insert(3, "new")
+        self.assertEqual(self.rows.curselection(), (2, 4, 5))
+
+        self.rows.delete(0, 2)
+        self.assertEqual(self.rows.curselection(), (1, 2))
+        self.assertEqual([self.rows.get(row) for row in self.rows.curselection()], ["row 3", "row 4"])
+
+        self.rows.selection_clear(0, tk.END)
+        self.assertEqual(self.rows.curselection(), ())
+
+    def test_selection_set_stays_inside_the_rows(self):
+        self.rows.selection_set(8, 50)
+        self.assertEqual(self.rows.curselection(), (8, 9))
+
+    def test_keyboard_selection(self):
+        self.rows._move_active(1, False)
+        self.assertEqual(self.rows.curselection(), (0,))
+        self.rows._move_active(2, True)
+        self.assertEqual(self.rows.curselection(), (0, 1, 2))
+        self.rows._move_active(100, False)
+        self.assertEqual(self.rows.curselection(), (9,))
+        self.rows._on_select_all(None)
+        self.assertEqual(len(self.rows.curselection()), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
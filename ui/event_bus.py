@@ -0,0 +1,64 @@
+import threading
+from collections import OrderedDict
+from itertools import count
+
+# How often the Tk main loop applies pending events (ms)
+UI_TICK_MS = 100
+
+
+class UIEventBus:
+    """
+    Hands UI updates from worker threads to the Tk main loop. Workers post events, and
+    the main loop applies everything pending once per tick, so widgets are only touched
+    from the thread that owns them.
+
+    Events posted under the same key are coalesced: only the latest one is applied, in
+    the position of its latest post. A progress bar that gets a hundred updates between
+    two ticks is redrawn once. Keys must be hashable; tkinter Variables are not, so
+    set_var() and configure() key on the Tcl names of the variable or widget.
+    """
+
+    def __init__(self, interval_ms=UI_TICK_MS):
+        self.interval_ms = interval_ms
+        self._pending = OrderedDict()
+        self._ids = count()
+        self._lock = threading.Lock()
+        self._widget = None
+
+    def post(self, key, func, *args, **kwargs):
+        """Apply func(*args, **kwargs) on the next tick, replacing any pending event with the same key"""
+        with self._lock:
+            self._pending.pop(key, None)
+            self._pending[key] = (func, args, kwargs)
+
+    def set_var(self, var, value):
+        """Set a tkinter Variable on the next tick, coalesced with other sets of it"""
+        self.post(("set", str(var)), var.set, value)
+
+    def configure(self, widget, **options):
+        """Configure a widget on the next tick, coalesced with other updates of the same options"""
+        self.post(("configure", str(widget), tuple(sorted(options))), widget.configure, **options)
+
+    def call(self, func, *args, **kwargs):
+        """Apply func(*args, **kwargs) on the next tick, never coalesced with other events"""
+        self.post(("call", next(self._ids)), func, *args, **kwargs)
+
+    def drain(self):
+        """Apply every pending event in order; returns how many ran"""
+        with self._lock:
+            pending, self._pending = self._pending, OrderedDict()
+        for func, args, kwargs in pending.values():
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                print(f"UI update error: {str(e)}")
+        return len(pending)
+
+    def start(self, widget):
+        """Drain the bus from `widget`'s main loop every interval_ms"""
+        self._widget = widget
+        self._tick()
+
+    def _tick(self):
+        self.drain()
+        self._widget.after(self.interval_ms, self._tick)
@@ -0,0 +1,20 @@
+from core.engine import ProgressReporter
+
+
+class TkProgressReporter(ProgressReporter):
+    """
+    Reports engine progress to a progress bar variable and a status label. Updates go
+    through a UIEventBus, since the engine calls this from download threads.
+    """
+
+    def __init__(self, events, progress_var, status_label, prefix=""):
+        self.events = events
+        self.progress_var = progress_var
+        self.status_label = status_label
+        self.prefix = prefix
+
+    def status(self, text):
+        self.events.configure(self.status_label, text=f"{self.prefix}{text}")
+
+    def progress(self, percent):
+        self.events.set_var(self.progress_var, percent)
@@ -0,0 +1,283 @@
+import tkinter as tk
+import tkinter.font as tkfont
+
+
+class VirtualList(tk.Canvas):
+    """
+    Listbox replacement for very long lists. The rows live in a plain Python list and only
+    the rows inside the visible window are drawn, reusing a small pool of canvas items, so
+    filling it with thousands of rows is instant and scrolling stays smooth.
+
+    Mirrors the parts of the tk.Listbox API the app uses (insert, delete, get, size,
+    curselection, selection_set, see, yview, yscrollcommand, <<ListboxSelect>>) and
+    supports extended selection: click, Ctrl+click, Shift+click, drag and the arrow keys.
+    """
+
+    def __init__(self, master, bg="white", fg="black", selectbackground="#3874d8",
+                 selectforeground=None, font=("Arial", 12), row_padding=4, yscrollcommand=None, **kwargs):
+        kwargs.setdefault("highlightthickness", 0)
+        kwargs.setdefault("borderwidth", 0)
+        kwargs.setdefault("takefocus", True)
+        super().__init__(master, bg=bg, **kwargs)
+        self.fg = fg
+        self.row_bg = bg
+        self.selectbackground = selectbackground
+        self.selectforeground = selectforeground or fg
+        self.font = tkfont.Font(root=self, font=font)
+        self.row_height = self.font.metrics("linespace") + row_padding
+        self.text_padding = 6
+
+        self.items = []
+        self.selection = set()
+        self.anchor = None
+        self.active = None
+
+        # Pixel offset of the top of the view, and the pooled (background, text) items per visible slot
+        self.top = 0
+        self.slots = []
+        self._yscrollcommand = yscrollcommand
+        self._redraw_pending = False
+
+        self.bind("<Configure>", lambda e: self._schedule_redraw())
+        self.bind("<Button-1>", self._on_click)
+        self.bind("<Control-Button-1>", self._on_ctrl_click)
+        self.bind("<Shift-Button-1>", self._on_shift_click)
+        self.bind("<B1-Motion>", self._on_drag)
+        self.bind("<MouseWheel>", self._on_mousewheel)
+        self.bind("<Button-4>", lambda e: self.yview_scroll(-3, "units"))
+        self.bind("<Button-5>", lambda e: self.yview_scroll(3, "units"))
+        self.bind("<Up>", lambda e: self._move_active(-1, False))
+        self.bind("<Down>", lambda e: self._move_active(1, False))
+        self.bind("<Shift-Up>", lambda e: self._move_active(-1, True))
+        self.bind("<Shift-Down>", lambda e: self._move_active(1, True))
+        self.bind("<Prior>", lambda e: self._move_active(-self._visible_rows(), False))
+        self.bind("<Next>", lambda e: self._move_active(self._visible_rows(), False))
+        self.bind("<Home>", lambda e: self._move_active(-len(self.items), False))
+        self.bind("<End>", lambda e: self._move_active(len(self.items), False))
+        self.bind("<Control-a>", self._on_select_all)
+
+    # --- Listbox-compatible API ---
+
+    def configure(self, cnf=None, **kwargs):
+        # yscrollcommand is handled here since the canvas itself never scrolls
+        if "yscrollcommand" in kwargs:
+            self._yscrollcommand = kwargs.pop("yscrollcommand")
+            self._schedule_redraw()
+            if not cnf and not kwargs:
+                return None
+        return super().configure(cnf, **kwargs)
+
+    config = configure
+
+    def size(self):
+        return len(self.items)
+
+    def get(self, index):
+        return self.items[self._index(index)]
+
+    def insert(self, index, *labels):
+        """Insert rows before `index` (tk.END appends); selected rows below move down with them"""
+        index = self._index(index)
+        self.items[index:index] = labels
+        if self.selection:
+            self.selection = {row + len(labels) if row >= index else row for row in self.selection}
+        self._schedule_redraw()
+
+    def delete(self, first, last=None):
+        """Delete rows first..last inclusive (tk.END for the last row), like Listbox.delete"""
+        first = self._index(first)
+        last = first if last is None else min(self._index(last), len(self.items) - 1)
+        if last < first:
+            return
+        count = last - first + 1
+        del self.items[first:last + 1]
+        if self.selection:
+            self.selection = {
+                row - count if row > last else row
+                for row in self.selection
+                if not first <= row <= last
+            }
+        if self.anchor is not None and self.anchor >= len(self.items):
+            self.anchor = None
+        if self.active is not None and self.active >= len(self.items):
+            self.active = None
+        self._schedule_redraw()
+
+    def curselection(self):
+        return tuple(sorted(self.selection))
+
+    def selection_clear(self, first=0, last=None):
+        self.selection.clear()
+        self._schedule_redraw()
+
+    def selection_set(self, first, last=None):
+        first = self._index(first)
+        last = first if last is None else self._index(last)
+        self.selection.update(range(first, min(last, len(self.items) - 1) + 1))
+        self._schedule_redraw()
+
+    def see(self, index):
+        """Scroll just enough for a row to be fully visible"""
+        row_top = self._index(index) * self.row_height
+        height = self.winfo_height()
+        if row_top < self.top:
+            self._scroll_to(row_top)
+        elif row_top + self.row_height > self.top + height:
+            self._scroll_to(row_top + self.row_height - height)
+
+    def yview(self, *args):
+        """Scrollbar protocol: no arguments returns (first, last), otherwise moveto/scroll"""
+        if not args:
+            return self._view_fractions()
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * self._content_height())
+        elif args[0] == "scroll":
+            self.yview_scroll(int(args[1]), args[2])
+
+    def yview_scroll(self, number, what):
+        step = self.winfo_height() if what == "pages" else self.row_height
+        self._scroll_to(self.top + number * step)
+
+    # --- Drawing ---
+
+    def _index(self, index):
+        if index == tk.END:
+            return len(self.items)
+        return max(0, min(int(index), len(self.items)))
+
+    def _content_height(self):
+        return len(self.items) * self.row_height
+
+    def _visible_rows(self):
+        return max(1, self.winfo_height() // self.row_height)
+
+    def _view_fractions(self):
+        total = self._content_height()
+        if total <= 0:
+            return 0.0, 1.0
+        return self.top / total, min(1.0, (self.top + self.winfo_height()) / total)
+
+    def _scroll_to(self, top):
+        max_top = max(0, self._content_height() - self.winfo_height())
+        top = max(0, min(int(top), max_top))
+        if top != self.top:
+            self.top = top
+            self._redraw()
+
+    def _schedule_redraw(self):
+        # Coalesce the many changes a refresh makes into one redraw
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        width = self.winfo_width()
+        height = self.winfo_height()
+
+        # Keep the view inside the content after rows were removed
+        self.top = max(0, min(self.top, self._content_height() - height))
+
+        # Grow the item pool to cover the window, one spare slot for partly visible rows
+        needed = height // self.row_height + 2
+        while len(self.slots) < needed:
+            rect = self.create_rectangle(0, 0, 0, 0, width=0)
+            text = self.create_text(0, 0, anchor="w", font=self.font)
+            self.slots.append((rect, text))
+
+        first_row = self.top // self.row_height
+        offset = self.top % self.row_height
+        for slot, (rect, text) in enumerate(self.slots):
+            row = first_row + slot
+            if slot >= needed or row >= len(self.items):
+                self.itemconfigure(rect, state="hidden")
+                self.itemconfigure(text, state="hidden")
+                continue
+            y = slot * self.row_height - offset
+            selected = row in self.selection
+            self.coords(rect, 0, y, width, y + self.row_height)
+            self.coords(text, self.text_padding, y + self.row_height / 2)
+            self.itemconfigure(rect, state="normal", fill=self.selectbackground if selected else self.row_bg)
+            self.itemconfigure(
+                text, state="normal", text=self.items[row],
+                fill=self.selectforeground if selected else self.fg
+            )
+
+        if self._yscrollcommand:
+            self._yscrollcommand(*self._view_fractions())
+
+    # --- Mouse and keyboard ---
+
+    def _row_at(self, y):
+        row = int((self.top + y) // self.row_height)
+        return row if 0 <= row < len(self.items) else None
+
+    def _notify_select(self):
+        self._redraw()
+        self.event_generate("<<ListboxSelect>>")
+
+    def _on_click(self, event):
+        self.focus_set()
+        row = self._row_at(event.y)
+        if row is None:
+            return
+        self.selection = {row}
+        self.anchor = self.active = row
+        self._notify_select()
+
+    def _on_ctrl_click(self, event):
+        row = self._row_at(event.y)
+        if row is None:
+            return "break"
+        self.selection ^= {row}
+        self.anchor = self.active = row
+        self._notify_select()
+        return "break"
+
+    def _on_shift_click(self, event):
+        row = self._row_at(event.y)
+        if row is None:
+            return "break"
+        self._select_range(row)
+        return "break"
+
+    def _on_drag(self, event):
+        # Dragging past the edges scrolls the list along
+        if event.y < 0:
+            self.yview_scroll(-1, "units")
+        elif event.y > self.winfo_height():
+            self.yview_scroll(1, "units")
+        row = self._row_at(min(max(event.y, 0), self.winfo_height() - 1))
+        if row is not None and row != self.active:
+            self._select_range(row)
+
+    def _select_range(self, row):
+        anchor = row if self.anchor is None else self.anchor
+        self.selection = set(range(min(anchor, row), max(anchor, row) + 1))
+        self.anchor = anchor
+        self.active = row
+        self._notify_select()
+
+    def _move_active(self, delta, extend):
+        if not self.items:
+            return "break"
+        current = self.active if self.active is not None else -1 if delta > 0 else len(self.items)
+        row = max(0, min(len(self.items) - 1, current + delta))
+        if extend:
+            self._select_range(row)
+        else:
+            self.selection = {row}
+            self.anchor = self.active = row
+            self._notify_select()
+        self.see(row)
+        return "break"
+
+    def _on_select_all(self, event):
+        self.selection = set(range(len(self.items)))
+        self._notify_select()
+        return "break"
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        notches = event.delta / 120 if abs(event.delta) >= 120 else event.delta
+        self.yview_scroll(int(-notches * 3), "units")